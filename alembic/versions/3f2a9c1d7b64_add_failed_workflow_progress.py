@@ -0,0 +1,39 @@
+"""add FAILED workflow progress
+
+Revision ID: 3f2a9c1d7b64
+Revises: 
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b64'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OLD_PROGRESS = sa.Enum('PENDING', 'PROCESSING', 'COMPLETED', name='workflowprogressenum')
+NEW_PROGRESS = sa.Enum('PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', name='workflowprogressenum')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('workflow_statuses', 'progress',
+                    existing_type=OLD_PROGRESS,
+                    type_=NEW_PROGRESS,
+                    existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # FAILED does not exist before this revision; those workflows go back to waiting for a run
+    op.execute("UPDATE workflow_statuses SET progress = 'PENDING' WHERE progress = 'FAILED'")
+    op.alter_column('workflow_statuses', 'progress',
+                    existing_type=NEW_PROGRESS,
+                    type_=OLD_PROGRESS,
+                    existing_nullable=True)
@@ -2,11 +2,31 @@ from fastapi import HTTPException, status
 from db.database import db_dependency
 from model.ConsultantProfile import ConsultantProfile  # Assuming this is the ORM model
 from schema.ConsultantProfile import ConsultantProfileSchema, ConsultantProfileOutput
+from crud.MatchResult import schedule_pool_rematch, schedule_rematch
+from utility.llm_score_cache import invalidate_llm_scores
+from utility.pool_revision import bump_pool_revision
+from utility.profile_index import index_profile, index_profiles, unindex_profile
+from sqlalchemy import func
+from typing import Dict, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_email(email: str) -> str:
+    """
+    Email as stored and compared: stripped and lower-cased, matching the case-insensitive unique index on
+    MySQL so a lookup finds every row the index would reject as a duplicate.
+    """
+    return email.strip().lower()
+
+
+def _with_normalized_email(consultant_profile_request: ConsultantProfileSchema) -> ConsultantProfileSchema:
+    # model_copy keeps the set of explicitly set fields, which _changed_fields relies on
+    return consultant_profile_request.model_copy(
+        update={"email": normalize_email(consultant_profile_request.email)})
+
+
 def get_all_consultant_profiles(db: db_dependency) -> list[ConsultantProfileOutput]:
     try:
         logger.debug("Fetching all consultant profiles from the database.")
@@ -72,9 +92,13 @@ def add_consultant_profile(db: db_dependency,
                            consultant_profile_request: ConsultantProfileSchema) -> ConsultantProfileSchema:
     try:
         logger.debug("Attempting to add a new consultant profile.")
+        consultant_profile_request = _with_normalized_email(consultant_profile_request)
         new_consultant_profile = ConsultantProfile(**consultant_profile_request.model_dump())
         db.add(new_consultant_profile)
+        bump_pool_revision(db)
         db.commit()
+        index_profile(new_consultant_profile)
+        schedule_rematch(db, new_consultant_profile.id)
         logger.info("Successfully added a new consultant profile.")
         return ConsultantProfileSchema.model_validate(new_consultant_profile)
     except Exception as e:
@@ -85,6 +109,111 @@ def add_consultant_profile(db: db_dependency,
         )
 
 
+def _changed_fields(profile: ConsultantProfile, consultant_profile_request: ConsultantProfileSchema) -> dict:
+    return {key: value for key, value in consultant_profile_request.model_dump(exclude_unset=True).items()
+            if getattr(profile, key) != value}
+
+
+def upsert_consultant_profile(db: db_dependency,
+                              consultant_profile_request: ConsultantProfileSchema) -> Tuple[ConsultantProfileOutput, str]:
+    """
+    Add the consultant, or update the existing profile with the same email. Only the fields set on the request
+    are written (an extracted resume does not reset availability), and an unchanged profile is left untouched:
+    no write, re-index or re-match.
+
+    Returns:
+        Tuple[ConsultantProfileOutput, str]: The stored profile and "created", "updated" or "unchanged".
+    """
+    try:
+        consultant_profile_request = _with_normalized_email(consultant_profile_request)
+        logger.debug(f"Attempting to upsert consultant profile with email: {consultant_profile_request.email}.")
+        # lower() also finds rows stored before emails were normalized
+        result = db.query(ConsultantProfile).filter(
+            func.lower(ConsultantProfile.email) == consultant_profile_request.email).first()
+        if not result:
+            result = ConsultantProfile(**consultant_profile_request.model_dump())
+            db.add(result)
+            bump_pool_revision(db)
+            db.commit()
+            index_profile(result)
+            schedule_rematch(db, result.id)
+            logger.info(f"Successfully added consultant profile with ID: {result.id}.")
+            return ConsultantProfileOutput.model_validate(result), "created"
+
+        changes = _changed_fields(result, consultant_profile_request)
+        if not changes:
+            logger.info(f"Consultant profile with ID {result.id} is unchanged.")
+            return ConsultantProfileOutput.model_validate(result), "unchanged"
+        for key, value in changes.items():
+            setattr(result, key, value)
+        db.add(result)
+        bump_pool_revision(db)
+        db.commit()
+        index_profile(result)
+        invalidate_llm_scores(consultant_id=result.id)
+        schedule_rematch(db, result.id)
+        logger.info(f"Successfully updated consultant profile with ID: {result.id}.")
+        return ConsultantProfileOutput.model_validate(result), "updated"
+    except Exception as e:
+        logger.error(f"Error occurred while upserting a consultant profile: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while upserting the consultant profile."
+        )
+
+
+def upsert_consultant_profiles(db: db_dependency,
+                               consultant_profile_requests: List[ConsultantProfileSchema]) -> Dict[str, int]:
+    """
+    Bulk upsert_consultant_profile: one lookup query and one commit for the whole batch, and the changed
+    profiles are embedded into the index together. Emails are compared normalized (see normalize_email), and
+    within the batch the last request per email wins.
+
+    Returns:
+        Dict[str, int]: Number of profiles "created", "updated" and "unchanged".
+    """
+    try:
+        logger.debug(f"Attempting to upsert {len(consultant_profile_requests)} consultant profiles.")
+        requests = {request.email: request for request in map(_with_normalized_email, consultant_profile_requests)}
+        existing = {normalize_email(profile.email): profile for profile in
+                    db.query(ConsultantProfile).filter(func.lower(ConsultantProfile.email).in_(list(requests)))}
+        created, updated = [], []
+        for email, request in requests.items():
+            profile = existing.get(email)
+            if profile is None:
+                profile = ConsultantProfile(**request.model_dump())
+                db.add(profile)
+                created.append(profile)
+                continue
+            changes = _changed_fields(profile, request)
+            if changes:
+                for key, value in changes.items():
+                    setattr(profile, key, value)
+                updated.append(profile)
+        # One pool revision per changed consultant
+        changed = len(created) + len(updated)
+        if changed:
+            bump_pool_revision(db, changed)
+        db.commit()
+        index_profiles(created + updated)
+        for profile in updated:
+            invalidate_llm_scores(consultant_id=profile.id)
+        if changed:
+            # One re-match of the open rankings for the whole batch, not one per changed consultant
+            schedule_pool_rematch(db)
+        counts = {"created": len(created), "updated": len(updated),
+                  "unchanged": len(requests) - len(created) - len(updated)}
+        logger.info(f"Successfully upserted consultant profiles: {counts}.")
+        return counts
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error occurred while upserting consultant profiles: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while upserting the consultant profiles."
+        )
+
+
 def update_consultant_profile_by_id(db: db_dependency, id: int,
                                     consultant_profile_request: ConsultantProfileSchema) -> ConsultantProfileOutput:
     try:
@@ -99,7 +228,11 @@ def update_consultant_profile_by_id(db: db_dependency, id: int,
         for key, value in consultant_profile_request.model_dump().items():
             setattr(result, key, value)
         db.add(result)
+        bump_pool_revision(db)
         db.commit()
+        index_profile(result)
+        invalidate_llm_scores(consultant_id=id)
+        schedule_rematch(db, id)
         logger.info(f"Successfully updated consultant profile with ID: {id}.")
         return ConsultantProfileOutput.model_validate(result)
     except HTTPException as http_exc:
@@ -124,7 +257,11 @@ def delete_consultant_profile_by_id(db: db_dependency, id: int) -> None:
                 detail="Consultant profile not found."
             )
         db.delete(result)
+        bump_pool_revision(db)
         db.commit()
+        unindex_profile(id)
+        invalidate_llm_scores(consultant_id=id)
+        schedule_rematch(db, id)
         logger.info(f"Successfully deleted consultant profile with ID: {id}.")
     except HTTPException as http_exc:
         raise http_exc
@@ -139,15 +276,21 @@ def delete_consultant_profile_by_id(db: db_dependency, id: int) -> None:
 def delete_consultant_profile_by_email(db: db_dependency, email: str) -> None:
     try:
         logger.debug(f"Attempting to delete consultant profile with email: {email}.")
-        result = db.query(ConsultantProfile).filter(ConsultantProfile.email == email).first()
+        result = db.query(ConsultantProfile).filter(
+            func.lower(ConsultantProfile.email) == normalize_email(email)).first()
         if not result:
             logger.warning(f"Consultant profile with email {email} not found for deletion.")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Consultant profile not found."
             )
+        profile_id = result.id
         db.delete(result)
+        bump_pool_revision(db)
         db.commit()
+        unindex_profile(profile_id)
+        invalidate_llm_scores(consultant_id=profile_id)
+        schedule_rematch(db, profile_id)
         logger.info(f"Successfully deleted consultant profile with email: {email}.")
     except HTTPException as http_exc:
         raise http_exc
@@ -171,7 +314,10 @@ def update_consultant_availability(db: db_dependency, id: int, availability: str
             )
         result.availability = availability
         db.add(result)
+        bump_pool_revision(db)
         db.commit()
+        index_profile(result)
+        schedule_rematch(db, id)
         logger.info(f"Successfully updated availability of consultant profile with ID: {id} to {availability}.")
         return ConsultantProfileOutput.model_validate(result)
     except HTTPException as http_exc:
@@ -3,6 +3,7 @@ from fastapi import HTTPException, status
 from db.database import db_dependency
 from model.JobDescription import JobDescription
 from schema.JobDescription import JobDescriptionRequest
+from utility.llm_score_cache import invalidate_llm_scores
 
 
 def get_all_job_descriptions(db: db_dependency) -> list[JobDescriptionRequest]:
@@ -107,6 +108,7 @@ def update_job_description_by_id(db: db_dependency, id: int,
             setattr(result, key, value)
         db.add(result)
         db.commit()
+        invalidate_llm_scores(job_description_id=id)
         logger.info(f"Successfully updated job description with ID: {id}.")
         return JobDescriptionRequest.model_validate(result)
     except HTTPException as http_exc:
@@ -131,6 +133,7 @@ def delete_job_description_by_id(db: db_dependency, id: int) -> None:
             )
         db.delete(result)
         db.commit()
+        invalidate_llm_scores(job_description_id=id)
         logger.info(f"Successfully deleted job description with ID: {id}.")
     except HTTPException as http_exc:
         raise http_exc
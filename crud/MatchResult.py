@@ -1,97 +1,531 @@
 from fastapi import HTTPException, status
-from db.database import db_dependency
+from db.database import db_dependency, sessionLocal
 from model.MatchResult import MatchResult  # Assuming this is the ORM model
 from schema.MatchResult import MatchResultSchema
+from schema.WorkflowStatus import WorkflowStatusSchema
 from model.JobDescription import JobDescription
+from model.JobDescriptionEnum import JobDescriptionEnum
 from model.ConsultantProfile import ConsultantProfile, ConsultantEnum
 from model.WorkflowStatus import WorkflowStatus, WorkflowProgressEnum
 from model.Notification import Notification, NotificationStatusEnum
-from utility.agentic_flow import run_agent_matching
+from utility.agentic_flow import MATCH_CONFIG_VERSION, MATCH_MIN_SCORE, MATCH_SHORTLIST_K, run_agent_matching, \
+    score_candidate
+from utility.match_text import build_jd_text, build_profile_text
 from utility.send_email import send_email
+from utility.match_worker import submit_match_job
+from utility.job_queue import MATCH_QUEUE_BACKEND, enqueue_job
+from utility.instrumentation import count, current_run, record_run, stage
+from utility.checkpointing import clear_match_checkpoint
+from utility.single_flight import SingleFlight
+from utility.pool_revision import current_pool_revision
+from typing import Any, Optional, Tuple
+import hashlib
 import logging
-from datetime import datetime
+import os
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import insert
 
 logger = logging.getLogger(__name__)
+load_dotenv()
 
+# Re-score only the changed consultant against open JDs whenever a profile changes
+INCREMENTAL_REMATCH = os.getenv("incremental_rematch", "true").lower() == "true"
+# A PENDING/PROCESSING workflow older than this is presumed dead and no longer joined by new match requests
+MATCH_INFLIGHT_TIMEOUT = int(os.getenv("match_inflight_timeout", 900))
+MATCH_INFLIGHT_POLL_INTERVAL = float(os.getenv("match_inflight_poll_interval", 1))
 
-def get_all_match_results(db: db_dependency, jobDescription_id: int):
-    try:
-        logger.debug("Fetching all match results from the database.")
-        jd = db.query(JobDescription).filter(JobDescription.id == jobDescription_id).first()
-        profiles = db.query(ConsultantProfile).filter(
-            ConsultantProfile.availability != ConsultantEnum.unavailable).all()
-        if not jd or not profiles:
-            print(f"Job Descriptions or Profiles not found for Job ID: {jobDescription_id}")
-        workflow_status = WorkflowStatus(
-            job_description_id=jobDescription_id,
-            steps={"jd_parsed": True, "profiles_compared": False},
-            progress=WorkflowProgressEnum.PROCESSING,
-        )
-        db.add(workflow_status)
-        db.commit()
-        logger.debug("Invoking run_agent_matching function.")
-        result = run_agent_matching(db, jd, profiles)
-        if not result:
-            logger.warning(f"Couldn't start  for  {id} not found fo.")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Workflow status not found."
-            )
-        message = result.get("message")
-        try:
-            send_email(jd.requestor_email, "test", message)
-        except Exception as e:
-            logger.error(f"Error during send email notification agent {e}")
-        workflow_status = db.query(WorkflowStatus).filter(WorkflowStatus.job_description_id == jobDescription_id).first()
-        workflow_status.progress = WorkflowProgressEnum.COMPLETED
-        db.add(workflow_status)
-        db.commit()
-        all_matches = result.get("all_matches", [])
+# In-process single flight per job description id
+_match_flights = SingleFlight()
 
-        if not all_matches:
-            print(f"No matches found for job_id: {jobDescription_id}")
 
-        db.query(MatchResult).filter(MatchResult.job_description_id == jobDescription_id).delete()
-        db.commit()
+class MatchQueued(Exception):
+    """
+    The job description's match is queued for (or running on) a worker; the caller should poll the workflow
+    status instead of waiting for it.
+    """
 
-        for idx, match in enumerate(all_matches):
-            matched_profile = MatchResult(
-                rank=idx + 1,
-                job_description_id=jobDescription_id,
-                consultant_id=match["profile"].id,
-                similarity_score=match["similarity_score"]
+    def __init__(self, workflow_status: WorkflowStatus):
+        super().__init__(f"Match workflow {workflow_status.id} is queued.")
+        self.workflow_status_id = workflow_status.id
+        self.progress = workflow_status.progress
 
-            )
-            db.add(matched_profile)
+
+def _update_workflow(db: db_dependency, workflow_status: WorkflowStatus, progress: WorkflowProgressEnum = None,
+                     **steps) -> None:
+    """
+    Merge steps into the workflow status (and move it to progress) and commit, so pollers see it at once.
+    Inside record_run() the stage timings and counters collected so far are stored under steps["metrics"].
+    """
+    recorder = current_run()
+    if recorder is not None:
+        steps["metrics"] = recorder.as_dict()
+    workflow_status.steps = {**(workflow_status.steps or {}), **steps}
+    if progress is not None:
+        workflow_status.progress = progress
+        if progress in (WorkflowProgressEnum.COMPLETED, WorkflowProgressEnum.FAILED):
+            workflow_status.completed_at = datetime.now()
+    db.add(workflow_status)
+    db.commit()
+
+
+def _serialize_match(profile, similarity_score: float, rank: int) -> dict:
+    return {
+        "profile": {
+            "id": profile.id,
+            "name": profile.name,
+            "skills": profile.skills,
+            "experience": profile.experience,
+            "location": profile.location,
+            "availability": profile.availability,
+        },
+        "similarity_score": similarity_score,
+        "rank": rank,
+    }
+
+
+def _load_ranked_matches(db: db_dependency, jobDescription_id: int, limit: Optional[int] = None) -> list:
+    """
+    The persisted ranking of a job description (its first limit matches when given), in the shape returned
+    by run_match_workflow.
+    """
+    query = db.query(MatchResult, ConsultantProfile).join(
+        ConsultantProfile, ConsultantProfile.id == MatchResult.consultant_id).filter(
+        MatchResult.job_description_id == jobDescription_id).order_by(MatchResult.rank.asc())
+    rows = query.limit(limit).all() if limit is not None else query.all()
+    return [_serialize_match(profile, match.similarity_score, match.rank) for match, profile in rows]
+
+
+def _pool_version(jd: Any, pool_revision: int) -> str:
+    """
+    Version of the inputs of a match: the match configuration, the JD text and the consultant pool revision
+    (bumped by every consultant change). A persisted ranking with the current version is what a new run
+    would recompute.
+    """
+    payload = f"{MATCH_CONFIG_VERSION}\x00{build_jd_text(jd)}\x00{pool_revision}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _current_pool_version(db: db_dependency, jd: JobDescription) -> Tuple[str, int]:
+    """
+    The current pool version of a job description and the pool revision it is based on; reads one row.
+    """
+    pool_revision = current_pool_revision(db)
+    return _pool_version(jd, pool_revision), pool_revision
+
+
+def _claim_workflow(db: db_dependency, jobDescription_id: int, progress: WorkflowProgressEnum,
+                    steps: dict) -> Tuple[Optional[WorkflowStatus], bool]:
+    """
+    DB-level single flight: return the job description's in-flight workflow (PENDING or PROCESSING, started
+    within match_inflight_timeout) if there is one, otherwise create and commit a new one. The job description
+    row is locked (SELECT ... FOR UPDATE) so API processes checking at the same time cannot both create one.
+
+    Returns:
+        Tuple[Optional[WorkflowStatus], bool]: The workflow (None when the job description does not exist) and
+            whether it was created by this call.
+    """
+    jd = db.query(JobDescription).filter(JobDescription.id == jobDescription_id).with_for_update().first()
+    if not jd:
+        db.rollback()
+        return None, False
+    in_flight = db.query(WorkflowStatus).filter(
+        WorkflowStatus.job_description_id == jobDescription_id,
+        WorkflowStatus.progress.in_([WorkflowProgressEnum.PENDING, WorkflowProgressEnum.PROCESSING]),
+        WorkflowStatus.started_at >= datetime.now() - timedelta(seconds=MATCH_INFLIGHT_TIMEOUT),
+    ).order_by(WorkflowStatus.id.desc()).first()
+    if in_flight:
         db.commit()
-        serialized_matches = [
-            {
-                "profile": {
-                    "id": match["profile"].id,
-                    "name": match["profile"].name,
-                    "skills": match["profile"].skills,
-                    "experience": match["profile"].experience,
-                    "location": match["profile"].location,
-                    "availability": match["profile"].availability,
-                },
-                "similarity_score": match["similarity_score"],
-                "rank": idx + 1,
-            }
-            for idx, match in enumerate(all_matches)
-        ]
+        return in_flight, False
+    workflow_status = WorkflowStatus(job_description_id=jobDescription_id, steps=steps, progress=progress)
+    db.add(workflow_status)
+    db.commit()
+    return workflow_status, True
+
+
+def _await_workflow(db: db_dependency, workflow_status: WorkflowStatus) -> list:
+    """
+    Wait for a workflow run by another process (or worker) to finish and return the ranking it persisted.
+    """
+    deadline = time.monotonic() + MATCH_INFLIGHT_TIMEOUT
+    while True:
+        # End the transaction so the next read sees the other process's commits
+        db.rollback()
+        if workflow_status.progress == WorkflowProgressEnum.COMPLETED:
+            return _load_ranked_matches(db, workflow_status.job_description_id)
+        if workflow_status.progress == WorkflowProgressEnum.FAILED:
+            raise RuntimeError(f"Joined match workflow {workflow_status.id} failed: "
+                               f"{(workflow_status.steps or {}).get('error')}")
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Timed out waiting for match workflow {workflow_status.id}.")
+        time.sleep(MATCH_INFLIGHT_POLL_INTERVAL)
+
+
+def run_match_workflow(db: db_dependency, workflow_status: WorkflowStatus) -> list:
+    """
+    Run the matching pipeline for the job description of workflow_status: rank the consultant pool, email the
+    requestor, store the match results and the notification, recording each step on the workflow status.
+
+    Returns:
+        list: Serialized matches, best first.
+    """
+    jobDescription_id = workflow_status.job_description_id
+    with stage("load"):
+        jd = db.query(JobDescription).filter(JobDescription.id == jobDescription_id).first()
+        if not jd:
+            raise ValueError(f"Job description {jobDescription_id} not found.")
+        # Read before the pool is loaded, so a change made during the run leaves this ranking stale
+        pool_version, pool_revision = _current_pool_version(db, jd)
+    _update_workflow(db, workflow_status, WorkflowProgressEnum.PROCESSING, jd_parsed=True, profiles_compared=False,
+                     pool_version=pool_version, pool_revision=pool_revision)
+
+    logger.debug("Invoking run_agent_matching function.")
+    # The graph streams the pool from the database itself; only consultant ids and scores come back
+    result = run_agent_matching(db, jd, workflow_status_id=workflow_status.id)
+    if not result:
+        raise ValueError(f"Matching returned no result for Job ID: {jobDescription_id}.")
+    # The remaining steps are recorded with the results, in one commit
+    steps = {"profiles_compared": True}
+    llm_fallbacks = result.get("llm_fallbacks") or 0
+    if llm_fallbacks:
+        # Ranked partly on rule scores: serve it, but recompute it on the next request
+        logger.warning(f"{llm_fallbacks} candidates of job description {jobDescription_id} were ranked without "
+                       f"their LLM score; the ranking is marked stale.")
+        steps.update(llm_fallbacks=llm_fallbacks, pool_version=None)
+
+    message = result.get("message")
+    try:
+        with stage("email"):
+            send_email(jd.requestor_email, "test", message)
+        steps["email_sent"] = True
+    except Exception as e:
+        logger.error(f"Error during send email notification agent {e}")
+        steps["email_sent"] = False
+
+    all_matches = result.get("all_matches") or []
+    if not all_matches:
+        logger.info(f"No matches found for job_id: {jobDescription_id}")
+
+    # One unit of work: readers see either the previous ranking or the new one, never an empty or partial one
+    with stage("persist"):
+        db.query(MatchResult).filter(MatchResult.job_description_id == jobDescription_id).delete(
+            synchronize_session=False)
+        if all_matches:
+            db.execute(insert(MatchResult), [
+                {
+                    "rank": idx + 1,
+                    "job_description_id": jobDescription_id,
+                    "consultant_id": profile_id,
+                    "similarity_score": score,
+                }
+                for idx, (profile_id, score) in enumerate(all_matches)
+            ])
         email_notification = Notification(
             job_description_id=jobDescription_id,
             recipient_email=jd.requestor_email,
             workflow_status_id=workflow_status.id,
-            email_content=result.get("message"),
+            email_content=message,
             status="sent",
             sent_at=datetime.now()
         )
         db.add(email_notification)
-        db.commit()
+        db.flush()
+        count("match_results_written", len(all_matches))
+        serialized_matches = _load_ranked_matches(db, jobDescription_id)
+    _update_workflow(db, workflow_status, WorkflowProgressEnum.COMPLETED, results_saved=True,
+                     match_count=len(serialized_matches), **steps)
+    # Results are persisted, so a retry has nothing left to resume
+    clear_match_checkpoint(workflow_status.id)
+    return serialized_matches
+
+
+def _fail_workflow(db: db_dependency, workflow_status: WorkflowStatus, error: Exception) -> None:
+    try:
+        db.rollback()
+        _update_workflow(db, workflow_status, WorkflowProgressEnum.FAILED, error=str(error))
+    except Exception as e:
+        logger.error(f"Error occurred while marking workflow status {workflow_status.id} as failed: {e}")
+
+
+def execute_match_job(workflow_status_id: int, final_attempt: bool = True) -> bool:
+    """
+    Worker entry point: run the match workflow of a queued workflow status in its own DB session.
+
+    Args:
+        workflow_status_id: Workflow status created when the job was queued.
+        final_attempt: When False (the job queue will retry), a failure puts the workflow back to PENDING and
+            re-raises instead of marking it FAILED.
+
+    Returns:
+        bool: Whether the workflow completed.
+    """
+    db = sessionLocal()
+    try:
+        workflow_status = db.query(WorkflowStatus).filter(WorkflowStatus.id == workflow_status_id).first()
+        if not workflow_status:
+            logger.warning(f"Workflow status with ID {workflow_status_id} not found for match job.")
+            return False
+        with record_run():
+            try:
+                run_match_workflow(db, workflow_status)
+                logger.info(f"Match job for workflow status {workflow_status_id} completed.")
+                return True
+            except Exception as e:
+                logger.error(f"Match job for workflow status {workflow_status_id} failed: {e}")
+                if final_attempt:
+                    _fail_workflow(db, workflow_status, e)
+                    return False
+                db.rollback()
+                _update_workflow(db, workflow_status, WorkflowProgressEnum.PENDING, last_error=str(e))
+                raise
+    finally:
+        db.close()
+
+
+def enqueue_match_job(db: db_dependency, jobDescription_id: int) -> WorkflowStatusSchema:
+    """
+    Create a PENDING workflow status for the job description and hand the match to the in-process worker pool
+    or, with match_queue_backend=database, to the durable job queue. When a match of the job description is
+    already in flight, its workflow status is returned instead and nothing new is queued.
+
+    Returns:
+        WorkflowStatusSchema: The queued workflow status; poll it by id for progress.
+    """
+    try:
+        logger.debug(f"Queueing match job for job description ID: {jobDescription_id}.")
+        workflow_status, created = _claim_workflow(db, jobDescription_id, WorkflowProgressEnum.PENDING,
+                                                   {"queued": True})
+        if workflow_status is None:
+            logger.warning(f"Job description with ID {jobDescription_id} not found for matching.")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job description not found."
+            )
+        if not created:
+            logger.info(f"Match for job description ID {jobDescription_id} already in flight, attaching to "
+                        f"workflow status ID: {workflow_status.id}.")
+            return WorkflowStatusSchema.model_validate(workflow_status)
+        if MATCH_QUEUE_BACKEND == "database":
+            # Durable queue: picked up by `python -m utility.job_worker` processes
+            enqueue_job(db, "match", workflow_status_id=workflow_status.id)
+        else:
+            submit_match_job(execute_match_job, workflow_status.id)
+        logger.info(f"Queued match job with workflow status ID: {workflow_status.id}.")
+        return WorkflowStatusSchema.model_validate(workflow_status)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"Error occurred while queueing match job for job description ID {jobDescription_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while queueing the match job."
+        )
+
+
+def _rerank(db: db_dependency, jobDescription_id: int) -> None:
+    """
+    Renumber the stored ranks of a job description in match_order (score, then consultant id), the order a
+    full run stores, touching only rows whose rank changed.
+    """
+    rows = db.query(MatchResult).filter(MatchResult.job_description_id == jobDescription_id).order_by(
+        MatchResult.similarity_score.desc(), MatchResult.consultant_id.asc()).all()
+    for idx, row in enumerate(rows):
+        if row.rank != idx + 1:
+            row.rank = idx + 1
+
+
+def _open_ranked_job_description_ids(db: db_dependency) -> list:
+    return [row.job_description_id for row in db.query(MatchResult.job_description_id).join(
+        JobDescription, JobDescription.id == MatchResult.job_description_id).filter(
+        JobDescription.status.notin_([JobDescriptionEnum.completed, JobDescriptionEnum.failed])).distinct()]
+
+
+def rematch_consultant(db: db_dependency, consultant_id: int) -> int:
+    """
+    Incrementally refresh the rankings of open job descriptions after one consultant was added, edited,
+    deleted or changed availability: only that consultant is (re)scored and merged into each existing
+    ranked list, instead of re-running the full match for every JD.
+
+    The rankings keep the pool version of their last full run, so the next full-ranking request still
+    recomputes them: re-scoring one consultant cannot tell whether the change displaced others from the
+    LLM shortlist. Until then, readers of the persisted ranking (such as the top matches) see the update.
+
+    Args:
+        db: Database session.
+        consultant_id: The changed consultant.
+
+    Returns:
+        int: Number of job descriptions whose ranking was updated.
+    """
+    open_jd_ids = _open_ranked_job_description_ids(db)
+    if not open_jd_ids:
+        return 0
+
+    profile = db.query(ConsultantProfile).filter(ConsultantProfile.id == consultant_id).first()
+    eligible = profile is not None and profile.availability != ConsultantEnum.unavailable
+    jds_by_id = {jd.id: jd for jd in db.query(JobDescription).filter(JobDescription.id.in_(open_jd_ids))}
+
+    for jd_id in open_jd_ids:
+        jd = jds_by_id[jd_id]
+        db.query(MatchResult).filter(MatchResult.job_description_id == jd_id,
+                                     MatchResult.consultant_id == consultant_id).delete(synchronize_session=False)
+        if eligible:
+            # The LLM only reranks candidates whose estimate reaches the last shortlisted score, as in a full run
+            kth_score = db.query(MatchResult.similarity_score).filter(
+                MatchResult.job_description_id == jd_id).order_by(MatchResult.similarity_score.desc()).offset(
+                MATCH_SHORTLIST_K - 1).limit(1).scalar()
+            score, _ = score_candidate(jd, build_jd_text(jd), profile, llm_floor=kth_score)
+            if score >= MATCH_MIN_SCORE:
+                db.add(MatchResult(rank=0, job_description_id=jd_id, consultant_id=consultant_id,
+                                   similarity_score=score))
+        db.flush()
+        _rerank(db, jd_id)
+    db.commit()
+    logger.info(f"Incrementally re-matched consultant {consultant_id} against {len(open_jd_ids)} open job descriptions.")
+    return len(open_jd_ids)
+
+
+def execute_rematch_job(consultant_id: int) -> None:
+    """
+    Worker entry point of rematch_consultant, in its own DB session.
+    """
+    db = sessionLocal()
+    try:
+        rematch_consultant(db, consultant_id)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error occurred while re-matching consultant {consultant_id}: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def schedule_rematch(db: db_dependency, consultant_id: int) -> None:
+    """
+    Queue an incremental re-match of one consultant (no-op when incremental_rematch is disabled).
+
+    Args:
+        db: Database session.
+        consultant_id: The changed consultant.
+    """
+    if not INCREMENTAL_REMATCH:
+        return
+    try:
+        if MATCH_QUEUE_BACKEND == "database":
+            enqueue_job(db, "rematch", {"consultant_id": consultant_id})
+        else:
+            submit_match_job(execute_rematch_job, consultant_id)
+    except Exception as e:
+        logger.error(f"Error occurred while scheduling re-match of consultant {consultant_id}: {e}")
+
+
+def schedule_pool_rematch(db: db_dependency) -> int:
+    """
+    Queue one full match per open, already ranked job description after a change to many consultants at
+    once (a bulk ingest batch), where re-matching each changed consultant against every JD would cost more
+    than the full runs. Matches already in flight are joined rather than queued again. No-op when
+    incremental_rematch is disabled.
+
+    Returns:
+        int: Number of job descriptions whose match was queued or joined.
+    """
+    if not INCREMENTAL_REMATCH:
+        return 0
+    try:
+        jd_ids = _open_ranked_job_description_ids(db)
+        for jd_id in jd_ids:
+            enqueue_match_job(db, jd_id)
+        logger.info(f"Queued a pool re-match of {len(jd_ids)} open job descriptions.")
+        return len(jd_ids)
+    except Exception as e:
+        logger.error(f"Error occurred while scheduling a pool re-match: {e}")
+        return 0
+
+
+def _match_or_join(db: db_dependency, jobDescription_id: int) -> Tuple[list, Optional[str]]:
+    workflow_status, created = _claim_workflow(db, jobDescription_id, WorkflowProgressEnum.PROCESSING,
+                                               {"jd_parsed": True, "profiles_compared": False})
+    if workflow_status is None:
+        raise ValueError(f"Job description {jobDescription_id} not found.")
+    if not created:
+        if workflow_status.progress == WorkflowProgressEnum.PENDING or (workflow_status.steps or {}).get("queued"):
+            # Queued for a worker, possibly behind other jobs: do not hold the request open until it runs
+            logger.info(f"Match workflow {workflow_status.id} for job description ID {jobDescription_id} is "
+                        f"queued; not waiting for it.")
+            raise MatchQueued(workflow_status)
+        logger.info(f"Joining in-flight match workflow {workflow_status.id} for job description ID: "
+                    f"{jobDescription_id}.")
+        serialized_matches = _await_workflow(db, workflow_status)
+    else:
+        with record_run():
+            try:
+                serialized_matches = run_match_workflow(db, workflow_status)
+            except Exception as e:
+                _fail_workflow(db, workflow_status, e)
+                raise
+    return serialized_matches, (workflow_status.steps or {}).get("pool_version")
+
+
+def _etag_matches(if_none_match: Optional[str], version: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")]
+    return "*" in tags or version in tags
+
+
+def get_versioned_match_results(db: db_dependency, jobDescription_id: int,
+                                if_none_match: Optional[str] = None) -> Tuple[Optional[list], Optional[str]]:
+    """
+    Return the ranking of a job description with its pool version (usable as an ETag). When neither the JD,
+    the eligible profiles nor the match configuration changed since the last completed run, the persisted
+    ranking is served without recomputing; otherwise the match runs (shared with concurrent requests for the
+    same job description: in this process through the single-flight map, across processes through
+    _claim_workflow). A match already queued for a worker is not waited for.
+
+    Args:
+        db: Database session.
+        jobDescription_id: Job description to match.
+        if_none_match: If-None-Match header of the request.
+
+    Returns:
+        Tuple[Optional[list], Optional[str]]: The serialized matches, best first (None when the current
+            version matches if_none_match), and the pool version.
+
+    Raises:
+        MatchQueued: When the job description's match is queued for a worker.
+    """
+    try:
+        logger.debug("Fetching all match results from the database.")
+        jd = db.query(JobDescription).filter(JobDescription.id == jobDescription_id).first()
+        if not jd:
+            logger.warning(f"Job description with ID {jobDescription_id} not found for matching.")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job description not found."
+            )
+        version, _ = _current_pool_version(db, jd)
+        latest = db.query(WorkflowStatus).filter(
+            WorkflowStatus.job_description_id == jobDescription_id,
+            WorkflowStatus.progress == WorkflowProgressEnum.COMPLETED).order_by(WorkflowStatus.id.desc()).first()
+        if latest is not None and (latest.steps or {}).get("pool_version") == version:
+            if _etag_matches(if_none_match, version):
+                logger.info(f"Match results for job description ID {jobDescription_id} not modified.")
+                return None, version
+            logger.info(f"Serving persisted match results for job description ID: {jobDescription_id}.")
+            return _load_ranked_matches(db, jobDescription_id), version
+
+        (serialized_matches, version), shared = _match_flights.do(jobDescription_id, _match_or_join, db,
+                                                                  jobDescription_id)
+        if shared:
+            logger.info(f"Shared the in-flight match run for job description ID: {jobDescription_id}.")
         logger.info("Successfully fetched all match results.")
-        return serialized_matches
+        return serialized_matches, version
 
+    except HTTPException as http_exc:
+        raise http_exc
+    except MatchQueued:
+        raise
     except Exception as e:
         logger.error(f"Error occurred while fetching match results: {e}")
         raise HTTPException(
@@ -100,6 +534,37 @@ def get_all_match_results(db: db_dependency, jobDescription_id: int):
         )
 
 
+def get_all_match_results(db: db_dependency, jobDescription_id: int):
+    """
+    The current ranking of the job description; see get_versioned_match_results.
+    """
+    serialized_matches, _ = get_versioned_match_results(db, jobDescription_id)
+    return serialized_matches
+
+
+def get_persisted_match_results(db: db_dependency, jobDescription_id: int, limit: Optional[int] = None) -> list:
+    """
+    The last persisted ranking of a job description, without running the match.
+
+    Args:
+        db: Database session.
+        jobDescription_id: Job description whose ranking to read.
+        limit: Number of best matches to return; all when None.
+
+    Returns:
+        list: The serialized matches, best first; empty when the job description was never matched.
+    """
+    try:
+        logger.debug(f"Fetching persisted match results for job description ID: {jobDescription_id}.")
+        return _load_ranked_matches(db, jobDescription_id, limit)
+    except Exception as e:
+        logger.error(f"Error occurred while fetching persisted match results: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching match results."
+        )
+
+
 def get_top_3_matches(db: db_dependency, jd_id: int):
     """
     Fetch the top 3 ranked profiles for a given Job Description ID.
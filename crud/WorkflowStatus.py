@@ -3,6 +3,7 @@ from db.database import db_dependency
 from model.WorkflowStatus import WorkflowStatus  # Assuming this is the ORM model
 from schema.WorkflowStatus import WorkflowStatusSchema  # Assuming a Pydantic schema exists
 from datetime import datetime
+import numpy as np
 import logging
 logger = logging.getLogger(__name__)
 
@@ -48,7 +49,7 @@ def get_workflow_status_by_id(db: db_dependency, id: int) -> WorkflowStatusSchem
 def add_workflow_status(db: db_dependency, workflow_status_request: WorkflowStatusSchema) -> WorkflowStatusSchema:
     try:
         logger.debug("Attempting to add a new workflow status.")
-        new_workflow_status = WorkflowStatus(**workflow_status_request.model_dump())
+        new_workflow_status = WorkflowStatus(**workflow_status_request.model_dump(exclude={"id"}))
         db.add(new_workflow_status)
         db.commit()
         logger.info("Successfully added a new workflow status.")
@@ -71,7 +72,7 @@ def update_workflow_status_by_id(db: db_dependency, id: int, workflow_status_req
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Workflow status not found."
             )
-        for key, value in workflow_status_request.model_dump().items():
+        for key, value in workflow_status_request.model_dump(exclude={"id"}).items():
             setattr(result, key, value)
         db.add(result)
         db.commit()
@@ -122,7 +123,7 @@ def update_workflow_progress(db: db_dependency, id: int, progress: str, steps: d
             )
         result.progress = progress
         result.steps = steps
-        if progress == "COMPLETED":
+        if progress in ("COMPLETED", "FAILED"):
             result.completed_at = datetime.now()
         db.add(result)
         db.commit()
@@ -136,3 +137,51 @@ def update_workflow_progress(db: db_dependency, id: int, progress: str, steps: d
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while updating the workflow progress."
         )
+
+
+def get_stage_metrics(db: db_dependency, limit: int) -> dict:
+    """
+    Latency percentiles and mean counters per stage across the most recent instrumented match runs.
+
+    Args:
+        db: Database session.
+        limit: Number of most recent workflow statuses to aggregate.
+
+    Returns:
+        dict: {"runs": n, "stages": {stage: {"count", "p50_ms", "p95_ms", "p99_ms", "max_ms", "counters"}}}
+    """
+    try:
+        logger.debug(f"Aggregating stage metrics over the last {limit} workflow runs.")
+        rows = db.query(WorkflowStatus.steps).order_by(WorkflowStatus.id.desc()).limit(limit).all()
+        durations, counters, runs = {}, {}, 0
+        for (steps,) in rows:
+            stages = ((steps or {}).get("metrics") or {}).get("stages") or {}
+            if not stages:
+                continue
+            runs += 1
+            for name, stage in stages.items():
+                if "duration_ms" in stage:
+                    durations.setdefault(name, []).append(stage["duration_ms"])
+                for counter, value in (stage.get("counters") or {}).items():
+                    counters.setdefault(name, {}).setdefault(counter, []).append(value)
+
+        metrics = {}
+        for name, values in durations.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            metrics[name] = {
+                "count": len(values),
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "p99_ms": round(float(p99), 3),
+                "max_ms": round(float(max(values)), 3),
+                "counters": {counter: round(float(np.mean(samples)), 3)
+                             for counter, samples in counters.get(name, {}).items()},
+            }
+        logger.info(f"Aggregated stage metrics over {runs} workflow runs.")
+        return {"runs": runs, "stages": metrics}
+    except Exception as e:
+        logger.error(f"Error occurred while aggregating stage metrics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while aggregating stage metrics."
+        )
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from db.database import engine
 from db.database import base
@@ -10,10 +11,27 @@ from router.Notification import router as notification_router
 from router.ConsultantProfile import router as consultant_profile_router
 from router.WorkflowStatus import router as workflow_status_router
 from router.MatchResult import router as match_result_router
+from utility.embeddings import load_embedding_backend, close_embedding_backend
+from utility.profile_index import load_profile_index, profile_index
+from utility.match_worker import shutdown_match_workers
+from utility.pdf_reader import shutdown_pdf_workers
 import logging
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the embedding model/client once so every request shares it
+    load_embedding_backend()
+    load_profile_index()
+    yield
+    shutdown_match_workers()
+    shutdown_pdf_workers()
+    profile_index.save_if_dirty()
+    close_embedding_backend()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Define allowed origins for CORS
 origins = [
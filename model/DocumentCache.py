@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from db.database import base
+from datetime import datetime
+
+
+class DocumentCache(base):
+    __tablename__ = 'document_extraction_cache'
+    __allow_unmapped__ = True
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(32), nullable=False)  # "resume" or "job_description"
+    file_hash = Column(String(64), nullable=False, index=True)  # sha256 of the uploaded bytes
+    text_hash = Column(String(64), nullable=False, index=True)  # sha256 of the canonical extracted text
+    extractor_version = Column(String(64), nullable=False)  # prompt/model the fields were extracted with
+    extracted = Column(JSON, nullable=False)  # fields returned by the extractor
+    created_at = Column(DateTime, default=datetime.now)
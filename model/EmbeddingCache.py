@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Integer, DateTime, LargeBinary
+from db.database import base
+from datetime import datetime
+
+
+class EmbeddingCache(base):
+    __tablename__ = 'embedding_cache'
+    __allow_unmapped__ = True
+
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), unique=True, nullable=False, index=True)  # sha256 of model name + canonical text
+    model_name = Column(String(255), nullable=False)
+    dimension = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32 bytes
+    created_at = Column(DateTime, default=datetime.now)
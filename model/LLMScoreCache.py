@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime
+from db.database import base
+from datetime import datetime
+
+
+class LLMScoreCache(base):
+    __tablename__ = 'llm_score_cache'
+    __allow_unmapped__ = True
+
+    id = Column(Integer, primary_key=True)
+    cache_key = Column(String(64), unique=True, nullable=False, index=True)  # sha256 of prompt version + JD + profile
+    prompt_version = Column(String(64), nullable=False)
+    job_description_id = Column(Integer, index=True)  # kept for invalidation, not a foreign key
+    consultant_id = Column(Integer, index=True)  # kept for invalidation, not a foreign key
+    score = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
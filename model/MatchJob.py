@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON, Enum, ForeignKey
+from db.database import base
+from datetime import datetime
+from model.MatchJobEnum import MatchJobStatusEnum
+
+
+class MatchJob(base):
+    __tablename__ = 'match_jobs'
+    __allow_unmapped__ = True
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(32), nullable=False)  # e.g. "match", "ingest_resume"
+    payload = Column(JSON)  # handler arguments, e.g. {"path": "..."}
+    workflow_status_id = Column(ForeignKey("workflow_statuses.id", ondelete="CASCADE"))  # progress of match jobs
+    status = Column(Enum(MatchJobStatusEnum), default=MatchJobStatusEnum.queued, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    available_at = Column(DateTime, default=datetime.now, index=True)  # not claimable before this (retry backoff)
+    leased_by = Column(String(255))  # worker id holding the lease
+    lease_expires_at = Column(DateTime, index=True)  # expired leases are reclaimed by other workers
+    last_error = Column(String(1000))
+    created_at = Column(DateTime, default=datetime.now)
+    finished_at = Column(DateTime)
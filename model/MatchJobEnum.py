@@ -0,0 +1,7 @@
+from enum import Enum
+
+class MatchJobStatusEnum(str, Enum):
+    queued = "queued"
+    leased = "leased"
+    done = "done"
+    failed = "failed"
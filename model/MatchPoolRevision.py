@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, DateTime
+from db.database import base
+from datetime import datetime
+
+
+class MatchPoolRevision(base):
+    __tablename__ = 'match_pool_revision'
+    __allow_unmapped__ = True
+
+    id = Column(Integer, primary_key=True)  # single row, id 1
+    revision = Column(Integer, nullable=False, default=0)  # bumped with every consultant pool change
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
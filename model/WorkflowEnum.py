@@ -3,4 +3,5 @@ from enum import Enum
 class WorkflowProgressEnum(str, Enum):
     PENDING = "PENDING"
     PROCESSING = "PROCESSING"
-    COMPLETED = "COMPLETED"
\ No newline at end of file
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
\ No newline at end of file
@@ -4,8 +4,8 @@ from db.database import db_dependency
 from schema.ConsultantProfile import ConsultantProfileSchema
 from core.security import get_current_user
 from typing import Annotated
-from PyPDF2 import PdfReader
-from utility.file_reader_using_genai import extract_information
+from fastapi.concurrency import run_in_threadpool
+from utility.file_reader_using_genai import aextract_documents
 import logging
 
 logger = logging.getLogger(__name__)
@@ -114,20 +114,28 @@ async def upload_multiple_pdfs(db: db_dependency, files: list[UploadFile] = File
                     detail=f"File {file.filename} is not a valid PDF."
                 )
 
-            logger.debug(f"Reading file: {file.filename}")
-            pdf_reader = PdfReader(file.file)
-            pdf_content = ""
-
-            for page in pdf_reader.pages:
-                pdf_content += page.extract_text()
-
-            logger.info(f"Extracted content from {file.filename}")
-            processed_result = extract_information(pdf_content)
-            consultant_profile_service.add_consultant_profile(db, processed_result)
-            processed_results.append({file.filename: processed_result})
-
-        return {"message": "PDF files processed successfully.", "results": processed_results}
+        # Cached documents skip the PDF parse and/or the LLM; the rest are parsed in the PDF process pool and
+        # extracted in one concurrent LLM batch. A failed file does not fail the others.
+        documents = [(file.filename, await file.read()) for file in files]
+        errors = []
+        for document in await aextract_documents(documents):
+            if isinstance(document.result, Exception):
+                logger.error(f"Could not extract a consultant profile from {document.filename}: {document.result}")
+                errors.append({document.filename: str(document.result)})
+                continue
+            cache_note = f" ({document.cache_hit} cache hit)" if document.cache_hit else ""
+            logger.info(f"Extracted content from {document.filename}{cache_note}")
+            # Re-uploaded resumes update the consultant with the same email instead of failing on it
+            _, action = await run_in_threadpool(consultant_profile_service.upsert_consultant_profile, db,
+                                                document.result)
+            processed_results.append({document.filename: document.result, "action": action})
+
+        message = "PDF files processed successfully." if not errors else \
+            f"Processed {len(processed_results)} of {len(files)} PDF files."
+        return {"message": message, "results": processed_results, "errors": errors}
 
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"An error occurred while processing PDF files: {e}")
         raise HTTPException(
@@ -5,8 +5,8 @@ from db.database import db_dependency
 from schema.JobDescription import JobDescriptionRequest
 from core.security import get_current_user
 from typing import Annotated
-from PyPDF2 import PdfReader
-from utility.jobdescription_reader import extract_information
+from fastapi.concurrency import run_in_threadpool
+from utility.jobdescription_reader import aextract_documents
 import logging
 import requests
 logger = logging.getLogger(__name__)
@@ -53,16 +53,16 @@ async def read_job_descriptions_by_title(user: Annotated[dict, Depends(get_curre
         )
 
 
-# GET job description by ID
+# GET job description by ID with its persisted top 3 matches (a plain def: the queries block)
 @router.get("/{job_description_id}", status_code=status.HTTP_200_OK)
-async def read_job_description_by_id(user: Annotated[dict, Depends(get_current_user)], db: db_dependency,
-                                     job_description_id: int = Path(...)):
+def read_job_description_by_id(user: Annotated[dict, Depends(get_current_user)], db: db_dependency,
+                               job_description_id: int = Path(...)):
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is not authorized")
     try:
         logger.debug(f"Fetching job description with ID: {job_description_id}.")
         job_description = job_description_service.get_job_description_by_id(db, job_description_id)
-        match_results = match_result_service.get_all_match_results(db, job_description_id)
+        match_results = match_result_service.get_persisted_match_results(db, job_description_id, limit=3)
         logger.info(f"Successfully fetched job description with ID: {job_description_id}.")
         return {
             "job_description": job_description,
@@ -131,24 +131,30 @@ async def upload_job_descriptions(
                     detail=f"File {file.filename} is not a valid PDF."
                 )
 
-            logger.debug(f"Reading file: {file.filename}")
-            pdf_reader = PdfReader(file.file)
-            pdf_content = ""
-
-            for page in pdf_reader.pages:
-                pdf_content += page.extract_text()
-
-            logger.info(f"Extracted content from {file.filename}")
-            id = user.get("id")
-            email = user.get("email")
+        # Cached documents skip the PDF parse and/or the LLM; the rest are parsed in the PDF process pool and
+        # extracted in one concurrent LLM batch. A failed file does not fail the others.
+        id = user.get("id")
+        email = user.get("email")
+        documents = [(file.filename, await file.read()) for file in files]
+        errors = []
+        for document in await aextract_documents(documents):
+            if isinstance(document.result, Exception):
+                logger.error(f"Could not extract a job description from {document.filename}: {document.result}")
+                errors.append({document.filename: str(document.result)})
+                continue
+            cache_note = f" ({document.cache_hit} cache hit)" if document.cache_hit else ""
+            logger.info(f"Extracted content from {document.filename}{cache_note}")
             logger.debug("Creating a new job description.")
-            processed_result = extract_information(pdf_content)  # Assuming a similar function exists
-            job_description_service.add_job_description(db, processed_result, id, email)
-            processed_results.append({file.filename: processed_result})
+            await run_in_threadpool(job_description_service.add_job_description, db, document.result, id, email)
+            processed_results.append({document.filename: document.result})
 
-        logger.info("Successfully processed all job description PDFs.")
-        return {"message": "Job description PDFs processed successfully.", "results": processed_results}
+        logger.info(f"Processed {len(processed_results)} of {len(files)} job description PDFs.")
+        message = "Job description PDFs processed successfully." if not errors else \
+            f"Processed {len(processed_results)} of {len(files)} job description PDFs."
+        return {"message": message, "results": processed_results, "errors": errors}
 
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"Error occurred while processing job description PDFs: {e}")
         raise HTTPException(
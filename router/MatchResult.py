@@ -1,25 +1,72 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Path, Header, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from crud import MatchResult as match_result_service
 from db.database import db_dependency
 from schema.MatchResult import MatchResultSchema
 from core.security import get_current_user
-from typing import Annotated
+from typing import Annotated, Optional
 import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-# GET all match results
+def _queued_match(job_description_id: int, workflow_status_id: int, progress) -> dict:
+    return {
+        "workflow_status_id": workflow_status_id,
+        "progress": progress,
+        "status_url": f"/api/workflow-status/{workflow_status_id}",
+        "results_url": f"/api/match-result/job/{job_description_id}",
+    }
+
+
+# POST to queue a match job; poll /api/workflow-status/{id} for progress
+@router.post("/all-matches/{job_description_id}", status_code=status.HTTP_202_ACCEPTED)
+def queue_match_job(user: Annotated[dict, Depends(get_current_user)], job_description_id: int,
+                    db: db_dependency):
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is not authorized")
+    try:
+        logger.debug(f"Queueing match job for job description ID: {job_description_id}.")
+        workflow_status = match_result_service.enqueue_match_job(db, job_description_id)
+        logger.info(f"Successfully queued match job for job description ID: {job_description_id}.")
+        return _queued_match(job_description_id, workflow_status.id, workflow_status.progress)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"Error occurred while queueing match job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while queueing the match job."
+        )
+
+
+# GET all match results (runs the match synchronously; a plain def so it runs in the threadpool, not the event loop).
+# The persisted ranking is served when nothing changed since the last run; ETag/If-None-Match give 304s.
+# When a match of the JD is already queued for a worker, 202 with its workflow status id is returned instead.
 @router.get("/all-matches/{job_description_id}", status_code=status.HTTP_200_OK)
-async def get_all_match_results(user: Annotated[dict, Depends(get_current_user)], job_description_id: int,
-                                db: db_dependency):
+def get_all_match_results(user: Annotated[dict, Depends(get_current_user)], job_description_id: int,
+                          db: db_dependency, response: Response, if_none_match: Optional[str] = Header(None)):
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is not authorized")
     try:
         logger.debug("Fetching all match results.")
-        match_results = match_result_service.get_all_match_results(db, job_description_id)
+        match_results, version = match_result_service.get_versioned_match_results(db, job_description_id,
+                                                                                  if_none_match)
+        etag = f'"{version}"' if version else None
+        if match_results is None:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        if etag:
+            response.headers["ETag"] = etag
         logger.info("Successfully fetched all match results.")
         return match_results
+    except match_result_service.MatchQueued as queued:
+        logger.info(f"Match for job description ID {job_description_id} is queued as workflow status ID: "
+                    f"{queued.workflow_status_id}.")
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=jsonable_encoder(
+            _queued_match(job_description_id, queued.workflow_status_id, queued.progress)))
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"Error occurred while fetching match results: {e}")
         raise HTTPException(
@@ -28,16 +75,19 @@ async def get_all_match_results(user: Annotated[dict, Depends(get_current_user)]
         )
 
 
+# GET the persisted top 3 matches (does not run the match; queue one with POST /all-matches)
 @router.get("/top-3-matches/{job_description_id}", status_code=status.HTTP_200_OK)
-async def top_3_match_results(user: Annotated[dict, Depends(get_current_user)], job_description_id: int,
-                              db: db_dependency):
+def top_3_match_results(user: Annotated[dict, Depends(get_current_user)], job_description_id: int,
+                        db: db_dependency):
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is not authorized")
     try:
-        logger.debug("Fetching all match results.")
-        match_results = match_result_service.get_all_match_results(db, job_description_id)
-        logger.info("Successfully fetched all match results.")
+        logger.debug("Fetching top 3 match results.")
+        match_results = match_result_service.get_persisted_match_results(db, job_description_id, limit=3)
+        logger.info("Successfully fetched top 3 match results.")
         return match_results
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"Error occurred while fetching match results: {e}")
         raise HTTPException(
@@ -28,6 +28,28 @@ async def read_all_workflow_statuses(user: Annotated[dict, Depends(get_current_u
         )
 
 
+# GET per-stage latency percentiles across recent match runs (declared before /{workflow_status_id}).
+# A plain def route: the aggregation queries the database and computes percentiles, so it runs in the threadpool
+@router.get("/stage-metrics", status_code=status.HTTP_200_OK)
+def read_stage_metrics(user: Annotated[dict, Depends(get_current_user)], db: db_dependency,
+                       limit: int = Query(200, ge=1, le=10000)):
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is not authorized")
+    try:
+        logger.debug(f"Fetching stage metrics over the last {limit} workflow runs.")
+        metrics = workflow_status_service.get_stage_metrics(db, limit)
+        logger.info("Successfully fetched stage metrics.")
+        return metrics
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"Error occurred while fetching stage metrics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while fetching stage metrics."
+        )
+
+
 # GET workflow status by ID
 @router.get("/{workflow_status_id}", status_code=status.HTTP_200_OK)
 async def read_workflow_status_by_id(user: Annotated[dict, Depends(get_current_user)], db: db_dependency, workflow_status_id: int = Path(...)):
@@ -116,7 +138,7 @@ async def update_workflow_progress(
     db: db_dependency,
     steps: dict,
     workflow_status_id: int = Path(...),
-    progress: str = Query(..., regex="^(PENDING|PROCESSING|COMPLETED)$"),
+    progress: str = Query(..., regex="^(PENDING|PROCESSING|COMPLETED|FAILED)$"),
 ):
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is not authorized")
@@ -21,3 +21,13 @@ class ConsultantProfileSchema(BaseModel):
 
 class ConsultantProfileOutput(ConsultantProfileSchema):
     id: int
+
+
+# Fields the LLM is asked to extract from a resume
+class ExtractedInfo(BaseModel):
+    name: str = Field(description="Name of the consultant")
+    email: str = Field(description="Email of the consultant")
+    skills: List[str] = Field(description="List of skills of the consultant")
+    experience: Optional[int] = Field(description="Total years of work experience of the consultant as an integer")
+    location: Optional[str] = Field(description="Location of the consultant")
+    project: Optional[str] = Field(description="Past project details")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, Any
 from datetime import datetime
 from model.WorkflowEnum import WorkflowProgressEnum
 import logging
@@ -7,11 +7,12 @@ logger = logging.getLogger(__name__)
 
 
 class WorkflowStatusSchema(BaseModel):
+    id: Optional[int] = Field(None, description="Workflow status ID, assigned by the database")
     job_description_id: int = Field(..., description="Foreign key to the job description ID")
     progress: WorkflowProgressEnum = Field(default=WorkflowProgressEnum.PENDING, description="Current progress of the workflow")
     started_at: datetime = Field(default_factory=datetime.now, description="Timestamp when the workflow started")
     completed_at: Optional[datetime] = Field(None, description="Timestamp when the workflow was completed")
-    steps: Dict[str, bool] = Field(..., description="JSON object representing the steps and their completion status")
+    steps: Dict[str, Any] = Field(..., description="JSON object representing the steps and their completion status")
 
     class Config:
         from_attributes = True
@@ -0,0 +1,124 @@
+import os
+
+# Settings read at import time; the tests never reach MySQL or Azure OpenAI
+os.environ.update(USER="test", PASSWORD="test", HOST="localhost", PORT="3306", DB_NAME="test")
+for name in ["openai_api_key", "openai_api_version", "model_name", "embedding_openai_api_key",
+             "embedding_openai_api_version"]:
+    os.environ.setdefault(name, "test")
+for name in ["azure_endpoint", "embedding_azure_endpoint"]:
+    os.environ.setdefault(name, "https://test.openai.azure.com")
+os.environ.setdefault("embedding_model_name", "test-model")
+os.environ.setdefault("match_checkpoint_backend", "memory")
+
+import hashlib
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import db.database as database
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+database.engine = engine
+database.sessionLocal.configure(bind=engine)
+
+import model.user, model.JobDescription, model.MatchResult, model.ConsultantProfile, model.WorkflowStatus  # noqa: E401,E402
+import model.Notification, model.EmbeddingCache, model.LLMScoreCache, model.MatchJob, model.DocumentCache  # noqa: E401,E402
+import model.MatchPoolRevision  # noqa: E402
+
+database.base.metadata.create_all(engine)
+
+
+@pytest.fixture
+def db():
+    """
+    Session on the in-memory test database; every table is emptied after the test.
+    """
+    session = database.sessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with engine.begin() as connection:
+            for table in reversed(database.base.metadata.sorted_tables):
+                connection.execute(table.delete())
+
+
+class FakeEmbeddingBackend:
+    """
+    Deterministic stand-in for the embedding backend: a unit vector seeded by the text.
+    """
+
+    model_name = "test-model"
+    dimension = 32
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts):
+        self.calls += 1
+        vectors = []
+        for text in texts:
+            seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+            vector = np.random.default_rng(seed).standard_normal(self.dimension).astype('float32')
+            vectors.append(vector / np.linalg.norm(vector))
+        return vectors
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def embedding_backend(db, monkeypatch):
+    """
+    Route every embedding through FakeEmbeddingBackend, with empty in-process caches.
+    """
+    from utility import embedding_cache, embeddings, profile_index
+
+    backend = FakeEmbeddingBackend()
+    monkeypatch.setattr(embeddings, "get_backend", lambda: backend)
+    monkeypatch.setattr(profile_index, "get_backend", lambda: backend)
+    embedding_cache._memory_cache.clear()
+    yield backend
+    embedding_cache._memory_cache.clear()
+
+
+@pytest.fixture
+def match_pool(db, embedding_backend, monkeypatch, tmp_path):
+    """
+    A job description and 60 consultants (one unavailable), with a fresh profile index that the ranking
+    retrieves the 20 nearest consultants from, and a fake LLM that scores 0.9, or fails for the ids added to the returned failures set.
+
+    Returns:
+        Tuple: The job description, the consultant ids sent to the LLM and the failures set.
+    """
+    import crud.MatchResult as match_crud
+    from model.ConsultantProfile import ConsultantProfile
+    from model.JobDescription import JobDescription
+    from utility import agentic_flow
+    from utility.profile_index import ProfileIndex
+
+    monkeypatch.setattr(agentic_flow, "profile_index", ProfileIndex(path=str(tmp_path / "index.faiss")))
+    monkeypatch.setattr(agentic_flow, "MATCH_INDEX_SHARD_SIZE", 25)
+    monkeypatch.setattr(agentic_flow, "MATCH_SHORTLIST_K", 5)
+    monkeypatch.setattr(agentic_flow, "MATCH_RETRIEVAL_OVERFETCH", 4)
+    monkeypatch.setattr(match_crud, "send_email", lambda *args: None)
+    llm_calls, failures = [], set()
+
+    def fake_llm(jd_text, resumes, candidate_ids, job_description_id=None):
+        llm_calls.extend(candidate_ids)
+        return [None if candidate_id in failures else 0.9 for candidate_id in candidate_ids]
+
+    monkeypatch.setattr(agentic_flow, "score_resumes", fake_llm)
+    jd = JobDescription(title="Python developer", location="Pune", experience="3 years", skills=["Python", "SQL"],
+                        requestor_email="requestor@example.com")
+    db.add(jd)
+    for profile_id in range(1, 61):
+        db.add(ConsultantProfile(id=profile_id, name=f"Consultant {profile_id}", email=f"c{profile_id}@example.com",
+                                 skills=["Python"] if profile_id % 2 else ["Java"], experience=profile_id % 8,
+                                 location="Pune" if profile_id % 3 else "Delhi",
+                                 availability="unavailable" if profile_id == 60 else "available"))
+    db.commit()
+    return jd, llm_calls, failures
@@ -0,0 +1,68 @@
+import pytest
+
+import crud.MatchResult as match_crud
+from model.MatchResult import MatchResult
+from model.WorkflowStatus import WorkflowStatus
+from utility.agentic_flow import LLM_WEIGHT, MATCH_MIN_SCORE, VECTOR_WEIGHT, app, merge_rankings
+from utility.checkpointing import match_thread_id
+
+
+def test_merged_scores_never_increase_down_the_ranking():
+    # Two shortlisted candidates the LLM rated poorly and a tail candidate with a strong rule score
+    state = {
+        "candidates": [[1, "snippet 1", 0.6, 0.8], [2, "snippet 2", 0.5, 0.7]],
+        "tail": [[3, VECTOR_WEIGHT * 0.9 + LLM_WEIGHT * 0.66]],
+        "llm_scores": [[1, 0.4], [2, 0.5]],
+    }
+
+    result = merge_rankings(state)
+
+    scores = [score for _, score in result["all_matches"]]
+    assert scores == sorted(scores, reverse=True)
+    by_id = dict(result["all_matches"])
+    assert by_id[1] == pytest.approx(VECTOR_WEIGHT * 0.6 + LLM_WEIGHT * 0.4)
+    assert result["all_matches"][0][0] == 3
+    assert [profile_id for profile_id, _ in result["top_matches"]] == [3, 2, 1]
+
+
+def test_equal_scores_are_ordered_by_consultant_id():
+    state = {"candidates": [], "tail": [[5, 0.5], [2, 0.5]], "llm_scores": []}
+
+    assert [profile_id for profile_id, _ in merge_rankings(state)["all_matches"]] == [2, 5]
+
+
+def test_shortlisted_candidate_without_llm_score_keeps_its_rule_score():
+    state = {"candidates": [[1, "snippet 1", 0.5, 0.5]], "tail": [], "llm_scores": []}
+
+    assert merge_rankings(state)["all_matches"] == [[1, pytest.approx(0.5)]]
+
+
+def test_match_workflow_ranks_the_retrieved_candidates_without_checkpointing_the_pool(db, match_pool, monkeypatch):
+    jd, llm_calls, _ = match_pool
+    workflow_status = WorkflowStatus(job_description_id=jd.id, steps={})
+    db.add(workflow_status)
+    db.commit()
+    # Inspect the checkpoint when the workflow clears it
+    checkpoints = []
+    monkeypatch.setattr(match_crud, "clear_match_checkpoint", lambda workflow_status_id: checkpoints.append(
+        app.get_state({"configurable": {"thread_id": match_thread_id(workflow_status_id)}}).values))
+
+    matches = match_crud.run_match_workflow(db, workflow_status)
+
+    assert len(llm_calls) == 5
+    # Only the 20 nearest consultants of the 59 matchable ones are retrieved and ranked
+    assert 5 < len(matches) <= 20
+    assert [match["rank"] for match in matches] == list(range(1, len(matches) + 1))
+    scores = [match["similarity_score"] for match in matches]
+    assert scores == sorted(scores, reverse=True) and min(scores) >= MATCH_MIN_SCORE
+    ranked_ids = {match["profile"]["id"] for match in matches}
+    assert 60 not in ranked_ids
+    assert db.query(MatchResult).filter(MatchResult.job_description_id == jd.id).count() == len(matches)
+
+    state = checkpoints[0]
+    assert state["pool_shards"] == [[1, 25], [26, 50], [51, 59]]
+    assert "Consultant 42" not in repr(state)
+    assert len(state["candidates"]) == 5
+    # Only the final ranking is carried to the last checkpoints
+    assert state["tail"] == [] and state["jd_embedding"] == []
+    assert len(state["all_matches"]) == len(matches)
@@ -0,0 +1,69 @@
+import zipfile
+
+import pytest
+
+import crud.ConsultantProfile as consultant_crud
+from model.ConsultantProfile import ConsultantProfile
+from schema.ConsultantProfile import ConsultantProfileSchema
+from utility import bulk_ingest, document_cache, file_reader_using_genai
+
+
+@pytest.fixture
+def fake_extraction(db, monkeypatch):
+    """
+    PDFs whose bytes are "name,email" text; texts containing "garbled" fail extraction.
+    """
+    extracted = []
+
+    async def fake_parse(documents):
+        return [data.decode() for _, data in documents]
+
+    async def fake_extract(texts, max_concurrency=None):
+        extracted.extend(texts)
+        return [ValueError("unreadable") if "garbled" in text else
+                ConsultantProfileSchema(name=text.split(",")[0], email=text.split(",")[1], skills=["Python"])
+                for text in texts]
+
+    monkeypatch.setattr(document_cache, "extract_pdf_texts", fake_parse)
+    monkeypatch.setattr(file_reader_using_genai, "aextract_information_batch", fake_extract)
+    monkeypatch.setattr(consultant_crud, "index_profiles", lambda profiles: None)
+    monkeypatch.setattr(consultant_crud, "schedule_rematch", lambda *args: None)
+    monkeypatch.setattr(consultant_crud, "schedule_pool_rematch", lambda *args: None)
+    return extracted
+
+
+def write_resumes(directory, resumes):
+    for name, text in resumes.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(text.encode())
+
+
+def test_interrupted_run_resumes_with_the_failed_files(db, fake_extraction, tmp_path):
+    source, checkpoint = tmp_path / "drop", str(tmp_path / "checkpoint")
+    write_resumes(source, {"a.pdf": "Asha,asha@example.com", "team/b.pdf": "Ravi,ravi@example.com",
+                           "c.pdf": "garbled", "notes.txt": "not a resume"})
+
+    report = bulk_ingest.ingest(str(source), checkpoint, batch_size=2, concurrency=2)
+
+    assert (report["processed"], report["stored"]) == (3, 2)
+    assert [failure["file"] for failure in report["failed"]] == ["c.pdf"]
+    assert report["profiles"]["created"] == 2
+
+    write_resumes(source, {"c.pdf": "Meera,meera@example.com"})
+    report = bulk_ingest.ingest(str(source), checkpoint, batch_size=2, concurrency=2)
+
+    assert (report["skipped"], report["processed"], report["stored"]) == (2, 1, 1)
+    assert sorted(profile.name for profile in db.query(ConsultantProfile)) == ["Asha", "Meera", "Ravi"]
+
+
+def test_archive_members_are_ingested(db, fake_extraction, tmp_path):
+    archive = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive, "w") as resumes:
+        resumes.writestr("x/asha.pdf", "Asha,asha@example.com")
+        resumes.writestr("x/asha-copy.pdf", "Asha,ASHA@example.com")
+
+    report = bulk_ingest.ingest(str(archive), str(tmp_path / "checkpoint"), batch_size=10, concurrency=2)
+
+    assert report["stored"] == 2
+    assert db.query(ConsultantProfile).count() == 1
@@ -0,0 +1,59 @@
+import pytest
+
+import crud.ConsultantProfile as consultant_crud
+from model.ConsultantProfile import ConsultantProfile
+from schema.ConsultantProfile import ConsultantProfileSchema
+
+
+@pytest.fixture
+def profiles(db, monkeypatch):
+    rematches = []
+    monkeypatch.setattr(consultant_crud, "index_profile", lambda profile: None)
+    monkeypatch.setattr(consultant_crud, "index_profiles", lambda profiles: None)
+    monkeypatch.setattr(consultant_crud, "schedule_rematch", lambda db, *args: rematches.append(args))
+    monkeypatch.setattr(consultant_crud, "schedule_pool_rematch", lambda db: rematches.append("pool"))
+    return rematches
+
+
+def request(email, **fields):
+    return ConsultantProfileSchema(name=fields.pop("name", "Asha Rao"), email=email, skills=["Python"], **fields)
+
+
+def test_upsert_matches_emails_case_insensitively(db, profiles):
+    _, action = consultant_crud.upsert_consultant_profile(db, request(" Asha.Rao@Example.com "))
+    assert action == "created"
+
+    stored, action = consultant_crud.upsert_consultant_profile(db, request("asha.rao@example.COM", experience=5))
+
+    assert action == "updated"
+    assert stored.email == "asha.rao@example.com"
+    assert stored.experience == 5
+    assert db.query(ConsultantProfile).count() == 1
+
+
+def test_upsert_normalizes_rows_stored_before_normalization(db, profiles):
+    db.add(ConsultantProfile(name="Asha Rao", email="Asha.Rao@Example.com", skills=["Python"]))
+    db.commit()
+
+    stored, action = consultant_crud.upsert_consultant_profile(db, request("asha.rao@example.com"))
+
+    assert action == "updated"
+    assert stored.email == "asha.rao@example.com"
+    assert db.query(ConsultantProfile).count() == 1
+
+
+def test_bulk_upsert_collapses_emails_differing_in_case(db, profiles):
+    db.add(ConsultantProfile(name="Asha Rao", email="Asha.Rao@Example.com", skills=["Python"]))
+    db.commit()
+
+    counts = consultant_crud.upsert_consultant_profiles(db, [
+        request("ASHA.RAO@example.com", experience=4),
+        request("ravi@example.com", name="Ravi"),
+        request(" Ravi@Example.com", name="Ravi", experience=2),
+    ])
+
+    assert counts == {"created": 1, "updated": 1, "unchanged": 0}
+    assert sorted((profile.email, profile.experience) for profile in db.query(ConsultantProfile)) == \
+        [("asha.rao@example.com", 4), ("ravi@example.com", 2)]
+    # One pool re-match for the batch instead of one per changed consultant
+    assert profiles == ["pool"]
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+import pytest
+
+from schema.JobDescription import JobDescriptionRequest
+from utility import document_cache
+
+
+@pytest.fixture
+def extractor(db, monkeypatch):
+    """
+    Fake PDF parse (the bytes are the text) and LLM extraction, recording what each was given.
+    """
+    parsed, extracted = [], []
+
+    async def fake_parse(documents):
+        parsed.extend(filename for filename, _ in documents)
+        return [ValueError("not a PDF") if data == b"broken" else data.decode() for _, data in documents]
+
+    async def fake_extract(texts):
+        extracted.extend(texts)
+        return [ValueError("LLM failed") if "fail" in text else
+                JobDescriptionRequest(title=text.split()[0], skills=["Python"]) for text in texts]
+
+    monkeypatch.setattr(document_cache, "extract_pdf_texts", fake_parse)
+
+    def extract(documents, version="v1"):
+        return asyncio.run(document_cache.aextract_documents(documents, "job_description", JobDescriptionRequest,
+                                                             version, fake_extract))
+
+    return extract, parsed, extracted
+
+
+def test_repeat_upload_skips_parse_and_llm(extractor):
+    extract, parsed, extracted = extractor
+    extract([("a.pdf", b"Developer in Pune"), ("b.pdf", b"Developer in Pune")])
+    assert extracted == ["Developer in Pune"]
+
+    results = extract([("a.pdf", b"Developer in Pune")])
+
+    assert parsed == ["a.pdf", "b.pdf"]
+    assert [(result.result.title, result.cache_hit) for result in results] == [("Developer", "file")]
+
+
+def test_same_text_in_new_bytes_skips_the_llm(extractor):
+    extract, parsed, extracted = extractor
+    extract([("a.pdf", b"Tester in Pune")])
+
+    [result] = extract([("scan.pdf", b"  Tester   in Pune\n")])
+
+    assert result.cache_hit == "text" and result.result.title == "Tester"
+    assert extracted == ["Tester in Pune"]
+    # The new bytes are remembered, so the next upload skips the parse as well
+    assert extract([("scan.pdf", b"  Tester   in Pune\n")])[0].cache_hit == "file"
+
+
+def test_other_extractor_version_and_failures_are_not_reused(extractor):
+    extract, _, extracted = extractor
+    extract([("a.pdf", b"Architect"), ("c.pdf", b"fail this one"), ("d.pdf", b"broken")])
+
+    results = extract([("a.pdf", b"Architect"), ("c.pdf", b"fail this one"), ("d.pdf", b"broken")], version="v2")
+
+    assert extracted == ["Architect", "fail this one", "Architect", "fail this one"]
+    assert [result.cache_hit for result in results] == [None, None, None]
+    assert all(isinstance(result.result, ValueError) for result in results[1:])
+
+
+def test_cache_reads_and_writes_run_off_the_event_loop(extractor, monkeypatch):
+    extract, _, _ = extractor
+    loop_thread = threading.get_ident()
+    db_threads = []
+    for name in ("_lookup", "_store"):
+        original = getattr(document_cache, name)
+
+        def recording(*args, _original=original):
+            db_threads.append(threading.get_ident())
+            return _original(*args)
+
+        monkeypatch.setattr(document_cache, name, recording)
+
+    extract([("a.pdf", b"Developer in Pune")])
+
+    # Two lookups (by file, by text) and one store
+    assert len(db_threads) == 3 and loop_thread not in db_threads
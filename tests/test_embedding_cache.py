@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from model.EmbeddingCache import EmbeddingCache
+from utility import embedding_cache
+from utility.embedding_cache import cache_key, canonical_text, load_embeddings_by_key, resolve_embeddings
+
+
+@pytest.fixture(autouse=True)
+def empty_memory_cache():
+    embedding_cache._memory_cache.clear()
+    yield
+    embedding_cache._memory_cache.clear()
+
+
+def fake_embed(texts):
+    return [np.full(4, len(text), dtype='float32') for text in texts]
+
+
+def test_canonical_text_ignores_whitespace_edits():
+    assert canonical_text("  Python\n\tdeveloper  ") == "Python developer"
+    assert cache_key("Python  developer", "m") == cache_key("Python developer\n", "m")
+    assert cache_key("Python developer", "m") != cache_key("Python developer", "other-model")
+
+
+def test_resolve_embeddings_embeds_each_missing_text_once(db):
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return fake_embed(texts)
+
+    vectors = resolve_embeddings(["a", "bb", "a"], "m", embed)
+
+    assert calls == [["a", "bb"]]
+    assert [float(vector[0]) for vector in vectors] == [1.0, 2.0, 1.0]
+    assert db.query(EmbeddingCache).count() == 2
+
+
+def test_resolve_embeddings_serves_stored_vectors_from_the_database(db):
+    resolve_embeddings(["a", "bb"], "m", fake_embed)
+    embedding_cache._memory_cache.clear()
+
+    vectors = resolve_embeddings(["bb"], "m", lambda texts: pytest.fail("cached text was embedded again"))
+
+    assert float(vectors[0][0]) == 2.0
+
+
+def test_concurrently_stored_row_does_not_drop_the_rest_of_the_batch(db):
+    # Another worker stored "a" between our lookup and our write
+    embedding_cache._save_to_db({cache_key("a", "m"): np.zeros(4, dtype='float32')}, "m")
+
+    embedding_cache._save_to_db({cache_key(text, "m"): vector for text, vector in
+                                 zip(["a", "bb", "ccc"], fake_embed(["a", "bb", "ccc"]))}, "m")
+
+    assert db.query(EmbeddingCache).count() == 3
+    stored = load_embeddings_by_key([cache_key("a", "m"), cache_key("ccc", "m")])
+    assert float(stored[cache_key("a", "m")][0]) == 0.0
+    assert float(stored[cache_key("ccc", "m")][0]) == 3.0
@@ -0,0 +1,44 @@
+import pytest
+
+from utility import embeddings
+from utility.embeddings import split_into_batches
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    # One token per word, so budgets are easy to read
+    monkeypatch.setattr(embeddings, "count_tokens", lambda text: len(text.split()))
+
+
+def words(count, tag):
+    return " ".join([tag] * count)
+
+
+def test_batches_respect_the_token_budget():
+    texts = [words(4, "a"), words(4, "b"), words(3, "c"), words(6, "d"), words(2, "e")]
+
+    batches = split_into_batches(texts, max_size=10, max_tokens=10)
+
+    assert batches == [texts[:2], texts[2:4], texts[4:]]
+    assert all(sum(len(text.split()) for text in batch) <= 10 for batch in batches)
+
+
+def test_batches_respect_the_size_limit():
+    texts = [f"text {i}" for i in range(7)]
+
+    assert [len(batch) for batch in split_into_batches(texts, max_size=3, max_tokens=1000)] == [3, 3, 1]
+
+
+def test_text_over_the_budget_gets_a_batch_of_its_own():
+    texts = [words(2, "a"), words(50, "b"), words(2, "c")]
+
+    assert split_into_batches(texts, max_size=10, max_tokens=10) == [[texts[0]], [texts[1]], [texts[2]]]
+
+
+def test_batches_keep_the_input_order():
+    texts = [words(i % 5 + 1, f"t{i}") for i in range(40)]
+
+    batches = split_into_batches(texts, max_size=4, max_tokens=8)
+
+    assert [text for batch in batches for text in batch] == texts
+    assert split_into_batches([], max_size=4, max_tokens=8) == []
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+import crud.WorkflowStatus as workflow_status_crud
+from model.WorkflowStatus import WorkflowStatus
+from utility.instrumentation import count, instrumented, record_run, stage
+
+
+def test_stages_record_timing_calls_errors_and_counters():
+    @instrumented("score")
+    def score_shard(calls):
+        count("llm_calls", calls)
+
+    with record_run() as recorder:
+        with stage("rank"):
+            count("candidates", 40)
+        score_shard(3)
+        score_shard(2)
+        with pytest.raises(ValueError):
+            with stage("merge"):
+                raise ValueError("no scores")
+        count("unattributed")
+
+    metrics = recorder.as_dict()
+    stages = metrics["stages"]
+    assert stages["rank"]["calls"] == 1 and stages["rank"]["counters"] == {"candidates": 40}
+    # A stage that runs once per shard sums its executions
+    assert stages["score"]["calls"] == 2 and stages["score"]["counters"] == {"llm_calls": 5}
+    assert stages["merge"]["error"] == "no scores"
+    assert all(stage["duration_ms"] >= 0 and stage["started_at"] <= stage["ended_at"] for stage in stages.values())
+    assert metrics["totals"] == {"candidates": 40, "llm_calls": 5, "unattributed": 1}
+
+
+def _stage_in_thread(recorder):
+    with stage("embed", recorder):
+        count("embeddings")
+
+
+def test_counters_are_ignored_outside_a_run_and_shared_with_helper_threads():
+    count("orphan")
+    with stage("rank"):
+        count("orphan")
+
+    with record_run() as recorder:
+        with stage("index"):
+            # Threads started with an explicit recorder (as the fan-out does) report into the same run
+            worker = threading.Thread(target=lambda: _stage_in_thread(recorder))
+            worker.start()
+            worker.join()
+
+    assert recorder.as_dict()["totals"] == {"embeddings": 1}
+    assert recorder.as_dict()["stages"]["embed"]["counters"] == {"embeddings": 1}
+
+
+def _add_run(db, durations, counters=None):
+    stages = {name: {"duration_ms": duration, "counters": counters or {}} for name, duration in durations.items()}
+    db.add(WorkflowStatus(job_description_id=1, steps={"metrics": {"stages": stages, "totals": {}}}))
+
+
+def test_stage_metrics_report_percentiles_over_recent_runs(db):
+    for duration in range(1, 101):
+        _add_run(db, {"rank": float(duration)}, {"candidates": duration})
+    # Runs without metrics, such as queued or legacy workflows, are skipped
+    db.add(WorkflowStatus(job_description_id=1, steps={}))
+    db.commit()
+
+    metrics = workflow_status_crud.get_stage_metrics(db, 200)
+
+    assert metrics["runs"] == 100
+    rank = metrics["stages"]["rank"]
+    assert rank["count"] == 100
+    assert (rank["p50_ms"], rank["p95_ms"], rank["p99_ms"], rank["max_ms"]) == (50.5, 95.05, 99.01, 100.0)
+    assert rank["counters"] == {"candidates": 50.5}
+    # Only the latest rows are aggregated: runs 92 to 100 and the one without metrics
+    latest = workflow_status_crud.get_stage_metrics(db, 10)
+    assert latest["runs"] == 9 and latest["stages"]["rank"]["p50_ms"] == 96.0
+
+
+def test_stage_metrics_of_an_empty_history(db):
+    assert workflow_status_crud.get_stage_metrics(db, 200) == {"runs": 0, "stages": {}}
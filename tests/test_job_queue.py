@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+from model.MatchJob import MatchJob
+from model.MatchJobEnum import MatchJobStatusEnum
+from model.WorkflowEnum import WorkflowProgressEnum
+from model.WorkflowStatus import WorkflowStatus
+from utility.job_queue import claim_job, complete_job, enqueue_job, fail_job, reap_expired_jobs, renew_lease
+
+
+def expire_lease(db, job):
+    db.query(MatchJob).filter(MatchJob.id == job.id).update(
+        {MatchJob.lease_expires_at: datetime.now() - timedelta(seconds=1)})
+    db.commit()
+
+
+def test_a_leased_job_is_not_claimed_twice(db):
+    job = enqueue_job(db, "match")
+
+    assert claim_job(db, "worker-a").id == job.id
+    assert claim_job(db, "worker-b") is None
+
+    complete_job(db, job.id, "worker-a")
+    db.expire_all()
+    assert db.get(MatchJob, job.id).status == MatchJobStatusEnum.done
+
+
+def test_claim_filters_by_kind(db):
+    enqueue_job(db, "match")
+    ingest = enqueue_job(db, "ingest_resume")
+
+    assert claim_job(db, "worker-a", kinds=["ingest_resume"]).id == ingest.id
+
+
+def test_expired_lease_moves_to_another_worker(db):
+    job = enqueue_job(db, "match")
+    claim_job(db, "worker-a")
+    expire_lease(db, job)
+
+    taken = claim_job(db, "worker-b")
+
+    assert taken.id == job.id and taken.leased_by == "worker-b" and taken.attempts == 2
+    assert not renew_lease(db, job.id, "worker-a")
+    assert renew_lease(db, job.id, "worker-b")
+
+
+def test_failed_attempt_is_retried_after_backoff(db):
+    job = enqueue_job(db, "match", max_attempts=2)
+    claim_job(db, "worker-a")
+
+    assert fail_job(db, job.id, "worker-a", "boom")
+    # Not due until the backoff has passed
+    assert claim_job(db, "worker-a") is None
+
+    db.query(MatchJob).filter(MatchJob.id == job.id).update({MatchJob.available_at: datetime.now()})
+    db.commit()
+    claim_job(db, "worker-a")
+    assert not fail_job(db, job.id, "worker-a", "boom again")
+    db.expire_all()
+    assert db.get(MatchJob, job.id).status == MatchJobStatusEnum.failed
+
+
+def test_reaper_fails_jobs_out_of_attempts_and_their_workflow(db):
+    workflow = WorkflowStatus(job_description_id=None, progress=WorkflowProgressEnum.PROCESSING)
+    db.add(workflow)
+    db.commit()
+    job = enqueue_job(db, "match", workflow_status_id=workflow.id, max_attempts=1)
+    claim_job(db, "worker-a")
+    expire_lease(db, job)
+
+    assert claim_job(db, "worker-b") is None
+    assert reap_expired_jobs(db) == 1
+    db.expire_all()
+    assert db.get(MatchJob, job.id).status == MatchJobStatusEnum.failed
+    assert db.get(WorkflowStatus, workflow.id).progress == WorkflowProgressEnum.FAILED
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from model.LLMScoreCache import LLMScoreCache
+from utility import llm_score_cache
+from utility.llm_score_cache import get_cached_scores, invalidate_llm_scores, score_cache_key, store_scores
+
+
+@pytest.fixture(autouse=True)
+def empty_memory_cache():
+    llm_score_cache._memory_cache.clear()
+    yield
+    llm_score_cache._memory_cache.clear()
+
+
+def test_score_cache_key_depends_on_prompt_version_and_texts():
+    assert score_cache_key("JD", "resume", "v1") == score_cache_key(" JD ", "resume\n", "v1")
+    assert score_cache_key("JD", "resume", "v1") != score_cache_key("JD", "resume", "v2")
+
+
+def test_stored_scores_are_served_from_the_database(db):
+    store_scores({"k1": (0.8, 1, 10), "k2": (0.3, 1, 11)}, "v1")
+    llm_score_cache._memory_cache.clear()
+
+    assert get_cached_scores(["k1", "k2", "k3"]) == {"k1": 0.8, "k2": 0.3}
+
+
+def test_concurrently_stored_row_does_not_drop_the_rest_of_the_batch(db):
+    store_scores({"k1": (0.5, 1, 10)}, "v1")
+
+    store_scores({"k1": (0.9, 1, 10), "k2": (0.4, 1, 11), "k3": (0.2, 1, 12)}, "v1")
+    llm_score_cache._memory_cache.clear()
+
+    assert db.query(LLMScoreCache).count() == 3
+    assert get_cached_scores(["k1", "k2", "k3"]) == {"k1": 0.9, "k2": 0.4, "k3": 0.2}
+
+
+def test_expired_row_is_refreshed(db):
+    store_scores({"k1": (0.5, 1, 10)}, "v1")
+    db.query(LLMScoreCache).update({"created_at": datetime.now() - timedelta(days=365)})
+    db.commit()
+    llm_score_cache._memory_cache.clear()
+    assert get_cached_scores(["k1"]) == {}
+
+    store_scores({"k1": (0.7, 1, 10)}, "v1")
+    llm_score_cache._memory_cache.clear()
+
+    assert get_cached_scores(["k1"]) == {"k1": 0.7}
+
+
+def test_invalidation_drops_scores_of_a_consultant(db):
+    store_scores({"k1": (0.8, 1, 10), "k2": (0.3, 1, 11)}, "v1")
+
+    invalidate_llm_scores(consultant_id=10)
+
+    assert get_cached_scores(["k1", "k2"]) == {"k2": 0.3}
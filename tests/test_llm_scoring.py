@@ -0,0 +1,115 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from utility import llm_scoring
+from utility.async_utils import ConcurrencyLimiter
+from utility.llm_scoring import LLM_SCORE_MAX_TOKENS, parse_batch_scores
+
+
+def test_concurrency_limit_holds_across_event_loops():
+    limiter = ConcurrencyLimiter(3)
+    lock = threading.Lock()
+    in_flight, peak, done = [0], [0], []
+
+    async def request():
+        async with limiter:
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.005)
+            with lock:
+                in_flight[0] -= 1
+                done.append(1)
+
+    async def shard():
+        await asyncio.gather(*(request() for _ in range(10)))
+
+    threads = [threading.Thread(target=asyncio.run, args=(shard(),)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(done) == 40
+    assert peak[0] == 3
+    assert limiter.active == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = ConcurrencyLimiter(1)
+
+    async def scenario():
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limiter.release()
+        await asyncio.sleep(0)
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+        limiter.release()
+
+    asyncio.run(scenario())
+    assert limiter.active == 0
+
+
+def test_batch_reply_is_read_in_candidate_order():
+    reply = 'Scores:\n[{"candidate_id": 7, "score": 0.4}, {"candidate_id": "3", "score": 1}]\nDone.'
+
+    assert parse_batch_scores(reply, ["3", "7"]) == [1.0, 0.4]
+
+
+@pytest.mark.parametrize("reply", [
+    "0.8",
+    '[{"candidate_id": "3", "score": 0.8}, {"candidate_id": "7", "score": }]',
+    '[{"candidate_id": "3", "score": 0.8}]',
+    '[{"candidate_id": "3", "score": 0.8}, {"candidate_id": "7", "score": 0.5}, {"candidate_id": "9", "score": 0.1}]',
+    '[{"candidate_id": "3", "score": 0.8}, {"candidate_id": "7", "score": 1.5}]',
+    '[{"candidate_id": "3", "score": -0.1}, {"candidate_id": "7", "score": 0.5}]',
+], ids=["no array", "malformed", "partial", "extra candidate", "above range", "below range"])
+def test_invalid_batch_reply_is_rejected(reply):
+    with pytest.raises(ValueError):
+        parse_batch_scores(reply, ["3", "7"])
+
+
+@pytest.fixture
+def fake_completions(monkeypatch):
+    """
+    Replace the chat completion: batched prompts get the reply under "batch", single prompts the score of the
+    resume named in them (or an error for "broken").
+    """
+    replies = {"batch": "", "calls": []}
+
+    async def complete(client, messages, max_tokens=None):
+        prompt = messages[-1]["content"]
+        if max_tokens != LLM_SCORE_MAX_TOKENS:
+            replies["calls"].append("batch")
+            return replies["batch"]
+        resume = next(name for name in ("alice", "bob", "broken") if name in prompt)
+        replies["calls"].append(resume)
+        if resume == "broken":
+            raise RuntimeError("service unavailable")
+        return {"alice": "0.9", "bob": "Score: 0.3"}[resume]
+
+    monkeypatch.setattr(llm_scoring, "complete", complete)
+    return replies
+
+
+def score_batch(resumes, ids):
+    return asyncio.run(llm_scoring._score_batch(None, "Python developer", resumes, ids))
+
+
+def test_valid_batch_reply_needs_one_call(fake_completions):
+    fake_completions["batch"] = json.dumps([{"candidate_id": "1", "score": 0.6}, {"candidate_id": "2", "score": 0.2}])
+
+    assert score_batch(["alice", "bob"], ["1", "2"]) == [0.6, 0.2]
+    assert fake_completions["calls"] == ["batch"]
+
+
+def test_invalid_batch_reply_falls_back_to_one_call_per_candidate(fake_completions):
+    fake_completions["batch"] = '[{"candidate_id": "1", "score": 0.6}]'
+
+    assert score_batch(["alice", "bob", "broken"], ["1", "2", "3"]) == [0.9, 0.3, None]
+    assert sorted(fake_completions["calls"]) == ["alice", "batch", "bob", "broken"]
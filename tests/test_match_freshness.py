@@ -0,0 +1,155 @@
+import json
+
+import pytest
+from fastapi import HTTPException, Response
+
+import crud.ConsultantProfile as consultant_crud
+import crud.MatchResult as match_crud
+import router.MatchResult as match_router
+from crud.ConsultantProfile import update_consultant_availability
+from model.WorkflowStatus import WorkflowStatus, WorkflowProgressEnum
+from schema.ConsultantProfile import ConsultantProfileSchema
+from utility import agentic_flow
+from utility.pool_revision import bump_pool_revision, current_pool_revision
+
+
+@pytest.fixture
+def matched(db, match_pool, monkeypatch):
+    """
+    match_pool after one completed match, with re-matches run inline instead of on the worker pool.
+    """
+    jd, llm_calls, failures = match_pool
+    monkeypatch.setattr(match_crud, "submit_match_job", lambda job, *args: job(*args))
+    matches, version = match_crud.get_versioned_match_results(db, jd.id)
+    return jd, matches, version, llm_calls, failures
+
+
+def completed_workflows(db, jd_id):
+    db.expire_all()
+    return db.query(WorkflowStatus).filter(WorkflowStatus.job_description_id == jd_id,
+                                           WorkflowStatus.progress == WorkflowProgressEnum.COMPLETED).all()
+
+
+def test_pool_revision_counts_changes(db):
+    assert current_pool_revision(db) == 0
+    assert bump_pool_revision(db) == 1
+    assert bump_pool_revision(db, 3) == 4
+    db.commit()
+    assert current_pool_revision(db) == 4
+
+
+def test_unchanged_pool_serves_the_persisted_ranking(db, matched, monkeypatch):
+    jd, matches, version, _, _ = matched
+    monkeypatch.setattr(match_crud, "run_match_workflow", lambda *args: pytest.fail("match ran again"))
+
+    assert match_crud.get_versioned_match_results(db, jd.id) == (matches, version)
+    assert match_crud.get_versioned_match_results(db, jd.id, if_none_match=f'"{version}"') == (None, version)
+
+
+def test_rematch_updates_the_stored_ranking_until_the_next_full_run(db, matched, monkeypatch):
+    jd, matches, version, _, _ = matched
+    dropped = matches[0]["profile"]["id"]
+
+    update_consultant_availability(db, dropped, "unavailable")
+
+    # The incremental re-match already removed the consultant from the stored ranking
+    assert dropped not in {match["profile"]["id"] for match in match_crud.get_persisted_match_results(db, jd.id)}
+    assert completed_workflows(db, jd.id)[0].steps["pool_version"] == version
+    # but cannot tell whether the shortlist changed, so the next full-ranking request recomputes it
+    served, new_version = match_crud.get_versioned_match_results(db, jd.id)
+    assert new_version != version
+    assert dropped not in {match["profile"]["id"] for match in served}
+    assert len(completed_workflows(db, jd.id)) == 2
+
+
+def test_change_without_rematch_triggers_a_full_run(db, matched, monkeypatch):
+    jd, _, version, _, _ = matched
+    monkeypatch.setattr(match_crud, "INCREMENTAL_REMATCH", False)
+
+    update_consultant_availability(db, 7, "busy")
+    _, new_version = match_crud.get_versioned_match_results(db, jd.id)
+
+    assert new_version != version
+    assert len(completed_workflows(db, jd.id)) == 2
+
+
+def test_bulk_change_queues_one_full_match_per_open_ranking(db, matched, monkeypatch):
+    jd, _, version, _, _ = matched
+    monkeypatch.setattr(consultant_crud, "index_profiles", lambda profiles: None)
+    monkeypatch.setattr(match_crud, "rematch_consultant", lambda *args: pytest.fail("re-matched one by one"))
+
+    consultant_crud.upsert_consultant_profiles(db, [
+        ConsultantProfileSchema(name=f"New {i}", email=f"new{i}@example.com", skills=["Python", "SQL"])
+        for i in range(3)])
+
+    workflows = completed_workflows(db, jd.id)
+    assert len(workflows) == 2
+    assert match_crud.get_versioned_match_results(db, jd.id)[1] == workflows[-1].steps["pool_version"] != version
+
+
+def test_ranking_with_llm_fallbacks_is_recomputed(db, match_pool):
+    jd, llm_calls, failures = match_pool
+    failures.update(range(1, 61))
+
+    matches, version = match_crud.get_versioned_match_results(db, jd.id)
+    assert matches and version is None
+    assert completed_workflows(db, jd.id)[0].steps["llm_fallbacks"] == 5
+
+    failures.clear()
+    _, version = match_crud.get_versioned_match_results(db, jd.id)
+    assert version is not None
+    assert len(completed_workflows(db, jd.id)) == 2
+
+
+def test_top_matches_are_read_without_matching(db, matched, monkeypatch):
+    jd, matches, _, _, _ = matched
+    monkeypatch.setattr(match_crud, "run_match_workflow", lambda *args: pytest.fail("match ran again"))
+    monkeypatch.setattr(match_crud, "INCREMENTAL_REMATCH", False)
+    # The ranking is now stale, but reading the top matches must not recompute it
+    update_consultant_availability(db, 7, "busy")
+
+    top = match_crud.get_persisted_match_results(db, jd.id, limit=3)
+    assert [(match["profile"]["id"], match["rank"]) for match in top] == \
+        [(match["profile"]["id"], match["rank"]) for match in matches[:3]]
+
+
+def test_failed_run_keeps_the_previous_ranking(db, matched, monkeypatch):
+    jd, matches, version, _, _ = matched
+    sent = []
+    monkeypatch.setattr(match_crud, "send_email", lambda *args: sent.append(args))
+
+    def broken_embedding(text):
+        raise RuntimeError("embedding service down")
+
+    monkeypatch.setattr(agentic_flow, "get_embedding", broken_embedding)
+    jd.title = "Senior Python developer"
+    db.commit()
+
+    with pytest.raises(HTTPException):
+        match_crud.get_versioned_match_results(db, jd.id)
+
+    db.expire_all()
+    workflows = db.query(WorkflowStatus).filter(WorkflowStatus.job_description_id == jd.id).order_by(
+        WorkflowStatus.id).all()
+    assert [workflow.progress for workflow in workflows] == [WorkflowProgressEnum.COMPLETED,
+                                                             WorkflowProgressEnum.FAILED]
+    assert workflows[0].steps["pool_version"] == version
+    assert match_crud.get_persisted_match_results(db, jd.id) == matches
+    assert sent == []
+
+
+def test_get_does_not_wait_for_a_queued_match(db, match_pool, monkeypatch):
+    jd, _, _ = match_pool
+    # Queued for the durable job queue, with no worker running yet
+    monkeypatch.setattr(match_crud, "MATCH_QUEUE_BACKEND", "database")
+    workflow_status = match_crud.enqueue_match_job(db, jd.id)
+    monkeypatch.setattr(match_crud, "_await_workflow", lambda *args: pytest.fail("waited for the queued match"))
+    monkeypatch.setattr(match_crud, "run_match_workflow", lambda *args: pytest.fail("match ran in the request"))
+
+    with pytest.raises(match_crud.MatchQueued) as queued:
+        match_crud.get_versioned_match_results(db, jd.id)
+    assert queued.value.workflow_status_id == workflow_status.id
+
+    response = match_router.get_all_match_results({"username": "test"}, jd.id, db, Response())
+    assert response.status_code == 202
+    assert json.loads(response.body)["workflow_status_id"] == workflow_status.id
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from utility import pdf_reader
+from utility.async_utils import ConcurrencyLimiter
+
+
+def _hang(data, start, stop):
+    time.sleep(60)
+
+
+def _sleep_for(data, start, stop):
+    # The fake document is the number of seconds its extraction takes, or b"hang"
+    time.sleep(60 if data == b"hang" else float(data))
+    return f"text of {data.decode()}", 1
+
+
+def _workers(monkeypatch, count, task):
+    pdf_reader.shutdown_pdf_workers()
+    monkeypatch.setattr(pdf_reader, "PDF_WORKER_COUNT", count)
+    monkeypatch.setattr(pdf_reader, "_worker_slots", ConcurrencyLimiter(count))
+    monkeypatch.setattr(pdf_reader, "_extract_page_range", task)
+
+
+@pytest.fixture
+def hanging_pdf_worker(monkeypatch):
+    _workers(monkeypatch, 1, _hang)
+    yield
+    pdf_reader.shutdown_pdf_workers()
+
+
+@pytest.fixture
+def sleeping_pdf_workers(monkeypatch):
+    yield lambda count: _workers(monkeypatch, count, _sleep_for)
+    pdf_reader.shutdown_pdf_workers()
+
+
+def _started_workers():
+    # ProcessPoolExecutor starts its processes on first submit
+    executor = pdf_reader._get_executor()
+    executor.submit(time.sleep, 0).result()
+    return list(executor._processes.values())
+
+
+def _assert_recycled(processes):
+    assert pdf_reader._executor is None
+    assert processes and not any(process.is_alive() for process in processes)
+
+
+def test_sync_timeout_kills_the_hung_worker(hanging_pdf_worker):
+    executor = pdf_reader._get_executor()
+    processes = _started_workers()
+    with pytest.raises(pdf_reader.PdfExtractionError, match="Timed out"):
+        pdf_reader.extract_pdf_text(b"%PDF", "cv.pdf", timeout=0.5)
+    _assert_recycled(processes)
+    assert pdf_reader._get_executor() is not executor
+
+
+def test_async_timeout_kills_the_hung_worker(hanging_pdf_worker):
+    processes = _started_workers()
+    with pytest.raises(pdf_reader.PdfExtractionError, match="Timed out"):
+        asyncio.run(pdf_reader.extract_pdf_text_async(b"%PDF", "cv.pdf", timeout=0.5))
+    _assert_recycled(processes)
+
+
+def test_time_queued_for_a_worker_does_not_count_against_the_timeout(sleeping_pdf_workers):
+    sleeping_pdf_workers(1)
+
+    # Run back to back on one worker, the second document finishes 0.8s after it was submitted
+    results = asyncio.run(pdf_reader.extract_pdf_texts([("a.pdf", b"0.4"), ("b.pdf", b"0.4")], timeout=0.6))
+
+    assert results == ["text of 0.4", "text of 0.4"]
+
+
+def test_a_timeout_resubmits_the_other_documents_in_flight(sleeping_pdf_workers, caplog):
+    sleeping_pdf_workers(2)
+    caplog.set_level(logging.INFO, logger=pdf_reader.__name__)
+
+    async def extract_both():
+        return await asyncio.gather(pdf_reader.extract_pdf_text_async(b"hang", "hung.pdf", timeout=0.3),
+                                    pdf_reader.extract_pdf_text_async(b"0.6", "cv.pdf", timeout=5),
+                                    return_exceptions=True)
+
+    hung, text = asyncio.run(extract_both())
+
+    assert isinstance(hung, pdf_reader.PdfExtractionError) and "Timed out" in str(hung)
+    # cv.pdf was still running when the pool was recycled under it
+    assert text == "text of 0.6"
+    assert "Resubmitting cv.pdf" in caplog.text
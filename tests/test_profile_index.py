@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from utility.candidate_loader import Candidate
+from utility.profile_index import ProfileIndex
+
+
+def make_profiles(count, start=1):
+    return [Candidate(profile_id, f"Consultant {profile_id}", ["Python"], profile_id % 15, "Pune", None, "available")
+            for profile_id in range(start, start + count)]
+
+
+def query_vector(seed=7):
+    vector = np.random.default_rng(seed).standard_normal(32).astype('float32')
+    return vector / np.linalg.norm(vector)
+
+
+def test_upsert_only_embeds_changed_profiles(embedding_backend, tmp_path):
+    index = ProfileIndex(path=str(tmp_path / "index.faiss"), index_type="flat")
+    profiles = make_profiles(5)
+
+    assert index.upsert(profiles) == 5
+    assert index.upsert(profiles) == 0
+    assert index.upsert([profiles[0]._replace(location="Mumbai")] + profiles[1:]) == 1
+    assert len(index) == 5
+
+
+@pytest.mark.parametrize("index_type", ["hnsw", "ivfpq"])
+def test_search_for_the_whole_pool_returns_every_profile_with_an_ann_index(embedding_backend, tmp_path, index_type):
+    index = ProfileIndex(path=str(tmp_path / "index.faiss"), index_type=index_type)
+    index.upsert(make_profiles(2000))
+    assert index.active_type == index_type
+
+    results = index.search(query_vector(), len(index))
+
+    assert len(results) == 2000
+    distances = [distance for _, distance in results]
+    assert distances == sorted(distances)
+    exact = index.distances(query_vector(), [profile_id for profile_id, _ in results[:5]])
+    assert [round(exact[profile_id], 4) for profile_id, _ in results[:5]] == \
+           [round(distance, 4) for distance in distances[:5]]
+
+
+def test_bounded_k_uses_the_ann_index(embedding_backend, tmp_path, monkeypatch):
+    index = ProfileIndex(path=str(tmp_path / "index.faiss"), index_type="hnsw")
+    index.upsert(make_profiles(500))
+    monkeypatch.setattr(index, "distances", lambda *args: pytest.fail("searched exactly"))
+
+    assert len(index.search(query_vector(), 5)) == 5
+    assert len(index.search(query_vector(), 100)) == 100
+
+
+def test_removed_profiles_are_not_returned(embedding_backend, tmp_path):
+    index = ProfileIndex(path=str(tmp_path / "index.faiss"), index_type="hnsw")
+    index.upsert(make_profiles(50))
+    index.remove([1, 2, 3])
+
+    ids = {profile_id for profile_id, _ in index.search(query_vector(), 50)}
+
+    assert len(ids) == 47 and not ids & {1, 2, 3}
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+def test_saved_index_round_trips_in_one_file(embedding_backend, tmp_path, index_type):
+    path = str(tmp_path / "index.faiss")
+    index = ProfileIndex(path=path, index_type=index_type)
+    index.upsert(make_profiles(20))
+    index.remove([3])
+    index.save()
+
+    loaded = ProfileIndex(path=path, index_type=index_type)
+
+    assert loaded.load()
+    assert sorted(tmp_path.iterdir()) == [tmp_path / "index.faiss"]
+    assert loaded.search(query_vector(), 5) == index.search(query_vector(), 5)
+    assert 3 not in loaded and len(loaded) == 19
+
+
+def test_index_whose_vectors_do_not_match_its_labels_is_rejected(embedding_backend, tmp_path):
+    path = str(tmp_path / "index.faiss")
+    index = ProfileIndex(path=path, index_type="flat")
+    index.upsert(make_profiles(10))
+    # Labels of one process saved with the vectors of another
+    index._labels.pop(4)
+    index._hashes.pop(4)
+    index.save()
+
+    assert not ProfileIndex(path=path, index_type="flat").load()
+
+
+def test_unreadable_index_is_rejected(tmp_path):
+    path = tmp_path / "index.faiss"
+    path.write_bytes(b"not an index")
+
+    assert not ProfileIndex(path=str(path)).load()
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+import crud.MatchResult as match_crud
+from model.ConsultantProfile import ConsultantProfile
+from model.JobDescription import JobDescription
+from model.MatchResult import MatchResult
+from utility import agentic_flow
+from utility.agentic_flow import hybrid_score, score_candidate, vector_similarity
+from utility.embeddings import get_embedding
+from utility.match_text import build_profile_text
+
+
+def add_pool(db, scores):
+    """
+    An open job description with a stored ranking: consultant id -> similarity score.
+    """
+    jd = JobDescription(title="Python developer", location="Pune", experience="3 years", skills=["Python"])
+    db.add(jd)
+    for profile_id in range(1, 7):
+        db.add(ConsultantProfile(id=profile_id, name=f"Consultant {profile_id}", email=f"c{profile_id}@example.com",
+                                 skills=["Python"], experience=4, location="Pune"))
+    db.flush()
+    for rank, (profile_id, score) in enumerate(sorted(scores.items(), key=lambda item: -item[1])):
+        db.add(MatchResult(rank=rank + 1, job_description_id=jd.id, consultant_id=profile_id,
+                           similarity_score=score))
+    db.commit()
+    return jd
+
+
+def stored_ranking(db, jd_id):
+    return [(row.consultant_id, row.rank) for row in db.query(MatchResult).filter(
+        MatchResult.job_description_id == jd_id).order_by(MatchResult.rank)]
+
+
+def test_rematch_only_moves_the_rescored_consultant(db, monkeypatch):
+    # Ties are stored in consultant id order, as merge_rankings orders them
+    jd = add_pool(db, {1: 0.9, 2: 0.6, 4: 0.6, 5: 0.5, 6: 0.3})
+    monkeypatch.setattr(match_crud, "score_candidate", lambda jd, jd_text, profile, llm_floor=None: (0.6, False))
+
+    match_crud.rematch_consultant(db, 3)
+
+    assert stored_ranking(db, jd.id) == [(1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (6, 6)]
+
+
+def test_rematch_floor_is_the_stored_score_of_the_last_shortlisted_match(db, monkeypatch):
+    jd = add_pool(db, {profile_id: 1.0 - profile_id / 10 for profile_id in (1, 2, 4, 5, 6)})
+    floors = []
+
+    def fake_score(jd, jd_text, profile, llm_floor=None):
+        floors.append(llm_floor)
+        return 0.1, False
+
+    monkeypatch.setattr(match_crud, "MATCH_SHORTLIST_K", 2)
+    monkeypatch.setattr(match_crud, "score_candidate", fake_score)
+
+    match_crud.rematch_consultant(db, 3)
+
+    assert floors == [pytest.approx(0.8)]
+    assert 3 not in {consultant_id for consultant_id, _ in stored_ranking(db, jd.id)}
+
+
+def test_score_candidate_compares_its_hybrid_estimate_with_the_floor(embedding_backend, monkeypatch):
+    jd = JobDescription(id=1, title="Python developer", location="Pune", experience="3 years", skills=["Python"])
+    profile = ConsultantProfile(id=7, name="Consultant 7", skills=["Python"], experience=4, location="Pune",
+                                availability="available")
+    llm_calls = []
+
+    def fake_llm(jd_text, resumes, candidate_ids, job_description_id=None):
+        llm_calls.append(candidate_ids)
+        return [0.95]
+
+    monkeypatch.setattr(agentic_flow, "score_resumes", fake_llm)
+
+    estimate, stale = score_candidate(jd, "Python developer", profile, llm_floor=1.0)
+    assert llm_calls == [] and not stale
+    # Below the floor the candidate is scored like the tail of a full run
+    assert 0.0 < estimate < 1.0
+
+    reranked, stale = score_candidate(jd, "Python developer", profile, llm_floor=estimate)
+    assert not stale
+    assert llm_calls == [[7]]
+    jd_vector, profile_vector = get_embedding("Python developer"), get_embedding(build_profile_text(profile))
+    vector_score = vector_similarity(float(np.sum((jd_vector - profile_vector) ** 2)))
+    assert reranked == pytest.approx(hybrid_score(vector_score, 0.95))
@@ -0,0 +1,90 @@
+from langchain_core.runnables import RunnableLambda
+
+from schema.ConsultantProfile import ConsultantProfileSchema
+from utility.llm_extraction import batch_extract_missing
+from utility.rule_extraction import HINTS, extract_job_description_fields, extract_resume_fields
+
+RESUME_FIELDS = ("name", "email", "skills", "experience", "location", "project")
+PROSE_RESUME = """Asha Rao
+asha.rao@example.com | Pune
+6 years of experience in Terraform, Ansible, Go, Prometheus, Grafana and AWS.
+Project: Migrated 40 services to Kubernetes with zero downtime.
+"""
+
+
+def fake_llm(answer):
+    """
+    chain_for stand-in that records the fields asked for and answers from answer.
+    """
+    asked = []
+
+    def chain_for(fields):
+        asked.append(fields)
+        return RunnableLambda(lambda inputs: {field: answer[field] for field in fields if field in answer})
+
+    return chain_for, asked
+
+
+def test_labelled_fields_are_extracted():
+    fields = extract_resume_fields("Name: Asha Rao\nEmail: asha.rao@example.com\nLocation: Pune\n"
+                                   "Total Experience: 6 years\nSkills: Python, SQL | Docker\n")
+
+    assert fields == {"name": "Asha Rao", "email": "asha.rao@example.com", "location": "Pune", "experience": 6,
+                      "skills": ["Python", "SQL", "Docker"]}
+
+
+def test_vocabulary_skills_are_only_hints():
+    fields = extract_resume_fields(PROSE_RESUME)
+
+    assert "skills" not in fields
+    assert fields[HINTS] == {"skills": ["Terraform", "Ansible", "Kubernetes", "Go", "AWS"]}
+    assert fields["experience"] == 6 and fields["location"] == "Pune"
+
+
+def test_dated_work_history_is_not_read_as_years_of_experience():
+    work_history = ("Asha Rao\nasha.rao@example.com\nExperience\n12/2018 – present: Senior Developer, Acme\n"
+                    "06.2015 - 11/2018: Developer, Beta\nSkills: Python, SQL\n")
+
+    assert "experience" not in extract_resume_fields(work_history)
+    # A stated total is still found elsewhere in the resume
+    assert extract_resume_fields("Summary: 7 yrs of backend experience\n" + work_history)["experience"] == 7
+
+
+def test_hinted_skills_are_merged_with_the_llm_answer():
+    chain_for, asked = fake_llm({"skills": ["terraform", "Prometheus", "Grafana"]})
+
+    [profile] = batch_extract_missing(chain_for, ConsultantProfileSchema, extract_resume_fields, RESUME_FIELDS,
+                                      [PROSE_RESUME])
+
+    assert asked == [("skills",)]
+    assert profile.skills == ["terraform", "Prometheus", "Grafana", "Ansible", "Kubernetes", "Go", "AWS"]
+
+
+def test_hints_stand_in_when_the_llm_returns_no_skills():
+    chain_for, _ = fake_llm({})
+
+    [profile] = batch_extract_missing(chain_for, ConsultantProfileSchema, extract_resume_fields, RESUME_FIELDS,
+                                      [PROSE_RESUME])
+
+    assert profile.skills == ["Terraform", "Ansible", "Kubernetes", "Go", "AWS"]
+
+
+def test_labelled_skills_section_skips_the_llm():
+    chain_for, asked = fake_llm({})
+    text = PROSE_RESUME.replace("Project:", "Skills: Terraform, Prometheus\nProject:")
+
+    [profile] = batch_extract_missing(chain_for, ConsultantProfileSchema, extract_resume_fields, RESUME_FIELDS,
+                                      [text])
+
+    assert asked == []
+    assert profile.skills == ["Terraform", "Prometheus"]
+
+
+def test_job_description_skills_from_prose_are_hints():
+    fields = extract_job_description_fields("Title: Platform Engineer\nWe need 3-5 years of experience with "
+                                            "Kubernetes and Terraform in Hyderabad.")
+
+    assert fields["title"] == "Platform Engineer"
+    assert fields["experience"] == "3-5 years"
+    assert fields["location"] == "Hyderabad"
+    assert fields[HINTS] == {"skills": ["Kubernetes", "Terraform"]}
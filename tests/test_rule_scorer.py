@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+from model.ConsultantEnum import ConsultantEnum
+from utility import rule_scorer as rule_scorer_module
+from utility.candidate_loader import Candidate
+from utility.rule_scorer import (RULE_WEIGHTS, UNKNOWN_EXPERIENCE_SCORE, ProfileFeatures, RuleScorer,
+                                 SkillVocabulary)
+
+
+def candidate(profile_id, skills=None, experience=None, location=None, availability="available"):
+    return Candidate(profile_id, f"Consultant {profile_id}", skills, experience, location, None, availability)
+
+
+def job(skills=None, experience=None, location=None):
+    return SimpleNamespace(skills=skills, experience=experience, location=location)
+
+
+def features(profiles):
+    return ProfileFeatures(profiles, SkillVocabulary())
+
+
+def test_skills_jaccard_over_the_sparse_matrix():
+    pool = features([candidate(1, ["Python", "SQL"]), candidate(2, [" python "]), candidate(3, []),
+                     candidate(4, ["Java", "Spring", "SQL"]), candidate(5, None)])
+
+    assert pool.skills_jaccard(["python", "Sql"]).tolist() == pytest.approx([1.0, 0.5, 0.0, 0.25, 0.0])
+    # A JD skill no consultant has still counts in the union
+    assert pool.skills_jaccard(["Python", "Go"]).tolist() == pytest.approx([1 / 3, 0.5, 0.0, 0.0, 0.0])
+    assert pool.skills_jaccard([]).tolist() == [0.0] * 5
+
+
+def test_experience_fit():
+    pool = features([candidate(1, experience=8), candidate(2, experience=2), candidate(3), candidate(4, experience=0)])
+
+    assert pool.experience_fit(4.0).tolist() == pytest.approx([1.0, 0.5, UNKNOWN_EXPERIENCE_SCORE, 0.0])
+    assert pool.experience_fit(None).tolist() == [1.0] * 4
+
+
+def test_location_match():
+    pool = features([candidate(1, location="Pune"), candidate(2, location=" pune"), candidate(3, location="Delhi"),
+                     candidate(4)])
+
+    assert pool.location_match("PUNE").tolist() == [1.0, 1.0, 0.0, 0.0]
+    assert pool.location_match("Remote").tolist() == [1.0] * 4
+    assert pool.location_match("Chennai").tolist() == [0.0] * 4
+
+
+def test_availability():
+    pool = features([candidate(1, availability=ConsultantEnum.available), candidate(2, availability="busy"),
+                     candidate(3, availability=ConsultantEnum.unavailable)])
+
+    assert pool.availability.tolist() == [1.0, 0.5, 0.0]
+
+
+def test_scores_weight_the_components_and_order_the_pool():
+    jd = job(["Python", "SQL"], "4+ years", "Pune")
+    pool = [candidate(1, ["Python"], 2, "Delhi", "busy"), candidate(2, ["Python", "SQL"], 6, "Pune"),
+            candidate(3, ["Java"], 10, "Pune")]
+
+    scores = RuleScorer().score(jd, pool, {2: 1.0, 3: 0.5})
+
+    assert scores[2] == pytest.approx(sum(RULE_WEIGHTS.values()))
+    assert scores[1] == pytest.approx(RULE_WEIGHTS["skills"] * 0.5 + RULE_WEIGHTS["experience"] * 0.5
+                                      + RULE_WEIGHTS["availability"] * 0.5)
+    assert sorted(scores, key=scores.get, reverse=True) == [2, 3, 1]
+
+
+def test_vocabulary_is_rebuilt_once_it_outgrows_its_cap(monkeypatch):
+    monkeypatch.setattr(rule_scorer_module, "RULE_VOCABULARY_MAX_SIZE", 10)
+    scorer = RuleScorer()
+    for batch in range(5):
+        scorer.score(job(["Skill 0"]), [candidate(i, [f"Skill {batch}-{i}", "Skill 0"]) for i in range(4)])
+
+    assert len(scorer.vocabulary) <= 10 + 5
+    # Scores are unaffected by the rebuild
+    assert scorer.score(job(["Skill 0"]), [candidate(1, ["Skill 0"]), candidate(2, ["Other"])]) == \
+        pytest.approx({1: RULE_WEIGHTS["skills"] + RULE_WEIGHTS["experience"] + RULE_WEIGHTS["location"]
+                       + RULE_WEIGHTS["availability"],
+                       2: RULE_WEIGHTS["experience"] + RULE_WEIGHTS["location"] + RULE_WEIGHTS["availability"]})
@@ -0,0 +1,59 @@
+import threading
+import time
+
+import pytest
+
+from utility.single_flight import SingleFlight
+
+
+def run_concurrently(count, target):
+    results, threads = [None] * count, []
+    for i in range(count):
+        def call(i=i):
+            try:
+                results[i] = target()
+            except Exception as e:
+                results[i] = e
+        threads.append(threading.Thread(target=call))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_execution():
+    flights, calls = SingleFlight(), []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return "ranking"
+
+    results = run_concurrently(5, lambda: flights.do(7, work))
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert {result for result, _ in results} == {"ranking"}
+    assert not flights.in_flight(7)
+
+
+def test_waiters_get_the_leaders_error_and_the_next_call_runs_again():
+    flights = SingleFlight()
+
+    def fail():
+        time.sleep(0.1)
+        raise ValueError("match failed")
+
+    results = run_concurrently(3, lambda: flights.do("jd", fail))
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.do("jd", lambda: 1) == (1, False)
+
+
+def test_different_keys_run_independently():
+    flights = SingleFlight()
+    assert flights.do(1, lambda: "a") == ("a", False)
+    assert flights.do(2, lambda: "b") == ("b", False)
+    with pytest.raises(KeyError):
+        flights.do(3, lambda: {}["missing"])
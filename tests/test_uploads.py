@@ -0,0 +1,68 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+import crud.ConsultantProfile as consultant_crud
+import router.ConsultantProfile as consultant_router
+import router.JobDescription as job_description_router
+from model.ConsultantProfile import ConsultantProfile
+from model.JobDescription import JobDescription
+from schema.ConsultantProfile import ConsultantProfileSchema
+from schema.JobDescription import JobDescriptionRequest
+from utility import document_cache
+from utility.file_reader_using_genai import resume_extractor
+from utility.jobdescription_reader import job_description_extractor
+from utility.pdf_reader import PdfExtractionError
+
+
+def pdf(filename, data):
+    return UploadFile(file=io.BytesIO(data), filename=filename, headers=Headers({"content-type": "application/pdf"}))
+
+
+@pytest.fixture
+def uploads(db, monkeypatch):
+    """
+    Fake PDF parse (the bytes are the text, b"corrupt" fails) and LLM extraction (the text is the name or title).
+    """
+    async def fake_parse(documents):
+        return [PdfExtractionError(f"Could not read {filename}: EOF marker not found") if data == b"corrupt"
+                else data.decode() for filename, data in documents]
+
+    async def extract_resumes(texts, max_concurrency=None):
+        return [ConsultantProfileSchema(name=text, email=f"{text.lower()}@example.com", skills=["Python"])
+                for text in texts]
+
+    async def extract_job_descriptions(texts, max_concurrency=None):
+        return [JobDescriptionRequest(title=text, skills=["Python"]) for text in texts]
+
+    monkeypatch.setattr(document_cache, "extract_pdf_texts", fake_parse)
+    monkeypatch.setattr(resume_extractor, "aextract_batch", extract_resumes)
+    monkeypatch.setattr(job_description_extractor, "aextract_batch", extract_job_descriptions)
+    monkeypatch.setattr(consultant_crud, "index_profile", lambda profile: None)
+    monkeypatch.setattr(consultant_crud, "schedule_rematch", lambda db, *args: None)
+
+
+def test_corrupt_resume_does_not_fail_the_other_uploads(db, uploads):
+    files = [pdf("asha.pdf", b"Asha"), pdf("broken.pdf", b"corrupt"), pdf("ravi.pdf", b"Ravi")]
+
+    response = asyncio.run(consultant_router.upload_multiple_pdfs(db, files))
+
+    assert [list(error) for error in response["errors"]] == [["broken.pdf"]]
+    assert "EOF marker" in response["errors"][0]["broken.pdf"]
+    assert [result["action"] for result in response["results"]] == ["created", "created"]
+    assert response["message"] == "Processed 2 of 3 PDF files."
+    assert sorted(name for (name,) in db.query(ConsultantProfile.name)) == ["Asha", "Ravi"]
+
+
+def test_corrupt_job_description_does_not_fail_the_other_uploads(db, uploads):
+    files = [pdf("broken.pdf", b"corrupt"), pdf("backend.pdf", b"Backend developer")]
+    user = {"id": 1, "email": "requestor@example.com"}
+
+    response = asyncio.run(job_description_router.upload_job_descriptions(user, db, files))
+
+    assert [list(error) for error in response["errors"]] == [["broken.pdf"]]
+    assert [list(result) for result in response["results"]] == [["backend.pdf"]]
+    assert [title for (title,) in db.query(JobDescription.title)] == ["Backend developer"]
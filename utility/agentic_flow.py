@@ -1,21 +1,32 @@
 import faiss
+import hashlib
+import operator
+import uuid
 from langgraph.graph import StateGraph, START, END
-from typing import TypedDict, List, Dict, Any
+from langgraph.types import Send
+from typing import TypedDict, List, Dict, Any, Optional, Annotated, Tuple
 import numpy as np
 from datetime import datetime
 from dotenv import load_dotenv
 import os
 from utility.embeddings import get_embedding
+from utility.match_text import build_candidate_snippet, build_jd_text, build_profile_text
+from utility.profile_index import profile_index
+from utility.llm_scoring import LLM_PROMPT_VERSION, score_resumes
+from utility.rule_scorer import ProfileFeatures, SkillVocabulary, rule_scorer
+from utility.instrumentation import count, instrumented
+from utility.checkpointing import clear_checkpoint, get_checkpointer, match_thread_id
+from utility.candidate_loader import candidate_ranges, load_candidates, load_candidates_by_ids
+from model.ConsultantProfile import ConsultantProfile
 from model.WorkflowStatus import WorkflowStatus
 from schema.JobDescription import JobDescriptionRequestorOutput
 from schema.ConsultantProfile import ConsultantProfileSchema
 from schema.WorkflowStatus import WorkflowStatusSchema, WorkflowProgressEnum
-from openai import AzureOpenAI
 from model.Notification import Notification
 from sqlalchemy.orm import Session
 from typing import Any, List
 from utility.send_email import send_email
-from db.database import db_dependency
+from db.database import db_dependency, sessionLocal
 from fastapi import HTTPException, status
 
 import logging
@@ -24,269 +35,395 @@ import logging
 logger = logging.getLogger(__name__)
 load_dotenv()
 
-api_key = os.getenv("openai_api_key")
-
-# Initialize Azure OpenAI client
-client = AzureOpenAI(
-    api_version=os.getenv("openai_api_version"),  # Use the specified API version
-    azure_endpoint=os.getenv("azure_endpoint"),  # Replace with your Azure OpenAI endpoint
-    api_key=api_key  # Replace with your Azure OpenAI API key
-)
-
-
-# Define state for LangGraph
+# Only the top-K first-stage candidates are reranked by the LLM; the rule score stands in for the rest
+MATCH_SHORTLIST_K = int(os.getenv("match_shortlist_k", 20))
+# With an adaptive shortlist, cut early (but not below min K) at the first gap in first-stage scores this large
+MATCH_SHORTLIST_ADAPTIVE = os.getenv("match_shortlist_adaptive", "false").lower() == "true"
+MATCH_SHORTLIST_MIN_K = int(os.getenv("match_shortlist_min_k", 5))
+MATCH_SHORTLIST_GAP = float(os.getenv("match_shortlist_gap", 0.1))
+# Profiles per index shard and shortlisted candidates per LLM scoring shard of the fan-out
+MATCH_INDEX_SHARD_SIZE = int(os.getenv("match_index_shard_size", 500))
+MATCH_SCORE_SHARD_SIZE = int(os.getenv("match_score_shard_size", 10))
+# Nearest neighbours retrieved from the profile index per shortlist slot; only they are rule-scored and ranked
+MATCH_RETRIEVAL_OVERFETCH = int(os.getenv("match_retrieval_overfetch", 10))
+
+# Weights of the hybrid match score, and the score a candidate needs to be kept in all_matches
+VECTOR_WEIGHT = 0.4
+LLM_WEIGHT = 0.6
+MATCH_MIN_SCORE = 0.2
+
+# Fingerprint of everything besides the JD and the pool that shapes a ranking; persisted rankings produced
+# under another configuration are treated as stale
+# Bumped whenever the way scores are computed or ordered changes
+_SCORING_REVISION = 3
+MATCH_CONFIG_VERSION = hashlib.sha256(repr((
+    _SCORING_REVISION, LLM_PROMPT_VERSION, VECTOR_WEIGHT, LLM_WEIGHT, MATCH_MIN_SCORE, MATCH_SHORTLIST_K,
+    MATCH_SHORTLIST_ADAPTIVE, MATCH_SHORTLIST_MIN_K, MATCH_SHORTLIST_GAP,
+    MATCH_RETRIEVAL_OVERFETCH)).encode("utf-8")).hexdigest()[:16]
+
+
+# Define state for LangGraph. The consultant pool itself is never part of the (checkpointed) state: it is
+# referenced by id ranges, and nodes load the rows they need from the database.
 class MatchState(TypedDict):
     job_description: JobDescriptionRequestorOutput
-    consultant_profiles: List[ConsultantProfileSchema]
+    pool_shards: List[List[int]]  # [first id, last id] of each index shard of the pool
     # workflow_status: WorkflowStatusSchema
     jd_text: str
+    jd_embedding: List[float]
+    indexed_profiles: Annotated[List[int], operator.add]
+    candidates: List[List[Any]]  # LLM shortlist: [id, snippet, vector score, rule score], best rule score first
+    tail: List[List[float]]  # [id, score] of the other candidates that reach MATCH_MIN_SCORE
+    llm_scores: Annotated[List[List[float]], operator.add]
+    llm_fallbacks: Annotated[int, operator.add]  # shortlisted candidates ranked on rule scores after LLM failures
     message: str
-    profile_embeddings: List[np.ndarray]
-    ranked_profiles: List[Dict[str, Any]]
-    top_matches: List[Dict[str, Any]]
-    all_matches: List[Dict[str, Any]]
+    top_matches: List[List[float]]  # [id, score]
+    all_matches: List[List[float]]  # [id, score], best first
+
+
+def shard(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[start:start + size] for start in range(0, len(items), max(1, size))]
+
+
+def vector_similarity(distance: float) -> float:
+    """
+    Convert a squared L2 distance between unit-norm embeddings into a cosine similarity in [0, 1].
+    """
+    return min(1.0, max(0.0, 1.0 - float(distance) / 2.0))
+
+
+def shortlist_size(stage_scores: List[float]) -> int:
+    """
+    Number of leading candidates (stage_scores sorted best first) that get LLM reranking.
+    """
+    k = min(MATCH_SHORTLIST_K, len(stage_scores))
+    if not MATCH_SHORTLIST_ADAPTIVE:
+        return k
+    for i in range(max(MATCH_SHORTLIST_MIN_K, 1), k):
+        if stage_scores[i - 1] - stage_scores[i] >= MATCH_SHORTLIST_GAP:
+            return i
+    return k
+
+
+def hybrid_score(vector_score: float, llm_score: float) -> float:
+    """
+    Stored match score. Candidates outside the LLM shortlist pass their rule score as llm_score, so every
+    stored score is on the same scale.
+    """
+    return float(VECTOR_WEIGHT * vector_score + LLM_WEIGHT * llm_score)
+
+
+def match_order(similarity_score: float, profile_id: int) -> tuple:
+    """
+    Sort key of a ranking: best score first, ties broken by consultant id.
+    """
+    return -similarity_score, int(profile_id)
 
 
-# --- Comparison Agent ---
-def compare_profiles(state: MatchState) -> MatchState:
+def score_candidate(jd: Any, jd_text: str, profile: Any, llm_floor: Optional[float] = None) -> Tuple[float, bool]:
     """
-    Generate FAISS embeddings for each consultant profile and compute distances to the job description.
-    Returns similarity scores between JD and each profile.
+    Score a single consultant against a job description the way merge_rankings scores the pool, for
+    incremental re-matching.
+
+    Args:
+        jd: Job description.
+        jd_text: build_jd_text(jd).
+        profile: Consultant profile.
+        llm_floor: Stored score the candidate's rule-based estimate must reach to be reranked by the LLM
+            (the score of the last shortlisted match); None always uses the LLM.
+
+    Returns:
+        Tuple[float, bool]: Hybrid score, with the rule score standing in for the LLM score below llm_floor,
+            and whether the LLM was needed but failed (the rule score was used instead).
     """
+    jd_embedding = get_embedding(jd_text)
+    profile_embedding = get_embedding(build_profile_text(profile))
+    vector_score = vector_similarity(float(np.sum((jd_embedding - profile_embedding) ** 2)))
+    # A vocabulary of its own: one profile's skills need no shared ids, and the shared one stays bounded
+    rule_score = float(ProfileFeatures([profile], SkillVocabulary()).score(
+        jd, np.array([vector_score], dtype='float32'))[0])
+    # The estimate is the score the candidate would get outside the shortlist, on the stored scores' scale
+    estimate = hybrid_score(vector_score, rule_score)
+    if llm_floor is not None and estimate < llm_floor:
+        return estimate, False
     try:
-        # Concatenate JD fields into a single string
-        jd = state["job_description"]
-        jd_text = f"{jd.title} {jd.department or ''} {jd.location or ''} {jd.experience or ''} {jd.description or ''} " \
-                  f"{', '.join(jd.skills) if jd.skills else ''}"
-        state["jd_text"] = jd_text
-        # jd_embedding = get_embedding(jd_text)
-
-        # Generate embeddings for all consultant profiles
-        profile_embeddings = []
-        for profile in state["consultant_profiles"]:
-            profile_text = f"{profile.name} {', '.join(profile.skills) if profile.skills else ''} " \
-                           f"{profile.experience or ''} {profile.location or ''}{profile.project or ''} {profile.availability or ''}"
-            profile_embeddings.append(get_embedding(profile_text))
-            print(profile_embeddings[-1])  # Debug: Print the last profile embedding
-        state["profile_embeddings"] = profile_embeddings
-
-        return state
+        llm_score = score_resumes(jd_text, [build_candidate_snippet(profile)], [profile.id],
+                                  job_description_id=jd.id)[0]
+    except Exception as e:
+        logger.warning(f"LLM scoring unavailable, using the rule score: {e}")
+        llm_score = None
+    if llm_score is None:
+        return estimate, True
+    return hybrid_score(vector_score, llm_score), False
 
+
+# --- JD Embedding Agent (runs in parallel with profile indexing) ---
+@instrumented("embed_jd")
+def embed_job_description(state: MatchState) -> dict:
+    """
+    Build the JD text and its embedding.
+    """
+    try:
+        jd_text = build_jd_text(state["job_description"])
+        return {"jd_text": jd_text, "jd_embedding": get_embedding(jd_text).tolist()}
     except Exception as e:
-        print(f"⚠️ Error during comparison: {e}")
-        return state
+        # Raised so the run fails instead of ranking without an embedding
+        logger.error(f"Error during JD embedding: {e}")
+        raise
+
+
+# --- Comparison Agent (one Send per profile shard) ---
+@instrumented("compare")
+def compare_profiles(state: dict) -> dict:
+    """
+    Make sure every consultant profile of this shard (an id range of the pool) has an up-to-date vector in
+    the persistent FAISS profile index.
+    """
+    db = sessionLocal()
+    try:
+        first_id, last_id = state["pool_shard"]
+        profiles = load_candidates(db, first_id=first_id, last_id=last_id)
+        # The long-lived profile index only re-embeds profiles whose text changed since they were indexed
+        return {"indexed_profiles": [profile_index.upsert(profiles)]}
+    except Exception as e:
+        logger.error(f"Error during comparison: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def fan_out_indexing(state: MatchState) -> List[Send]:
+    """
+    One Send per pool shard so profile-embedding lookups run concurrently with each other and with the JD
+    embedding.
+    """
+    # An empty pool still sends one (empty) shard so the ranking join is reached
+    shards = state["pool_shards"] or [[0, -1]]
+    return [Send("compare", {"pool_shard": pool_shard}) for pool_shard in shards]
 
 
 # --- Ranking Agent ---
-def rank_profiles(state: MatchState) -> MatchState:
+@instrumented("ranking")
+def rank_profiles(state: MatchState) -> dict:
+    """
+    Retrieve the MATCH_SHORTLIST_K * MATCH_RETRIEVAL_OVERFETCH nearest consultants from the FAISS index and
+    rule-score only those. The best of them by rule score form the LLM shortlist; only the others' final
+    scores are kept. Consultants outside the retrieved set are not ranked.
+    """
+    db = sessionLocal()
+    try:
+        jd = state["job_description"]
+        jd_embedding = np.asarray(state["jd_embedding"], dtype='float32')
+        # A bounded search uses the approximate index as intended instead of scanning the pool
+        distances = dict(profile_index.search(jd_embedding, MATCH_SHORTLIST_K * MATCH_RETRIEVAL_OVERFETCH))
+        retrieved = load_candidates_by_ids(db, list(distances))
+        vector_scores = {profile.id: vector_similarity(distances[profile.id]) for profile in retrieved}
+        # Cheap first stage: the rubric rules, with the embedding cosine standing in for the description match
+        rule_scores = rule_scorer.score(jd, retrieved, vector_scores)
+        ranked = sorted(retrieved, key=lambda profile: (-rule_scores[profile.id], profile.id))
+
+        k = shortlist_size([rule_scores[profile.id] for profile in ranked])
+        tail = []
+        for profile in ranked[k:]:
+            score = hybrid_score(vector_scores[profile.id], rule_scores[profile.id])
+            if score >= MATCH_MIN_SCORE:
+                tail.append([profile.id, score])
+        count("candidates", len(retrieved))
+        count("llm_shortlist", k)
+        return {
+            "candidates": [[profile.id, build_candidate_snippet(profile), float(vector_scores[profile.id]),
+                            float(rule_scores[profile.id])] for profile in ranked[:k]],
+            "tail": tail,
+            # Every state value is written into each later checkpoint; the embedding is not needed past here
+            "jd_embedding": [],
+        }
+    except Exception as e:
+        logger.error(f"Error during ranking: {e}")
+        raise
+    finally:
+        db.close()
+
+
+def fan_out_scoring(state: MatchState):
+    """
+    One Send per shortlist shard so LLM scoring requests overlap; straight to merge when nothing is shortlisted.
+    """
+    shortlist = state.get("candidates", [])
+    if not shortlist:
+        return "merge"
+    return [Send("score", {
+        "job_description": state["job_description"],
+        "jd_text": state["jd_text"],
+        "candidates": [[profile_id, snippet, rule_score] for profile_id, snippet, _, rule_score in candidates],
+    }) for candidates in shard(shortlist, MATCH_SCORE_SHARD_SIZE)]
+
+
+# --- Scoring Agent (one Send per shortlist shard) ---
+@instrumented("score")
+def score_candidates(state: dict) -> dict:
+    """
+    LLM-score one shard of the shortlist; rule scores stand in for failed LLM calls, which are counted so
+    the ranking can be marked for recomputation.
+    """
+    candidate_ids = [candidate[0] for candidate in state["candidates"]]
+    fallback_scores = [candidate[2] for candidate in state["candidates"]]
+    try:
+        llm_scores = score_resumes(state["jd_text"], [candidate[1] for candidate in state["candidates"]],
+                                   candidate_ids, job_description_id=state["job_description"].id)
+    except Exception as e:
+        logger.warning(f"LLM scoring unavailable, ranking on rule scores: {e}")
+        llm_scores = [None] * len(candidate_ids)
+    fallbacks = sum(score is None for score in llm_scores)
+    return {
+        "llm_scores": [[profile_id, float(fallback if score is None else score)]
+                       for profile_id, score, fallback in zip(candidate_ids, llm_scores, fallback_scores)],
+        "llm_fallbacks": fallbacks,
+    }
+
+
+# --- Merge (reduce) Agent ---
+@instrumented("merge")
+def merge_rankings(state: MatchState) -> dict:
     """
-    Ranks consultant profiles based on hybrid FAISS + LLM similarity score.
+    Reduce the shard scores into one ranking on the hybrid scale: shortlisted candidates combine FAISS and
+    LLM scores, the rest combine FAISS and rule scores (as a failed LLM call would), and everyone is ordered
+    by match_order so the score never increases down the ranking.
     """
     try:
-        jd_embedding = get_embedding(state["jd_text"])
-        profile_embeddings = np.array(state["profile_embeddings"], dtype='float32')
-        faiss_index = faiss.IndexFlatL2(len(jd_embedding))
-        faiss_index.add(profile_embeddings)
-
-        # Search FAISS index
-        D, I = faiss_index.search(np.array([jd_embedding], dtype='float32'), len(profile_embeddings))
-
-        # Get LLM-based reranking
-        profiles = state["consultant_profiles"]
-        snippets = [
-            f"{profiles[i].name}, Skills: {', '.join(profiles[i].skills)}, "
-            f"Experience: {profiles[i].experience} years, Location: {profiles[i].location}"
-            for i in I[0]
-        ]
-        llm_scores = get_llm_similarity_scores(state["jd_text"], snippets)
-
-        # Combine FAISS and LLM scores
-        matches = []
-        for idx_in_search, llm_score in zip(I[0], llm_scores):
-            faiss_score = float(1 - D[0][idx_in_search])
-            hybrid_score = 0.4 * faiss_score + 0.6 * llm_score
-            matches.append({
-                "profile": profiles[idx_in_search],
-                "similarity_score": hybrid_score
-            })
-
-        # Sort by hybrid score
-        matches.sort(key=lambda x: x["similarity_score"], reverse=True)
-
-        # Assign ranks
-        for i, match in enumerate(matches):
-            match["rank"] = i + 1
-
-        state["ranked_profiles"] = matches
-        state["top_matches"] = matches[:3]
-        state["all_matches"] = [m for m in matches if m["similarity_score"] >= 0.2]
-
-        return state
+        candidates = state.get("candidates", [])
+        llm_scores = {int(profile_id): score for profile_id, score in state.get("llm_scores", [])}
+
+        # A shortlisted candidate whose LLM score is missing keeps its rule score, like everyone else
+        matches = [[profile_id, hybrid_score(vector_score, llm_scores.get(profile_id, rule_score))]
+                   for profile_id, _, vector_score, rule_score in candidates]
+        matches.extend(state.get("tail", []))
+        matches.sort(key=lambda match: match_order(match[1], match[0]))
+        logger.debug(f"Reranked {len(candidates)} of {len(matches)} candidates with the LLM.")
+
+        return {
+            "top_matches": matches[:3],
+            "all_matches": [match for match in matches if match[1] >= MATCH_MIN_SCORE],
+            # Merged into all_matches, so later checkpoints do not carry the scores twice
+            "tail": [],
+        }
 
     except Exception as e:
-        print(f"⚠️ Error during ranking: {e}")
-        return state
+        logger.error(f"Error during merging: {e}")
+        raise
 
 
 # --- Communication Agent ---
-def send_notifications(state: MatchState) -> None:
+@instrumented("communication")
+def send_notifications(state: MatchState) -> dict:
     jd = state["job_description"]
     top_matches = state.get("top_matches", [])
     jd_id = jd.id
 
     if top_matches:
+        db = sessionLocal()
+        try:
+            names = dict(db.query(ConsultantProfile.id, ConsultantProfile.name).filter(
+                ConsultantProfile.id.in_([profile_id for profile_id, _ in top_matches])).all())
+        finally:
+            db.close()
         message = f"Top 3 Matches for Job ID: {jd_id}\n\n"
-        for idx, match in enumerate(top_matches):
-            profile = match["profile"]
-            message += f"{idx + 1}. {profile.name} | Score: {match['similarity_score']:.2f}\n"
+        for idx, (profile_id, score) in enumerate(top_matches):
+            message += f"{idx + 1}. {names.get(profile_id, f'Consultant {profile_id}')} | Score: {score:.2f}\n"
     else:
         message = f"No suitable matches found for Job ID: {jd_id}. Please review manually."
 
-    state["message"]=message
     # Save email content to the database
 
-    print(f"📧 Email notification created for Job ID: {jd_id}")
-
-
-# --- Helper: LLM Similarity Scoring ---
-def get_llm_similarity_scores(job_description: str, resumes: List[str]) -> List[float]:
-    """
-    Uses GPT-4o to generate semantic similarity scores between job description and each resume.
-    Scores are from 0 to 1.
-    """
-    prompt_template = f"""Task :- To rate the match between the {job_description} and the {resumes} on a scale of 0 to 1, you can follow these steps:
-
-                Evaluation Criteria
-                    Skills Match: Assess the overlap between the required skills in the job description and the skills listed in the resume.
-                    Experience Match: Compare the years of experience required in the job description with the candidate's experience in the resume.
-                    Description Match: Compare the candidate's past project experience with the description given in job description
-                    Location Match: Check if the candidate's location aligns with the job location or if remote work is acceptable.
-                    Availability: Verify if the candidate's availabale or not ("avialable","busy","unavailable")
-                    Role/Title Alignment: Evaluate whether the candidate's previous roles align with the job title or responsibilities.
-                    Scoring Process
-                - Assign a score for each criterion (e.g., skills, experience, location, etc.).
-                - Combine the scores into a weighted average or a hybrid score (e.g., 30% skills match, 20% experience match, 30% description match, 10% location match, 10% availability).
-                Example
-                    Job Description:
-                    Title: Software Engineer
-                    Skills: Python, Machine Learning, SQL
-                    Experience: 3+ years
-                    Description: Responsible for developing and deploying machine learning models, optimizing SQL databases, and creating scalable Python-based applications for data-driven decision-making.
-                    Location: New York, NY
-                Resume:
-                    Name: John Doe
-                    Skills: Python, SQL, Data Analysis
-                    Experience: 4 years
-                    Location: Remote (willing to relocate)
-                    Projects:
-                            Project 1: Developed a Python-based data pipeline to process and analyze 1TB of data daily, improving processing speed by 30%.
-                            Project 2: Designed and optimized SQL databases for a fintech company, reducing query time by 40%.
-                            Project 3: Built a predictive analytics dashboard using Python and data visualization libraries, enabling real-time decision-making for marketing campaigns.
-                    Availability: available
-                    
-                Match Score:
-                    Skills Match: Python (yes), Machine Learning (no), SQL (yes) → 2/3 = 0.67
-                    Experience Match: 4 years vs. 3+ years → 1.0
-                    Description match: Strong alignment in Python and SQL projects, partial alignment in machine learning responsibilities → 0.9
-                    Location Match: Willing to relocate → 0.8
-                    Availability: available → 1.0
-                    
-                Weighted Score:
-                    Skills (30%): 0.67 × 0.3 = 0.201
-                    Experience (20%): 1.0 × 0.2 = 0.2
-                    Description Match (30%): 0.9 × 0.3 = 0.27
-                    Location (10%): 0.8 × 0.1 = 0.08
-                    Availability (10%): 1.0 × 0.1 = 0.1
-
-                Final Match Score: 0.201 + 0.2 + 0.27 + 0.08 + 0.1 = 0.851:"""
-
-    scores = []
-    for resume in resumes:
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system",
-                     "content": "You are a Human Resource person having 10 years of experience that evaluates how well a resume matches a job description."},
-                    {"role": "user", "content": prompt_template.format(
-                        job_description=job_description,
-                        resume=resume
-                    )}
-                ],
-                temperature=0.2
-            )
-            content = response.choices[0].message.content.strip()
-            score = float(content)
-            scores.append(score if 0 <= score <= 1 else 0.0)
-        except Exception as e:
-            print(f"❌ LLM scoring error: {e}")
-            scores.append(0.0)
-
-    return scores
+    logger.info(f"Email notification created for Job ID: {jd_id}")
+    return {"message": message}
 
 
 # --- Build Graph ---
+# START fans out to the JD embedding and to one compare shard per slice of the pool; ranking joins them,
+# fans out again to one score shard per slice of the shortlist, and merge reduces the shard scores.
 workflow = StateGraph(MatchState)
 
 # Add nodes
+workflow.add_node("embed_jd", embed_job_description)
 workflow.add_node("compare", compare_profiles)
 workflow.add_node("ranking", rank_profiles)
-# workflow.add_node("communication", send_notifications)
+workflow.add_node("score", score_candidates)
+workflow.add_node("merge", merge_rankings)
 workflow.add_node("communication", send_notifications)
 
-# Set entry point
-workflow.set_entry_point("compare")
+# Parallel branches from the entry point
+workflow.add_edge(START, "embed_jd")
+workflow.add_conditional_edges(START, fan_out_indexing, ["compare"])
 
-# Link processing chain
-workflow.add_edge("compare", "ranking")
-# workflow.add_edge("ranking", "communication")
-workflow.add_edge("ranking", "communication")
+# Join, then map-reduce over the shortlist
+workflow.add_edge(["embed_jd", "compare"], "ranking")
+workflow.add_conditional_edges("ranking", fan_out_scoring, ["score", "merge"])
+workflow.add_edge("score", "merge")
+workflow.add_edge("merge", "communication")
 
 workflow.add_edge("communication", END)
 
 # Compile the agent flow
-app = workflow.compile()
+app = workflow.compile(checkpointer=get_checkpointer())
+
+logger.info("Multi-Agent Recruitment Matching System is ready.")
 
-print("✅ Multi-Agent Recruitment Matching System is ready.")
+
+def snapshot(schema: type, obj: Any) -> Any:
+    """
+    Copy the schema fields of an ORM row (or any object) into an unvalidated schema instance, which the
+    graph checkpointer can serialize.
+    """
+    return schema.model_construct(**{field: getattr(obj, field, None) for field in schema.model_fields})
 
 
 # === Public Function to Use in Your CRUD Code ===
 def run_agent_matching(db: db_dependency, jd: JobDescriptionRequestorOutput,
-                       profiles: List[ConsultantProfileSchema]) -> dict:
+                       workflow_status_id: Optional[int] = None) -> dict:
     """
-    Run the agent-based matching flow for a given job description and list of consultant profiles.
+    Run the agent-based matching flow of a job description against the matchable consultant pool.
+
+    Graph state is checkpointed per workflow: when a run for workflow_status_id was interrupted, calling
+    this again resumes it, skipping the nodes and score shards that already completed, and a run that
+    already finished returns its stored result. Call clear_match_checkpoint once the result is persisted.
 
     Args:
-        db: SQLAlchemy Session (for communication agent if needed)
+        db: SQLAlchemy Session, used to split the pool into shards
         jd: The job description object
-        profiles: List of consultant profiles
+        workflow_status_id: Workflow status the run belongs to (the checkpoint thread); a one-off run
+            when None.
 
     Returns:
-        Dictionary with 'top_matches' and 'all_matches'
+        Dictionary with 'top_matches' and 'all_matches' as [consultant id, score] pairs, best first, the
+        notification 'message' and 'llm_fallbacks', the number of shortlisted candidates whose LLM scoring
+        failed
+
+    Raises:
+        Exception: The error of a failed node (other than LLM scoring, which falls back to rule scores); the
+            checkpoint is kept, so a retry resumes at that node.
     """
     logger.debug("Starting agent-based matching flow...")
-    # workflow_status = WorkflowStatusSchema(
-    #     job_description_id=jd.id,
-    #     steps={"jd_parsed": True, "profiles_compared": False},
-    #     progress=WorkflowProgressEnum.PROCESSING,
-    # )
-    logger.debug("after workflow status agent-based matching flow...")
-    initial_state = {
-        "job_description": jd,
-        "consultant_profiles": profiles
-        # "workflow_status": workflow_status
-    }
-
-    def communication_with_db(state: MatchState):
-        send_notifications(state)
-
-    # Replace the communication node dynamically **before invoking the graph**
-
-    result = app.invoke(initial_state)
-
-    print(result)
+    thread_id = match_thread_id(workflow_status_id) if workflow_status_id is not None else f"match-{uuid.uuid4().hex}"
+    config = {"configurable": {"thread_id": thread_id}}
+
+    checkpoint = app.get_state(config)
+    if checkpoint.next:
+        logger.info(f"Resuming match run {thread_id} at {list(checkpoint.next)}.")
+        result = app.invoke(None, config)
+    elif checkpoint.values.get("message") is not None:
+        logger.info(f"Match run {thread_id} already completed, reusing its result.")
+        result = checkpoint.values
+    else:
+        initial_state = {
+            "job_description": snapshot(JobDescriptionRequestorOutput, jd),
+            "pool_shards": candidate_ranges(db, MATCH_INDEX_SHARD_SIZE),
+        }
+        result = app.invoke(initial_state, config)
+
+    if workflow_status_id is None:
+        clear_checkpoint(thread_id)
     return {
         "top_matches": result.get("top_matches"),
         "all_matches": result.get("all_matches"),
+        "llm_fallbacks": result.get("llm_fallbacks", 0),
         "message": result.get("message")
     }
@@ -0,0 +1,84 @@
+import asyncio
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine
+
+
+def run_sync(coro: Coroutine) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run when no event loop is running in this thread. When called from inside a
+    running loop (sync code invoked from an async route), the coroutine runs on a helper thread
+    with its own loop so the caller's loop is never re-entered.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(context.run, asyncio.run, coro).result()
+
+
+class ConcurrencyLimiter:
+    """
+    Process-wide cap on concurrent operations, such as in-flight LLM requests or PDF extraction tasks.
+
+    State is guarded by a thread lock so that the cap holds across event loops (run_sync may start a new
+    loop per call or per thread). A released slot is handed directly to the oldest waiter, which is woken on
+    its own loop.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was handed over before the cancellation: give it back (if the hand-over is
+            # still pending, _wake sees the cancelled future and gives it back instead)
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._wake, future)
+                    return
+                except RuntimeError:
+                    # The waiter's loop is closed
+                    continue
+            self.active -= 1
+
+    def _wake(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self.release()
+        elif not future.done():
+            future.set_result(None)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
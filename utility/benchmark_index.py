@@ -0,0 +1,103 @@
+"""
+Recall/latency/memory benchmark of the profile index types on synthetic consultant pools.
+
+Usage:
+    python -m utility.benchmark_index --sizes 10000 100000 1000000 --dim 1536 --k 10
+
+Recall@k is measured against exact IndexFlatL2 search over the same vectors.
+"""
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+from utility.faiss_indexes import INDEX_TYPES, can_train, create_index, index_memory_bytes, needs_training, \
+    set_search_params, train_index
+
+
+def synthetic_pool(n_vectors: int, dimension: int, seed: int = 0, n_clusters: int = 64) -> np.ndarray:
+    """
+    Unit-norm vectors drawn around random cluster centres, roughly like embeddings of similar CVs.
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((n_clusters, dimension), dtype='float32')
+    assignment = rng.integers(0, n_clusters, n_vectors)
+    vectors = centres[assignment] + 0.5 * rng.standard_normal((n_vectors, dimension), dtype='float32')
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray, k: int) -> float:
+    hits = sum(len(set(found_row[:k]) & set(truth_row[:k])) for found_row, truth_row in zip(found, truth))
+    return hits / float(truth.shape[0] * k)
+
+
+def build(index_type: str, vectors: np.ndarray):
+    """
+    Build (and train) an index of index_type over vectors.
+
+    Returns:
+        Tuple of the index and the build time in seconds.
+    """
+    n_vectors, dimension = vectors.shape
+    start = time.perf_counter()
+    index = create_index(index_type, dimension, n_vectors)
+    if needs_training(index_type):
+        train_index(index, vectors)
+    index.add_with_ids(vectors, np.arange(n_vectors, dtype='int64'))
+    return index, time.perf_counter() - start
+
+
+def measure(index: faiss.Index, queries: np.ndarray, truth: np.ndarray, k: int) -> dict:
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query.reshape(1, -1), k)
+    latency_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    _, found = index.search(queries, k)
+    return {"recall": recall_at_k(found, truth, k), "latency_ms": latency_ms}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[None],
+                        help="HNSW efSearch values to sweep")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[None],
+                        help="IVF nprobe values to sweep")
+    args = parser.parse_args()
+
+    print(f"{'size':>9} {'index':>6} {'param':>12} {'recall@k':>9} {'ms/query':>9} {'build s':>8} {'mem MB':>9}")
+    for size in args.sizes:
+        vectors = synthetic_pool(size, args.dim)
+        queries = synthetic_pool(args.queries, args.dim, seed=1)
+        exact = faiss.IndexFlatL2(args.dim)
+        exact.add(vectors)
+        _, truth = exact.search(queries, args.k)
+
+        for index_type in args.types:
+            if not can_train(index_type, size):
+                print(f"{size:>9} {index_type:>6} {'':>12}  skipped: pool too small to train")
+                continue
+            index, build_seconds = build(index_type, vectors)
+            memory_mb = index_memory_bytes(index) / 2 ** 20
+            if index_type == "hnsw":
+                sweeps = [("efSearch", value, {"ef_search": value}) for value in args.ef_search]
+            elif index_type == "ivfpq":
+                sweeps = [("nprobe", value, {"nprobe": value}) for value in args.nprobe]
+            else:
+                sweeps = [("", None, {})]
+            for name, value, params in sweeps:
+                set_search_params(index, **params)
+                result = measure(index, queries, truth, args.k)
+                label = f"{name}={value}" if value is not None else "default"
+                print(f"{size:>9} {index_type:>6} {label:>12} {result['recall']:>9.3f} {result['latency_ms']:>9.3f} "
+                      f"{build_seconds:>8.1f} {memory_mb:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
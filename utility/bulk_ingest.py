@@ -0,0 +1,218 @@
+"""
+Bulk ingestion of resume PDFs from a directory or a .zip/.tar archive.
+
+Usage:
+    python -m utility.bulk_ingest /data/hr-drop
+    python -m utility.bulk_ingest resumes.zip --batch-size 100 --concurrency 16 --report report.json
+
+Files are processed in batches: parsed in the PDF process pool, extracted through the document cache with
+at most --concurrency LLM calls in flight, and upserted into consultant_profiles with one commit per batch.
+Every stored file is appended to the checkpoint file (<source>.ingest-checkpoint by default), so a run that
+is interrupted and restarted with the same arguments skips what it already finished. Failed files are not
+checkpointed and are retried on the next run.
+"""
+import argparse
+import json
+import os
+import tarfile
+import time
+import zipfile
+from functools import partial
+from typing import Callable, Iterator, List, Set, Tuple
+
+from langchain_core.callbacks import get_usage_metadata_callback
+
+from db.database import sessionLocal
+# Every mapped model must be imported before the first query so relationships resolve
+import model.user, model.JobDescription, model.ConsultantProfile, model.MatchResult, model.WorkflowStatus, \
+    model.Notification, model.MatchJob  # noqa: F401
+from schema.ConsultantProfile import ConsultantProfileSchema
+from utility.instrumentation import record_run
+from utility.llm_extraction import EXTRACTION_MAX_CONCURRENCY
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (checkpoint key, display name, reader of the file's bytes)
+SourceFile = Tuple[str, str, Callable[[], bytes]]
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as pdf_file:
+        return pdf_file.read()
+
+
+def _read_member(archive: tarfile.TarFile, member: tarfile.TarInfo) -> bytes:
+    return archive.extractfile(member).read()
+
+
+def iter_source_files(source: str) -> Iterator[SourceFile]:
+    """
+    The PDFs of a directory (recursively) or archive, in a stable order. Bytes are read only when a file's
+    batch is processed, so memory stays bounded by the batch size.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    path = os.path.join(root, name)
+                    relative = os.path.relpath(path, source)
+                    yield f"{relative}:{os.path.getsize(path)}", relative, partial(_read_file, path)
+    elif zipfile.is_zipfile(source):
+        archive = zipfile.ZipFile(source)
+        for info in sorted(archive.infolist(), key=lambda info: info.filename):
+            if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                yield f"{info.filename}:{info.file_size}", info.filename, partial(archive.read, info)
+    elif tarfile.is_tarfile(source):
+        archive = tarfile.open(source)
+        for member in sorted(archive.getmembers(), key=lambda member: member.name):
+            if member.isfile() and member.name.lower().endswith(".pdf"):
+                yield f"{member.name}:{member.size}", member.name, partial(_read_member, archive, member)
+    else:
+        raise ValueError(f"{source} is neither a directory nor a zip/tar archive.")
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as checkpoint:
+        return {line.rstrip("\n") for line in checkpoint if line.strip()}
+
+
+def append_checkpoint(path: str, keys: List[str]) -> None:
+    with open(path, "a", encoding="utf-8") as checkpoint:
+        checkpoint.writelines(f"{key}\n" for key in keys)
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+
+
+def _batches(files: Iterator[SourceFile], size: int) -> Iterator[List[SourceFile]]:
+    batch = []
+    for source_file in files:
+        batch.append(source_file)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest(source: str, checkpoint_path: str, batch_size: int, concurrency: int) -> dict:
+    """
+    Ingest every not-yet-checkpointed PDF of source.
+
+    Returns:
+        dict: Throughput and failure report.
+    """
+    from crud.ConsultantProfile import upsert_consultant_profiles
+    from utility.document_cache import extract_documents
+    from utility.file_reader_using_genai import EXTRACTOR_VERSION, aextract_information_batch
+
+    done = load_checkpoint(checkpoint_path)
+    pending = (source_file for source_file in iter_source_files(source) if source_file[0] not in done)
+    extract_batch = partial(aextract_information_batch, max_concurrency=concurrency)
+    report = {"source": source, "skipped": len(done), "processed": 0, "stored": 0, "failed": [],
+              "profiles": {"created": 0, "updated": 0, "unchanged": 0}}
+
+    started = time.perf_counter()
+    with record_run() as recorder, get_usage_metadata_callback() as usage:
+        for batch in _batches(pending, batch_size):
+            documents = []
+            for key, name, read in batch:
+                try:
+                    documents.append((key, name, read()))
+                except Exception as e:
+                    report["failed"].append({"file": name, "error": f"Could not read file: {e}"})
+            extracted = extract_documents([(name, data) for _, name, data in documents], "resume",
+                                          ConsultantProfileSchema, EXTRACTOR_VERSION, extract_batch)
+
+            stored_keys, profiles = [], []
+            for (key, _, _), document in zip(documents, extracted):
+                if isinstance(document.result, Exception):
+                    report["failed"].append({"file": document.filename, "error": str(document.result)})
+                else:
+                    stored_keys.append(key)
+                    profiles.append(document.result)
+            if profiles:
+                db = sessionLocal()
+                try:
+                    counts = upsert_consultant_profiles(db, profiles)
+                except Exception as e:
+                    # The whole batch stays un-checkpointed and is retried on the next run
+                    report["failed"].extend({"file": document.filename, "error": f"Could not store profile: {e}"}
+                                            for document in extracted if not isinstance(document.result, Exception))
+                    stored_keys = []
+                    counts = {}
+                finally:
+                    db.close()
+                for action, value in counts.items():
+                    report["profiles"][action] += value
+            append_checkpoint(checkpoint_path, stored_keys)
+
+            report["processed"] += len(batch)
+            report["stored"] += len(stored_keys)
+            elapsed = time.perf_counter() - started
+            logger.info(f"{report['processed']} files processed ({report['processed'] / elapsed:.1f} files/s), "
+                        f"{len(report['failed'])} failed.")
+
+    elapsed = time.perf_counter() - started
+    tokens = sum(model_usage.get("total_tokens", 0) for model_usage in usage.usage_metadata.values())
+    totals = recorder.as_dict()["totals"]
+    report.update({
+        "elapsed_seconds": round(elapsed, 3),
+        "files_per_second": round(report["processed"] / elapsed, 3) if elapsed else 0.0,
+        "llm_tokens": tokens,
+        "tokens_per_second": round(tokens / elapsed, 3) if elapsed else 0.0,
+        "llm_extractions": int(totals.get("document_llm_extractions", 0)),
+        "cache_hits": {"file": int(totals.get("document_cache_file_hits", 0)),
+                       "text": int(totals.get("document_cache_text_hits", 0))},
+    })
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"Source: {report['source']}")
+    print(f"Processed {report['processed']} files in {report['elapsed_seconds']:.1f}s "
+          f"({report['files_per_second']:.2f} files/s), skipped {report['skipped']} already ingested.")
+    print(f"Stored {report['stored']}: {report['profiles']['created']} created, {report['profiles']['updated']} "
+          f"updated, {report['profiles']['unchanged']} unchanged.")
+    print(f"LLM: {report['llm_extractions']} extractions, {report['llm_tokens']} tokens "
+          f"({report['tokens_per_second']:.1f} tokens/s); cache hits: {report['cache_hits']['file']} by file, "
+          f"{report['cache_hits']['text']} by text.")
+    if report["failed"]:
+        print(f"Failed ({len(report['failed'])}):")
+        for failure in report["failed"]:
+            print(f"  {failure['file']}: {failure['error']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="directory or .zip/.tar archive of resume PDFs")
+    parser.add_argument("--checkpoint", default=None, help="progress file (default: <source>.ingest-checkpoint)")
+    parser.add_argument("--batch-size", type=int, default=50, help="files extracted and stored per batch")
+    parser.add_argument("--concurrency", type=int, default=EXTRACTION_MAX_CONCURRENCY,
+                        help="LLM extractions in flight at once")
+    parser.add_argument("--report", default=None, help="also write the report as JSON to this path")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+
+    from utility.embeddings import load_embedding_backend
+    from utility.pdf_reader import shutdown_pdf_workers
+    from utility.profile_index import load_profile_index, profile_index
+    load_embedding_backend()
+    load_profile_index()
+    try:
+        report = ingest(args.source, args.checkpoint or f"{args.source.rstrip(os.sep)}.ingest-checkpoint",
+                        max(1, args.batch_size), max(1, args.concurrency))
+    finally:
+        shutdown_pdf_workers()
+        profile_index.save_if_dirty()
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
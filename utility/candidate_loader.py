@@ -0,0 +1,101 @@
+import os
+from typing import Any, Iterator, List, NamedTuple, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from model.ConsultantProfile import ConsultantProfile, ConsultantEnum
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# Rows fetched per round trip while streaming the consultant pool
+MATCH_LOAD_CHUNK_SIZE = int(os.getenv("match_load_chunk_size", 1000))
+
+
+class Candidate(NamedTuple):
+    """
+    The consultant columns read by the matching pipeline (profile text, FAISS index, rule scorer, LLM snippet
+    and serialized results). A plain tuple: no ORM state, no validation, and serializable into graph checkpoints.
+    """
+    id: int
+    name: str
+    skills: Optional[List[str]]
+    experience: Optional[int]
+    location: Optional[str]
+    project: Optional[str]
+    availability: Optional[ConsultantEnum]
+
+    @classmethod
+    def from_profile(cls, profile: Any) -> "Candidate":
+        return cls(*(getattr(profile, field, None) for field in cls._fields))
+
+
+_CANDIDATE_COLUMNS = [getattr(ConsultantProfile, field) for field in Candidate._fields]
+
+
+def _matchable(statement, first_id: Optional[int] = None, last_id: Optional[int] = None):
+    statement = statement.where(ConsultantProfile.availability != ConsultantEnum.unavailable)
+    if first_id is not None:
+        statement = statement.where(ConsultantProfile.id >= first_id)
+    if last_id is not None:
+        statement = statement.where(ConsultantProfile.id <= last_id)
+    return statement.order_by(ConsultantProfile.id)
+
+
+def iter_candidate_chunks(db: Session, chunk_size: int = MATCH_LOAD_CHUNK_SIZE, first_id: Optional[int] = None,
+                          last_id: Optional[int] = None) -> Iterator[List[Candidate]]:
+    """
+    Stream the matchable consultants (everyone not unavailable) in id order, chunk_size rows at a time over a
+    server-side cursor, selecting only the Candidate columns. first_id/last_id restrict the stream to an
+    inclusive id range (see candidate_ranges).
+    """
+    statement = _matchable(select(*_CANDIDATE_COLUMNS), first_id, last_id).execution_options(yield_per=chunk_size)
+    for rows in db.execute(statement).partitions():
+        yield [Candidate(*row) for row in rows]
+
+
+def load_candidates(db: Session, chunk_size: int = MATCH_LOAD_CHUNK_SIZE, first_id: Optional[int] = None,
+                    last_id: Optional[int] = None) -> List[Candidate]:
+    """
+    The matchable consultant pool (or one id range of it) as Candidate tuples.
+    """
+    candidates = []
+    for chunk in iter_candidate_chunks(db, chunk_size, first_id, last_id):
+        candidates.extend(chunk)
+    return candidates
+
+
+def load_candidates_by_ids(db: Session, profile_ids: List[int],
+                           chunk_size: int = MATCH_LOAD_CHUNK_SIZE) -> List[Candidate]:
+    """
+    The matchable consultants among profile_ids as Candidate tuples, in id order. Ids that are missing or
+    unavailable are left out.
+    """
+    ids = sorted(set(int(profile_id) for profile_id in profile_ids))
+    candidates = []
+    for start in range(0, len(ids), max(1, chunk_size)):
+        statement = _matchable(select(*_CANDIDATE_COLUMNS)).where(
+            ConsultantProfile.id.in_(ids[start:start + chunk_size]))
+        candidates.extend(Candidate(*row) for row in db.execute(statement))
+    return candidates
+
+
+def candidate_ranges(db: Session, size: int) -> List[List[int]]:
+    """
+    Split the matchable pool into inclusive [first id, last id] ranges of about size consultants, reading ids
+    only. The ranges stand for the pool in places that must stay small, such as match graph state, and each
+    holder loads its own range with iter_candidate_chunks.
+    """
+    statement = _matchable(select(ConsultantProfile.id)).execution_options(yield_per=MATCH_LOAD_CHUNK_SIZE)
+    ranges, current = [], []
+    for (profile_id,) in db.execute(statement):
+        current.append(profile_id)
+        if len(current) >= max(1, size):
+            ranges.append([current[0], current[-1]])
+            current = []
+    if current:
+        ranges.append([current[0], current[-1]])
+    return ranges
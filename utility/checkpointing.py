@@ -0,0 +1,58 @@
+import os
+import sqlite3
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# "sqlite" persists match-graph checkpoints across the processes and restarts of one host (the file is local),
+# "memory" keeps them in-process only
+MATCH_CHECKPOINT_BACKEND = os.getenv("match_checkpoint_backend", "sqlite").lower()
+MATCH_CHECKPOINT_PATH = os.getenv("match_checkpoint_path", "data/match_checkpoints.sqlite")
+
+
+@lru_cache(maxsize=None)
+def get_checkpointer() -> BaseCheckpointSaver:
+    """
+    Checkpointer of the match graph: SqliteSaver (langgraph-checkpoint-sqlite) when available and configured,
+    otherwise an in-memory saver.
+    """
+    if MATCH_CHECKPOINT_BACKEND == "sqlite":
+        try:
+            from langgraph.checkpoint.sqlite import SqliteSaver
+        except ImportError:
+            logger.warning("langgraph-checkpoint-sqlite is not installed, keeping match checkpoints in memory.")
+        else:
+            directory = os.path.dirname(MATCH_CHECKPOINT_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(MATCH_CHECKPOINT_PATH, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            logger.info(f"Using match checkpoints at {MATCH_CHECKPOINT_PATH}.")
+            return SqliteSaver(connection)
+    return InMemorySaver()
+
+
+def match_thread_id(workflow_status_id: int) -> str:
+    return f"match-{workflow_status_id}"
+
+
+def clear_checkpoint(thread_id: str) -> None:
+    """
+    Drop the checkpoints of a finished match run.
+    """
+    try:
+        get_checkpointer().delete_thread(thread_id)
+    except Exception as e:
+        logger.error(f"Error occurred while deleting match checkpoints of {thread_id}: {e}")
+
+
+def clear_match_checkpoint(workflow_status_id: Optional[int]) -> None:
+    if workflow_status_id is not None:
+        clear_checkpoint(match_thread_id(workflow_status_id))
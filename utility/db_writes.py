@@ -0,0 +1,66 @@
+from typing import List, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _dialect_insert(db: Session, model):
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        return dialect, mysql_insert(model)
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return dialect, sqlite_insert(model)
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+        return dialect, postgresql_insert(model)
+    return dialect, None
+
+
+def upsert_rows(db: Session, model, rows: List[dict], key: str,
+                update_columns: Optional[Sequence[str]] = None) -> None:
+    """
+    Insert rows keyed by a unique column, resolving conflicts row by row instead of failing the batch.
+
+    A row whose key already exists is skipped, or has update_columns overwritten when given. Uses the
+    dialect's native upsert (MySQL ON DUPLICATE KEY UPDATE, SQLite/PostgreSQL ON CONFLICT) and falls
+    back to one savepoint per row elsewhere. The caller commits.
+
+    Args:
+        db: Database session.
+        model: ORM model of the table.
+        rows: Column values of the rows to insert.
+        key: Name of the unique column the conflict is detected on.
+        update_columns: Columns to overwrite on conflict; None keeps the existing row.
+    """
+    if not rows:
+        return
+    dialect, statement = _dialect_insert(db, model)
+    if dialect == "mysql":
+        # A no-op assignment of the key turns a duplicate into a skip without INSERT IGNORE's error masking
+        columns = update_columns or [key]
+        statement = statement.on_duplicate_key_update({column: statement.inserted[column] for column in columns})
+        db.execute(statement, rows)
+    elif statement is not None:
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=[key], set_={column: statement.excluded[column] for column in update_columns})
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=[key])
+        db.execute(statement, rows)
+    else:
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(model), [row])
+            except IntegrityError:
+                if update_columns:
+                    db.query(model).filter(getattr(model, key) == row[key]).update(
+                        {column: row[column] for column in update_columns}, synchronize_session=False)
+                else:
+                    logger.debug(f"Skipped duplicate {model.__tablename__} row {row[key]}.")
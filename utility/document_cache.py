@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel
+from sqlalchemy import Column
+
+from db.database import sessionLocal
+from model.DocumentCache import DocumentCache
+from utility.async_utils import run_sync
+from utility.embedding_cache import canonical_text
+from utility.instrumentation import count
+from utility.pdf_reader import extract_pdf_texts
+import logging
+
+logger = logging.getLogger(__name__)
+
+_DB_LOOKUP_CHUNK = 1000
+
+BatchExtractor = Callable[[List[str]], Awaitable[List[Union[BaseModel, Exception]]]]
+
+
+class ExtractedDocument(NamedTuple):
+    filename: str
+    # The extracted model, or the error the document failed with
+    result: Union[BaseModel, Exception]
+    # "file" (same bytes seen before: no parse, no LLM), "text" (same text: no LLM) or None (fully extracted)
+    cache_hit: Optional[str] = None
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(canonical_text(text).encode("utf-8")).hexdigest()
+
+
+def _lookup(kind: str, extractor_version: str, column: Column, hashes: Sequence[str]) -> Dict[str, dict]:
+    """
+    Cached extractions whose file_hash/text_hash (column) is in hashes: hash -> extracted fields.
+    """
+    found: Dict[str, dict] = {}
+    hashes = list(set(hashes))
+    if not hashes:
+        return found
+    db = sessionLocal()
+    try:
+        for start in range(0, len(hashes), _DB_LOOKUP_CHUNK):
+            rows = db.query(column, DocumentCache.extracted).filter(
+                DocumentCache.kind == kind, DocumentCache.extractor_version == extractor_version,
+                column.in_(hashes[start:start + _DB_LOOKUP_CHUNK])).all()
+            found.update({key: extracted for key, extracted in rows})
+    except Exception as e:
+        logger.error(f"Error occurred while reading the document cache: {e}")
+    finally:
+        db.close()
+    return found
+
+
+def _store(kind: str, extractor_version: str, entries: Dict[Tuple[str, str], dict]) -> None:
+    """
+    Persist extractions: (file_hash, text_hash) -> extracted fields. Files already cached are skipped.
+    """
+    if not entries:
+        return
+    db = sessionLocal()
+    try:
+        known = {row.file_hash for row in db.query(DocumentCache.file_hash).filter(
+            DocumentCache.kind == kind, DocumentCache.extractor_version == extractor_version,
+            DocumentCache.file_hash.in_([file_hash for file_hash, _ in entries]))}
+        db.add_all([
+            DocumentCache(kind=kind, file_hash=file_hash, text_hash=text_hash, extractor_version=extractor_version,
+                          extracted=extracted)
+            for (file_hash, text_hash), extracted in entries.items() if file_hash not in known
+        ])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error occurred while writing the document cache: {e}")
+    finally:
+        db.close()
+
+
+def _validated(schema: Type[BaseModel], hits: Dict[str, dict]) -> Dict[str, BaseModel]:
+    # Entries the current schema no longer accepts are treated as misses
+    models = {}
+    for key, extracted in hits.items():
+        try:
+            models[key] = schema(**extracted)
+        except Exception as e:
+            logger.debug(f"Ignoring cached extraction {key}: {e}")
+    return models
+
+
+async def aextract_documents(documents: Sequence[Tuple[str, bytes]], kind: str, schema: Type[BaseModel],
+                             extractor_version: str, extract_batch: BatchExtractor) -> List[ExtractedDocument]:
+    """
+    Extract uploaded PDFs through the document cache: documents whose bytes were extracted before skip both
+    the PDF parse and the LLM, documents whose normalized text was extracted before skip the LLM, and only
+    the remaining distinct texts go to extract_batch. New extractions are stored for the next upload.
+
+    Args:
+        documents: (filename, raw bytes) pairs.
+        kind: Cache namespace, e.g. "resume" or "job_description".
+        schema: Model the cached fields are validated into.
+        extractor_version: Version of the prompt/model; extractions of another version are not reused.
+        extract_batch: Async batch extractor (texts -> models or errors, in order).
+
+    Returns:
+        List[ExtractedDocument]: Per document, in order, its extraction or error and where it came from.
+    """
+    file_hashes = [file_digest(data) for _, data in documents]
+    results: List[Optional[ExtractedDocument]] = [None] * len(documents)
+
+    # The cache lookups and the store are blocking database calls; they run on a thread, off the event loop
+    by_file = _validated(schema, await asyncio.to_thread(
+        _lookup, kind, extractor_version, DocumentCache.file_hash, file_hashes))
+    to_parse = []
+    for i, (filename, _) in enumerate(documents):
+        if file_hashes[i] in by_file:
+            results[i] = ExtractedDocument(filename, by_file[file_hashes[i]], "file")
+        else:
+            to_parse.append(i)
+    count("document_cache_file_hits", len(documents) - len(to_parse))
+
+    texts: Dict[int, str] = {}
+    parsed = await extract_pdf_texts([documents[i] for i in to_parse])
+    for i, content in zip(to_parse, parsed):
+        if isinstance(content, Exception):
+            results[i] = ExtractedDocument(documents[i][0], content)
+        else:
+            texts[i] = content
+    text_hashes = {i: text_digest(text) for i, text in texts.items()}
+
+    by_text = _validated(schema, await asyncio.to_thread(
+        _lookup, kind, extractor_version, DocumentCache.text_hash, list(text_hashes.values())))
+    new_entries: Dict[Tuple[str, str], dict] = {}
+    # Identical texts within the batch are extracted once
+    to_extract: Dict[str, int] = {}
+    for i, text_hash in text_hashes.items():
+        if text_hash in by_text:
+            results[i] = ExtractedDocument(documents[i][0], by_text[text_hash], "text")
+            # Remember these bytes too, so the next upload of this file also skips the parse
+            new_entries[(file_hashes[i], text_hash)] = by_text[text_hash].model_dump(mode="json", exclude_unset=True)
+        else:
+            to_extract.setdefault(text_hash, i)
+    count("document_cache_text_hits", len(text_hashes) - sum(1 for h in text_hashes.values() if h in to_extract))
+
+    extracted = dict(zip(to_extract, await extract_batch([texts[i] for i in to_extract.values()]))) \
+        if to_extract else {}
+    count("document_llm_extractions", len(extracted))
+    for i, text_hash in text_hashes.items():
+        if results[i] is not None:
+            continue
+        result = extracted[text_hash]
+        results[i] = ExtractedDocument(documents[i][0], result)
+        if not isinstance(result, Exception):
+            new_entries[(file_hashes[i], text_hash)] = result.model_dump(mode="json", exclude_unset=True)
+
+    await asyncio.to_thread(_store, kind, extractor_version, new_entries)
+    return results
+
+
+def extract_documents(documents: Sequence[Tuple[str, bytes]], kind: str, schema: Type[BaseModel],
+                      extractor_version: str, extract_batch: BatchExtractor) -> List[ExtractedDocument]:
+    """
+    Synchronous aextract_documents for workers and command-line tools.
+    """
+    return run_sync(aextract_documents(documents, kind, schema, extractor_version, extract_batch))
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import re
+from datetime import datetime
+from typing import Callable, List
+
+import numpy as np
+from dotenv import load_dotenv
+
+from db.database import sessionLocal
+from model.EmbeddingCache import EmbeddingCache
+from utility.db_writes import upsert_rows
+from utility.instrumentation import count
+from utility.lru_cache import LRUCache
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# In-process layer in front of the persistent embedding_cache table
+_memory_cache = LRUCache(int(os.getenv("embedding_cache_size", 10000)))
+
+_DB_LOOKUP_CHUNK = 1000
+
+_whitespace = re.compile(r"\s+")
+
+
+def canonical_text(text: str) -> str:
+    """
+    Normalise text before hashing/embedding so that whitespace-only edits hit the same cache entry.
+    """
+    return _whitespace.sub(" ", text or "").strip()
+
+
+def cache_key(text: str, model_name: str) -> str:
+    """
+    Content address of an embedding: sha256 over the embedding model name and the canonical text.
+    """
+    payload = f"{model_name}\x00{canonical_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _load_from_db(keys: List[str]) -> dict:
+    if not keys:
+        return {}
+    db = sessionLocal()
+    try:
+        found = {}
+        # Chunk the IN list so very large pools stay within statement size limits
+        for start in range(0, len(keys), _DB_LOOKUP_CHUNK):
+            rows = db.query(EmbeddingCache.content_hash, EmbeddingCache.vector).filter(
+                EmbeddingCache.content_hash.in_(keys[start:start + _DB_LOOKUP_CHUNK])).all()
+            found.update({row.content_hash: np.frombuffer(row.vector, dtype='float32') for row in rows})
+        return found
+    except Exception as e:
+        logger.error(f"Error occurred while reading the embedding cache: {e}")
+        return {}
+    finally:
+        db.close()
+
+
+def _save_to_db(entries: dict, model_name: str) -> None:
+    if not entries:
+        return
+    db = sessionLocal()
+    try:
+        # Rows are content-addressed: one stored concurrently by another worker is skipped, not the whole batch
+        upsert_rows(db, EmbeddingCache, [
+            {
+                "content_hash": key,
+                "model_name": model_name,
+                "dimension": int(vector.shape[0]),
+                "vector": np.asarray(vector, dtype='float32').tobytes(),
+                "created_at": datetime.now(),
+            }
+            for key, vector in entries.items()
+        ], key="content_hash")
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error occurred while writing the embedding cache: {e}")
+    finally:
+        db.close()
+
+
+def load_embeddings_by_key(keys: List[str]) -> dict:
+    """
+    Fetch already cached embeddings by content hash, without embedding anything.
+
+    Returns:
+        dict: content hash -> float32 vector, for the keys that were found.
+    """
+    found = {}
+    for key in set(keys):
+        vector = _memory_cache.get(key)
+        if vector is not None:
+            found[key] = vector
+    found.update(_load_from_db([key for key in set(keys) if key not in found]))
+    return found
+
+
+def resolve_embeddings(texts: List[str], model_name: str,
+                       embed_missing: Callable[[List[str]], List[np.ndarray]]) -> List[np.ndarray]:
+    """
+    Return one embedding per text, calling embed_missing only for texts not found in the cache.
+
+    Lookup order is the in-process LRU, then the embedding_cache table; anything still missing is
+    embedded once (duplicates in the input are embedded only once) and written back to both layers.
+
+    Args:
+        texts: Input texts.
+        model_name: Name of the embedding model, part of the cache key.
+        embed_missing: Callable that embeds a list of canonical texts.
+
+    Returns:
+        List[np.ndarray]: float32 embedding vectors in input order.
+    """
+    canonical = [canonical_text(text) for text in texts]
+    keys = [cache_key(text, model_name) for text in canonical]
+
+    found = {}
+    for key in set(keys):
+        vector = _memory_cache.get(key)
+        if vector is not None:
+            found[key] = vector
+
+    db_hits = _load_from_db([key for key in set(keys) if key not in found])
+    for key, vector in db_hits.items():
+        _memory_cache.put(key, vector)
+    found.update(db_hits)
+
+    missing = {}
+    for key, text in zip(keys, canonical):
+        if key not in found and key not in missing:
+            missing[key] = text
+    count("embedding_cache_hits", len(found))
+    count("embeddings_computed", len(missing))
+
+    if missing:
+        logger.debug(f"Embedding cache: {len(found)} hits, {len(missing)} misses.")
+        vectors = embed_missing(list(missing.values()))
+        computed = {key: np.asarray(vector, dtype='float32') for key, vector in zip(missing.keys(), vectors)}
+        for key, vector in computed.items():
+            _memory_cache.put(key, vector)
+        _save_to_db(computed, model_name)
+        found.update(computed)
+
+    return [found[key] for key in keys]
@@ -1,15 +1,199 @@
 import numpy as np
+import tiktoken
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from langchain_openai import AzureOpenAIEmbeddings
 from pydantic import SecretStr
 import os
+import threading
+from typing import List
 from dotenv import load_dotenv
+from utility.embedding_cache import resolve_embeddings
+import logging
 
+logger = logging.getLogger(__name__)
 load_dotenv()
 
+# "azure" (Azure OpenAI) or "local" (sentence-transformers on CPU)
+EMBEDDING_BACKEND = os.getenv("embedding_backend", "azure").lower()
+
+EMBEDDING_MODEL_NAME = os.getenv("embedding_model_name") or "azure-openai-embedding"
+
+# Batching limits for embed_documents; Azure accepts at most 2048 inputs per request
+EMBEDDING_BATCH_SIZE = min(int(os.getenv("embedding_batch_size", 256)), 2048)
+EMBEDDING_BATCH_MAX_TOKENS = int(os.getenv("embedding_batch_max_tokens", 100000))
+EMBEDDING_MAX_CONCURRENCY = max(1, int(os.getenv("embedding_max_concurrency", 4)))
+
+# Local backend settings
+LOCAL_EMBEDDING_MODEL = os.getenv("local_embedding_model", "sentence-transformers/all-MiniLM-L6-v2")
+LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("local_embedding_batch_size", 64))
+LOCAL_EMBEDDING_POOL = os.getenv("local_embedding_pool", "none").lower()  # none | thread | process
+LOCAL_EMBEDDING_WORKERS = max(1, int(os.getenv("local_embedding_workers", os.cpu_count() or 1)))
+LOCAL_EMBEDDING_POOL_THRESHOLD = int(os.getenv("local_embedding_pool_threshold", 1000))
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The BPE file is downloaded on first use; fall back to a character estimate when offline
+        logger.warning(f"tiktoken encoding unavailable, estimating tokens from length: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def split_into_batches(texts: List[str], max_size: int, max_tokens: int) -> List[List[str]]:
+    """
+    Split texts into consecutive batches holding at most max_size texts and roughly max_tokens tokens.
+
+    A single text larger than max_tokens still gets a batch of its own.
+    """
+    batches, current, current_tokens = [], [], 0
+    for text in texts:
+        tokens = count_tokens(text)
+        if current and (len(current) >= max_size or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+class AzureEmbeddingBackend:
+    """
+    Embeds text with Azure OpenAI through one shared client, in batched and concurrent requests.
+    """
+
+    def __init__(self):
+        self.model_name = EMBEDDING_MODEL_NAME
+        self.client = AzureOpenAIEmbeddings(
+            azure_endpoint=os.getenv("embedding_azure_endpoint"),
+            api_key=SecretStr(os.getenv("embedding_openai_api_key") or ""),
+            api_version=os.getenv("embedding_openai_api_version"),
+            # deployment_name=os.getenv("embedding_deployment_name", "text-embedding-3-small" if os.getenv("embedding_deployment_name") is None else os.getenv("embedding_deployment_name"))
+            model=os.getenv("embedding_model_name"),
+            chunk_size=EMBEDDING_BATCH_SIZE,
+        )
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        batches = split_into_batches(texts, EMBEDDING_BATCH_SIZE, EMBEDDING_BATCH_MAX_TOKENS)
+        logger.debug(f"Embedding {len(texts)} texts in {len(batches)} Azure OpenAI batches.")
+        if len(batches) == 1:
+            results = [self.client.embed_documents(batches[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(EMBEDDING_MAX_CONCURRENCY, len(batches))) as executor:
+                results = list(executor.map(self.client.embed_documents, batches))
+        return [np.asarray(vector, dtype='float32') for batch in results for vector in batch]
+
+    def close(self) -> None:
+        pass
+
+
+class LocalEmbeddingBackend:
+    """
+    Embeds text with a sentence-transformers model running batched inference on the CPU.
+
+    The model is loaded once and shared by all requests. Large inputs can be spread over a
+    thread pool or a sentence-transformers multi-process pool (local_embedding_pool).
+    """
+
+    def __init__(self):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = f"local:{LOCAL_EMBEDDING_MODEL}"
+        self.model = SentenceTransformer(LOCAL_EMBEDDING_MODEL, device="cpu")
+        self._process_pool = None
+        self._pool_lock = threading.Lock()
+        logger.info(f"Loaded local embedding model {LOCAL_EMBEDDING_MODEL}.")
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=LOCAL_EMBEDDING_BATCH_SIZE, convert_to_numpy=True,
+                                 normalize_embeddings=True, show_progress_bar=False)
+
+    def _get_process_pool(self):
+        with self._pool_lock:
+            if self._process_pool is None:
+                self._process_pool = self.model.start_multi_process_pool(["cpu"] * LOCAL_EMBEDDING_WORKERS)
+            return self._process_pool
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        if LOCAL_EMBEDDING_POOL == "process" and len(texts) >= LOCAL_EMBEDDING_POOL_THRESHOLD:
+            matrix = self.model.encode_multi_process(texts, self._get_process_pool(),
+                                                     batch_size=LOCAL_EMBEDDING_BATCH_SIZE,
+                                                     normalize_embeddings=True)
+        elif LOCAL_EMBEDDING_POOL == "thread" and len(texts) >= LOCAL_EMBEDDING_POOL_THRESHOLD:
+            chunk = -(-len(texts) // LOCAL_EMBEDDING_WORKERS)
+            chunks = [texts[i:i + chunk] for i in range(0, len(texts), chunk)]
+            with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                matrix = np.vstack(list(executor.map(self._encode, chunks)))
+        else:
+            matrix = self._encode(texts)
+        return list(np.asarray(matrix, dtype='float32'))
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._process_pool is not None:
+                self.model.stop_multi_process_pool(self._process_pool)
+                self._process_pool = None
+
+
+@lru_cache(maxsize=1)
+def get_backend():
+    """
+    Embedding backend selected by the embedding_backend setting, created once per process.
+    """
+    if EMBEDDING_BACKEND == "local":
+        return LocalEmbeddingBackend()
+    if EMBEDDING_BACKEND != "azure":
+        logger.warning(f"Unknown embedding backend '{EMBEDDING_BACKEND}', falling back to azure.")
+    return AzureEmbeddingBackend()
+
+
+def load_embedding_backend() -> None:
+    """
+    Load the configured embedding backend eagerly, e.g. at application startup.
+    """
+    backend = get_backend()
+    logger.info(f"Embedding backend ready: {backend.model_name}")
+
+
+def close_embedding_backend() -> None:
+    if get_backend.cache_info().currsize:
+        get_backend().close()
+
+
+def get_embeddings(texts: List[str]) -> np.ndarray:
+    """
+    Generate embeddings for many texts with the configured backend.
+
+    Cached texts are served from the embedding cache; the rest are embedded in batches
+    (see AzureEmbeddingBackend and LocalEmbeddingBackend).
+
+    Args:
+        texts (List[str]): Input texts.
+
+    Returns:
+        np.ndarray: Contiguous float32 matrix with one row per input text.
+    """
+    if not texts:
+        return np.empty((0, 0), dtype='float32')
+    backend = get_backend()
+    vectors = resolve_embeddings(texts, backend.model_name, backend.embed)
+    return np.ascontiguousarray(np.vstack(vectors), dtype='float32')
+
 
 def get_embedding(text: str) -> np.ndarray:
     """
-    Generate an embedding for the given text using Azure OpenAI.
+    Generate an embedding for the given text with the configured backend.
 
     Args:
         text (str): Input text.
@@ -17,13 +201,4 @@ def get_embedding(text: str) -> np.ndarray:
     Returns:
         np.ndarray: Embedding vector.
     """
-    embedder = AzureOpenAIEmbeddings(
-
-        azure_endpoint=os.getenv("embedding_azure_endpoint"),
-        api_key=SecretStr(os.getenv("embedding_openai_api_key") or ""),
-        api_version=os.getenv("embedding_openai_api_version"),
-        # deployment_name=os.getenv("embedding_deployment_name", "text-embedding-3-small" if os.getenv("embedding_deployment_name") is None else os.getenv("embedding_deployment_name"))
-        model=os.getenv("embedding_model_name")
-    )
-    embedding = embedder.embed_query(text)
-    return np.array(embedding, dtype='float32')
+    return get_embeddings([text])[0]
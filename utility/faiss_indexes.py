@@ -0,0 +1,106 @@
+import math
+import os
+from typing import Optional
+
+import faiss
+import numpy as np
+from dotenv import load_dotenv
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# flat (exact), hnsw or ivfpq
+PROFILE_INDEX_TYPE = os.getenv("profile_index_type", "flat").lower()
+
+HNSW_M = int(os.getenv("hnsw_m", 32))
+HNSW_EF_CONSTRUCTION = int(os.getenv("hnsw_ef_construction", 200))
+HNSW_EF_SEARCH = int(os.getenv("hnsw_ef_search", 64))
+
+IVF_NLIST = int(os.getenv("ivf_nlist", 0))  # 0 picks ~4 * sqrt(N) at training time
+IVF_NPROBE = int(os.getenv("ivf_nprobe", 16))
+PQ_M = int(os.getenv("pq_m", 16))
+PQ_NBITS = int(os.getenv("pq_nbits", 8))
+
+INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+
+
+def supports_remove(index_type: str) -> bool:
+    """
+    HNSW graphs cannot delete vectors; removed entries are tombstoned until the next rebuild.
+    """
+    return index_type != "hnsw"
+
+
+def needs_training(index_type: str) -> bool:
+    return index_type == "ivfpq"
+
+
+def ivf_nlist_for(n_vectors: int) -> int:
+    nlist = IVF_NLIST or int(4 * math.sqrt(max(n_vectors, 1)))
+    return max(1, min(nlist, n_vectors // 39 or 1))
+
+
+def pq_m_for(dimension: int) -> int:
+    # The number of PQ sub-quantizers must divide the vector dimension
+    m = max(1, min(PQ_M, dimension))
+    while dimension % m:
+        m -= 1
+    return m
+
+
+def can_train(index_type: str, n_vectors: int) -> bool:
+    if not needs_training(index_type):
+        return True
+    return n_vectors >= max(2 ** PQ_NBITS, 39 * ivf_nlist_for(n_vectors))
+
+
+def create_index(index_type: str, dimension: int, n_vectors: int = 0) -> faiss.Index:
+    """
+    Create an empty index of the given type that accepts add_with_ids.
+
+    Args:
+        index_type: flat, hnsw or ivfpq.
+        dimension: Vector dimension.
+        n_vectors: Expected number of vectors, used to size the IVF coarse quantizer.
+
+    Returns:
+        faiss.Index: Untrained (ivfpq) or ready-to-use index.
+    """
+    if index_type == "hnsw":
+        hnsw = faiss.IndexHNSWFlat(dimension, HNSW_M)
+        hnsw.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index = faiss.IndexIDMap(hnsw)
+    elif index_type == "ivfpq":
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFPQ(quantizer, dimension, ivf_nlist_for(n_vectors), pq_m_for(dimension), PQ_NBITS)
+    else:
+        if index_type != "flat":
+            logger.warning(f"Unknown profile index type '{index_type}', falling back to flat.")
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(dimension))
+    set_search_params(index)
+    return index
+
+
+def train_index(index: faiss.Index, vectors: np.ndarray) -> None:
+    if not index.is_trained:
+        logger.info(f"Training {type(index).__name__} on {len(vectors)} vectors.")
+        index.train(np.ascontiguousarray(vectors, dtype='float32'))
+
+
+def set_search_params(index: faiss.Index, ef_search: Optional[int] = None, nprobe: Optional[int] = None) -> None:
+    """
+    Apply query-time knobs: efSearch for HNSW, nprobe for IVF. Flat indexes ignore both.
+    """
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+    if isinstance(inner, faiss.IndexHNSW):
+        inner.hnsw.efSearch = ef_search or HNSW_EF_SEARCH
+    elif isinstance(inner, faiss.IndexIVF):
+        inner.nprobe = min(nprobe or IVF_NPROBE, inner.nlist)
+
+
+def index_memory_bytes(index: faiss.Index) -> int:
+    """
+    Size of the serialized index, a close proxy for its resident memory.
+    """
+    return int(faiss.serialize_index(index).nbytes)
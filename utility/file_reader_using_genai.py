@@ -1,37 +1,26 @@
-import os
-import uuid
-from datetime import datetime
-from enum import Enum
-from typing import List, Optional
-from schema.ConsultantProfile import ConsultantProfileSchema
+from typing import List, Tuple, Union
 
 from dotenv import load_dotenv
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from pydantic import BaseModel, Field
-from langchain_openai import AzureChatOpenAI
+
+from schema.ConsultantProfile import ConsultantProfileSchema, ExtractedInfo
+from utility.document_cache import ExtractedDocument
+from utility.llm_extraction import EXTRACTION_MAX_CONCURRENCY, DocumentExtractor
+from utility.rule_extraction import extract_resume_fields
 
 load_dotenv()
 
+# Fields the LLM is asked for when the rules cannot fill them
+LLM_FIELDS = tuple(ExtractedInfo.model_fields)
 
-# Pydantic model for the information to be extracted by the LLM
-class ExtractedInfo(BaseModel):
-    name: str = Field(description="Name of the consultant")
-    email: str = Field(description="Email of the consultant")
-    skills: List[str] = Field(description="List of skills of the consultant")
-    experience: Optional[int] = Field(description="Total years of work experience of the consultant as an integer")
-    location: Optional[str] = Field(description="Location of the consultant")
-    project: Optional[str] = Field(description= "Past project details")
+resume_extractor = DocumentExtractor("resume", ConsultantProfileSchema, ExtractedInfo,
+                                     LLM_FIELDS, extract_resume_fields)
+missing_fields_chain = resume_extractor.fields_chain
 
+# Chain for documents the rules find nothing in
+chain = missing_fields_chain(LLM_FIELDS)
 
-# Initialize the LLM
-llm = AzureChatOpenAI(
-    azure_deployment=os.getenv("model_name"),
-    azure_endpoint=os.getenv("azure_endpoint"),
-    api_key=os.getenv("openai_api_key"),
-    api_version=os.getenv("openai_api_version"),
-    temperature=0.1,
-)
+# Cached extractions are only reused while the prompt, model and rules stay the same
+EXTRACTOR_VERSION = resume_extractor.version
 
 
 def extract_information(cleaned_text: str) -> ConsultantProfileSchema:
@@ -42,33 +31,41 @@ def extract_information(cleaned_text: str) -> ConsultantProfileSchema:
         cleaned_text: The cleaned resume text as a string.
 
     Returns:
-        A dictionary with the extracted and structured consultant profile.
+        The extracted and structured consultant profile.
     """
-    parser = JsonOutputParser(pydantic_object=ExtractedInfo)
+    # Fields the rules find are not asked of the LLM
+    [consultant_profile] = extract_information_batch([cleaned_text])
+    if isinstance(consultant_profile, Exception):
+        raise consultant_profile
 
-    format_instructions = parser.get_format_instructions()
+    return consultant_profile
 
-    prompt = ChatPromptTemplate.from_template(
-        template="""
-Extract information from the resume provided below.
-Follow the formatting instructions precisely.
 
-{format_instructions}
+def extract_information_batch(cleaned_texts: List[str], max_concurrency: int = EXTRACTION_MAX_CONCURRENCY
+                              ) -> List[Union[ConsultantProfileSchema, Exception]]:
+    """
+    Extract many resumes, filling what the rules find first and extracting the rest concurrently (at most
+    max_concurrency LLM calls at once).
 
-Resume:
-{cleaned_text}
-""",
-        partial_variables={"format_instructions": format_instructions},
-    )
+    Returns:
+        Per text, in order, the extracted consultant profile or the error it failed with.
+    """
+    return resume_extractor.extract_batch(cleaned_texts, max_concurrency)
 
-    chain = prompt | llm | parser
 
-    extracted_data = chain.invoke({"cleaned_text": cleaned_text})
+async def aextract_information_batch(cleaned_texts: List[str], max_concurrency: int = EXTRACTION_MAX_CONCURRENCY
+                                     ) -> List[Union[ConsultantProfileSchema, Exception]]:
+    """
+    Async extract_information_batch, for request handlers.
+    """
+    return await resume_extractor.aextract_batch(cleaned_texts, max_concurrency)
 
-    # Create the full consultant profile with the extracted data
-    consultant_profile = ConsultantProfileSchema(**extracted_data)
 
-    return consultant_profile
+async def aextract_documents(documents: List[Tuple[str, bytes]]) -> List[ExtractedDocument]:
+    """
+    Extract uploaded resume PDFs ((filename, bytes) pairs) through the document cache.
+    """
+    return await resume_extractor.aextract_documents(documents)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RunRecorder:
+    """
+    Timings and counters of one match run, keyed by stage name.
+
+    Counters (embeddings, cache hits, LLM calls, tokens, ...) are attributed to the stage that is active in
+    the calling context and also summed into the run totals. Safe to update from several threads.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.totals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def start_stage(self, name: str) -> None:
+        with self._lock:
+            stage = self.stages.setdefault(name, {"counters": {}})
+            stage.setdefault("started_at", datetime.now().isoformat())
+
+    def end_stage(self, name: str, duration_ms: float, error: Optional[str] = None) -> None:
+        """
+        Close one execution of a stage. A stage that runs several times (e.g. fan-out shards) keeps its first
+        start, its last end, the summed duration and the number of executions.
+        """
+        with self._lock:
+            stage = self.stages.setdefault(name, {"counters": {}})
+            stage["ended_at"] = datetime.now().isoformat()
+            stage["duration_ms"] = round(stage.get("duration_ms", 0) + duration_ms, 3)
+            stage["calls"] = stage.get("calls", 0) + 1
+            if error is not None:
+                stage["error"] = error
+
+    def count(self, stage_name: Optional[str], counter: str, value: float = 1) -> None:
+        with self._lock:
+            self.totals[counter] = self.totals.get(counter, 0) + value
+            if stage_name is not None:
+                counters = self.stages.setdefault(stage_name, {"counters": {}})["counters"]
+                counters[counter] = counters.get(counter, 0) + value
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {name: {**stage, "counters": dict(stage["counters"])} for name, stage in self.stages.items()},
+                "totals": dict(self.totals),
+            }
+
+
+_current_run: ContextVar[Optional[RunRecorder]] = ContextVar("current_run", default=None)
+_current_stage: ContextVar[Optional[str]] = ContextVar("current_stage", default=None)
+
+
+def current_run() -> Optional[RunRecorder]:
+    return _current_run.get()
+
+
+@contextmanager
+def record_run() -> Iterator[RunRecorder]:
+    """
+    Collect stage timings and counters of everything executed in this context (including coroutines and
+    helper threads started with a copied context).
+    """
+    recorder = RunRecorder()
+    token = _current_run.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_run.reset(token)
+
+
+@contextmanager
+def stage(name: str, recorder: Optional[RunRecorder] = None) -> Iterator[None]:
+    """
+    Time a pipeline stage. A no-op outside record_run() unless an explicit recorder is given.
+    """
+    recorder = recorder or _current_run.get()
+    if recorder is None:
+        yield
+        return
+    run_token = _current_run.set(recorder)
+    stage_token = _current_stage.set(name)
+    recorder.start_stage(name)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        recorder.end_stage(name, (time.perf_counter() - start) * 1000, error)
+        _current_stage.reset(stage_token)
+        _current_run.reset(run_token)
+
+
+def instrumented(name: str) -> Callable:
+    """
+    Decorator form of stage() for pipeline functions such as LangGraph nodes.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(counter: str, value: float = 1) -> None:
+    """
+    Add value to a counter of the current stage and run; ignored outside record_run().
+    """
+    recorder = _current_run.get()
+    if recorder is not None and value:
+        recorder.count(_current_stage.get(), counter, value)
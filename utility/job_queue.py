@@ -0,0 +1,175 @@
+import os
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from model.MatchJob import MatchJob
+from model.MatchJobEnum import MatchJobStatusEnum
+from model.WorkflowEnum import WorkflowProgressEnum
+from model.WorkflowStatus import WorkflowStatus
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# "thread" runs match jobs on the in-process worker pool, "database" queues them for `python -m utility.job_worker`
+MATCH_QUEUE_BACKEND = os.getenv("match_queue_backend", "thread").lower()
+# A claimed job is handed to another worker if its lease is not renewed within this many seconds
+JOB_LEASE_SECONDS = int(os.getenv("job_lease_seconds", 300))
+JOB_MAX_ATTEMPTS = int(os.getenv("job_max_attempts", 3))
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("job_retry_backoff_seconds", 30))
+
+# Rows locked per claim attempt; SKIP LOCKED lets concurrent workers take different ones
+_CLAIM_CANDIDATES = 10
+
+
+def enqueue_job(db: Session, kind: str, payload: Optional[dict] = None, workflow_status_id: Optional[int] = None,
+                max_attempts: Optional[int] = None) -> MatchJob:
+    """
+    Add a job to the queue and commit it.
+
+    Args:
+        db: Database session.
+        kind: Handler name, e.g. "match" or "ingest_resume".
+        payload: JSON arguments of the handler.
+        workflow_status_id: Workflow status the job reports progress on, if any.
+        max_attempts: Attempts before the job is failed for good (job_max_attempts by default).
+
+    Returns:
+        MatchJob: The queued job.
+    """
+    job = MatchJob(
+        kind=kind,
+        payload=payload or {},
+        workflow_status_id=workflow_status_id,
+        status=MatchJobStatusEnum.queued,
+        max_attempts=max_attempts or JOB_MAX_ATTEMPTS,
+        available_at=datetime.now(),
+    )
+    db.add(job)
+    db.commit()
+    logger.debug(f"Queued {kind} job {job.id}.")
+    return job
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(MatchJob.status == MatchJobStatusEnum.queued, MatchJob.available_at <= now),
+        and_(MatchJob.status == MatchJobStatusEnum.leased, MatchJob.lease_expires_at < now,
+             MatchJob.attempts < MatchJob.max_attempts),
+    )
+
+
+def claim_job(db: Session, worker_id: str, kinds: Optional[Sequence[str]] = None,
+              lease_seconds: int = JOB_LEASE_SECONDS) -> Optional[MatchJob]:
+    """
+    Lease the oldest claimable job: a queued job that is due, or a leased job whose worker stopped renewing it.
+
+    Candidates are read with SELECT ... FOR UPDATE SKIP LOCKED (MySQL) so concurrent workers do not contend
+    for the same rows, and each claim is a conditional UPDATE, which is also what keeps SQLite (where FOR
+    UPDATE is not rendered) safe.
+
+    Returns:
+        The leased job, or None when nothing is claimable.
+    """
+    now = datetime.now()
+    query = db.query(MatchJob.id).filter(_claimable(now))
+    if kinds:
+        query = query.filter(MatchJob.kind.in_(list(kinds)))
+    candidates = [row.id for row in
+                  query.order_by(MatchJob.id).limit(_CLAIM_CANDIDATES).with_for_update(skip_locked=True).all()]
+
+    for job_id in candidates:
+        claimed = db.query(MatchJob).filter(MatchJob.id == job_id, _claimable(now)).update({
+            MatchJob.status: MatchJobStatusEnum.leased,
+            MatchJob.leased_by: worker_id,
+            MatchJob.lease_expires_at: now + timedelta(seconds=lease_seconds),
+            MatchJob.attempts: MatchJob.attempts + 1,
+        }, synchronize_session=False)
+        if claimed:
+            db.commit()
+            job = db.query(MatchJob).filter(MatchJob.id == job_id).first()
+            logger.info(f"Worker {worker_id} leased {job.kind} job {job.id} (attempt {job.attempts}).")
+            return job
+    db.commit()
+    return None
+
+
+def renew_lease(db: Session, job_id: int, worker_id: str, lease_seconds: int = JOB_LEASE_SECONDS) -> bool:
+    """
+    Extend the lease of a running job.
+
+    Returns:
+        bool: False when the lease was lost (expired and taken over by another worker).
+    """
+    renewed = db.query(MatchJob).filter(
+        MatchJob.id == job_id, MatchJob.leased_by == worker_id, MatchJob.status == MatchJobStatusEnum.leased
+    ).update({MatchJob.lease_expires_at: datetime.now() + timedelta(seconds=lease_seconds)},
+             synchronize_session=False)
+    db.commit()
+    return bool(renewed)
+
+
+def complete_job(db: Session, job_id: int, worker_id: str) -> None:
+    db.query(MatchJob).filter(MatchJob.id == job_id, MatchJob.leased_by == worker_id).update({
+        MatchJob.status: MatchJobStatusEnum.done,
+        MatchJob.finished_at: datetime.now(),
+        MatchJob.lease_expires_at: None,
+    }, synchronize_session=False)
+    db.commit()
+
+
+def fail_job(db: Session, job_id: int, worker_id: str, error: str) -> bool:
+    """
+    Record a failed attempt: requeue the job with exponential backoff, or fail it once attempts run out.
+
+    Returns:
+        bool: True when the job will be retried.
+    """
+    job = db.query(MatchJob).filter(MatchJob.id == job_id, MatchJob.leased_by == worker_id).first()
+    if not job:
+        return False
+    job.last_error = error[:1000]
+    job.lease_expires_at = None
+    retry = job.attempts < job.max_attempts
+    if retry:
+        job.status = MatchJobStatusEnum.queued
+        job.available_at = datetime.now() + timedelta(seconds=JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1))
+    else:
+        job.status = MatchJobStatusEnum.failed
+        job.finished_at = datetime.now()
+    db.add(job)
+    db.commit()
+    return retry
+
+
+def reap_expired_jobs(db: Session) -> int:
+    """
+    Fail leased jobs whose lease expired after their last allowed attempt (workers kept crashing on them),
+    marking their workflow statuses FAILED too.
+
+    Returns:
+        int: Number of jobs failed.
+    """
+    now = datetime.now()
+    expired = db.query(MatchJob).filter(
+        MatchJob.status == MatchJobStatusEnum.leased, MatchJob.lease_expires_at < now,
+        MatchJob.attempts >= MatchJob.max_attempts).with_for_update(skip_locked=True).all()
+    for job in expired:
+        job.status = MatchJobStatusEnum.failed
+        job.finished_at = now
+        job.last_error = f"Lease expired on attempt {job.attempts} (worker {job.leased_by})."
+        db.add(job)
+    workflow_ids = [job.workflow_status_id for job in expired if job.workflow_status_id is not None]
+    if workflow_ids:
+        db.query(WorkflowStatus).filter(WorkflowStatus.id.in_(workflow_ids)).update({
+            WorkflowStatus.progress: WorkflowProgressEnum.FAILED,
+            WorkflowStatus.completed_at: now,
+        }, synchronize_session=False)
+    db.commit()
+    if expired:
+        logger.warning(f"Failed {len(expired)} jobs whose workers did not finish them.")
+    return len(expired)
@@ -0,0 +1,193 @@
+"""
+Worker process for the durable job queue (match_jobs table).
+
+Usage:
+    python -m utility.job_worker --concurrency 2
+    python -m utility.job_worker --kinds ingest_resume --once
+
+Run as many processes as needed: jobs are leased through the database, and a job whose worker dies is
+picked up again by another worker once its lease expires.
+
+Workers may also run on several hosts, with one caveat: match-graph checkpoints (utility/checkpointing.py)
+live in a local SQLite file, match_checkpoint_path. A match job retried on a different host therefore starts
+over instead of resuming from its last completed node. Do not point match_checkpoint_path at a network share,
+since SQLite locking is unreliable there.
+"""
+import argparse
+import os
+import signal
+import socket
+import threading
+import uuid
+from typing import Callable, Dict, Optional, Sequence
+
+from dotenv import load_dotenv
+
+from db.database import sessionLocal
+# Every mapped model must be imported before the first query so relationships resolve
+import model.user, model.JobDescription, model.ConsultantProfile, model.MatchResult, model.WorkflowStatus, \
+    model.Notification, model.MatchJob  # noqa: F401
+from model.MatchJob import MatchJob
+from utility.job_queue import JOB_LEASE_SECONDS, claim_job, complete_job, fail_job, reap_expired_jobs, renew_lease
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+JOB_POLL_INTERVAL = float(os.getenv("job_poll_interval", 2))
+
+
+def handle_match(job: MatchJob, final_attempt: bool) -> None:
+    from crud.MatchResult import execute_match_job
+    if not execute_match_job(job.workflow_status_id, final_attempt=final_attempt):
+        raise RuntimeError(f"Match workflow {job.workflow_status_id} failed.")
+
+
+def handle_rematch(job: MatchJob, final_attempt: bool) -> None:
+    from crud.MatchResult import execute_rematch_job
+    execute_rematch_job(job.payload["consultant_id"])
+
+
+def handle_ingest_resume(job: MatchJob, final_attempt: bool) -> None:
+    """
+    Extract a consultant profile from the resume PDF at payload["path"] and store it.
+    """
+    from crud.ConsultantProfile import upsert_consultant_profile
+    from utility.file_reader_using_genai import extract_information
+    from utility.pdf_reader import extract_pdf_text
+
+    path = job.payload["path"]
+    with open(path, "rb") as pdf_file:
+        pdf_content = extract_pdf_text(pdf_file.read(), os.path.basename(path))
+    processed_result = extract_information(pdf_content)
+    db = sessionLocal()
+    try:
+        upsert_consultant_profile(db, processed_result)
+    finally:
+        db.close()
+    logger.info(f"Ingested resume {path}.")
+
+
+JOB_HANDLERS: Dict[str, Callable[[MatchJob, bool], None]] = {
+    "match": handle_match,
+    "rematch": handle_rematch,
+    "ingest_resume": handle_ingest_resume,
+}
+
+
+class JobWorker:
+    """
+    Claims jobs one at a time and runs them, renewing the lease from a heartbeat thread while a job runs.
+    """
+
+    def __init__(self, stop_event: threading.Event, kinds: Optional[Sequence[str]] = None,
+                 lease_seconds: int = JOB_LEASE_SECONDS, poll_interval: float = JOB_POLL_INTERVAL):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stop_event = stop_event
+        self.kinds = list(kinds) if kinds else list(JOB_HANDLERS)
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+    def _heartbeat(self, job_id: int, done: threading.Event) -> None:
+        while not done.wait(self.lease_seconds / 3):
+            db = sessionLocal()
+            try:
+                if not renew_lease(db, job_id, self.worker_id, self.lease_seconds):
+                    logger.warning(f"Worker {self.worker_id} lost the lease on job {job_id}.")
+                    return
+            except Exception as e:
+                logger.error(f"Error occurred while renewing the lease on job {job_id}: {e}")
+            finally:
+                db.close()
+
+    def run_once(self) -> bool:
+        """
+        Claim and run one job.
+
+        Returns:
+            bool: False when there was nothing to claim.
+        """
+        db = sessionLocal()
+        try:
+            reap_expired_jobs(db)
+            job = claim_job(db, self.worker_id, self.kinds, self.lease_seconds)
+            if job is None:
+                return False
+            job_id, final_attempt = job.id, job.attempts >= job.max_attempts
+            db.expunge(job)
+        finally:
+            db.close()
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job_id, done), daemon=True)
+        heartbeat.start()
+        try:
+            JOB_HANDLERS[job.kind](job, final_attempt)
+        except Exception as e:
+            logger.error(f"{job.kind} job {job_id} failed on attempt {job.attempts}: {e}")
+            done.set()
+            db = sessionLocal()
+            try:
+                retry = fail_job(db, job_id, self.worker_id, str(e))
+                logger.info(f"Job {job_id} {'requeued for retry' if retry else 'failed permanently'}.")
+            finally:
+                db.close()
+            return True
+        done.set()
+        db = sessionLocal()
+        try:
+            complete_job(db, job_id, self.worker_id)
+            logger.info(f"{job.kind} job {job_id} completed.")
+        finally:
+            db.close()
+        return True
+
+    def run(self) -> None:
+        logger.info(f"Job worker {self.worker_id} started for kinds {self.kinds}.")
+        while not self.stop_event.is_set():
+            try:
+                if not self.run_once():
+                    self.stop_event.wait(self.poll_interval)
+            except Exception as e:
+                logger.error(f"Job worker {self.worker_id} error: {e}")
+                self.stop_event.wait(self.poll_interval)
+        logger.info(f"Job worker {self.worker_id} stopped.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=1, help="worker threads in this process")
+    parser.add_argument("--kinds", nargs="+", choices=list(JOB_HANDLERS), default=None)
+    parser.add_argument("--lease-seconds", type=int, default=JOB_LEASE_SECONDS)
+    parser.add_argument("--poll-interval", type=float, default=JOB_POLL_INTERVAL)
+    parser.add_argument("--once", action="store_true", help="drain the queue and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+
+    if {"match", "rematch"} & set(args.kinds or JOB_HANDLERS):
+        from utility.embeddings import load_embedding_backend
+        from utility.profile_index import load_profile_index
+        load_embedding_backend()
+        load_profile_index()
+
+    workers = [JobWorker(stop_event, args.kinds, args.lease_seconds, args.poll_interval)
+               for _ in range(max(1, args.concurrency))]
+    if args.once:
+        while any([worker.run_once() for worker in workers]):
+            pass
+        return
+
+    threads = [threading.Thread(target=worker.run, name=f"job-worker-{i}") for i, worker in enumerate(workers)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,71 @@
-import os
-from typing import List, Optional
-from schema.ConsultantProfile import ConsultantProfileSchema
+from typing import List, Tuple, Union
+
 from dotenv import load_dotenv
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import AzureChatOpenAI
+
 from schema.JobDescription import JobDescriptionRequest
+from utility.document_cache import ExtractedDocument
+from utility.llm_extraction import EXTRACTION_MAX_CONCURRENCY, DocumentExtractor
+from utility.rule_extraction import extract_job_description_fields
 
 load_dotenv()
 
+# Fields the LLM is asked for when the rules cannot fill them
+LLM_FIELDS = ("title", "department", "location", "experience", "description", "skills")
+
+job_description_extractor = DocumentExtractor("job_description", JobDescriptionRequest, JobDescriptionRequest,
+                                              LLM_FIELDS, extract_job_description_fields)
+missing_fields_chain = job_description_extractor.fields_chain
+
+# Chain for documents the rules find nothing in
+chain = missing_fields_chain(LLM_FIELDS)
 
-# Initialize the LLM
-llm = AzureChatOpenAI(
-    azure_deployment=os.getenv("model_name"),
-    azure_endpoint=os.getenv("azure_endpoint"),
-    api_key=os.getenv("openai_api_key"),
-    api_version=os.getenv("openai_api_version"),
-    temperature=0.1,
-)
+# Cached extractions are only reused while the prompt, model and rules stay the same
+EXTRACTOR_VERSION = job_description_extractor.version
 
 
 def extract_information(cleaned_text: str) -> JobDescriptionRequest:
     """
-    Extracts information from cleaned resume text using an LLM.
+    Extracts information from cleaned job description text using an LLM.
 
     Args:
-        cleaned_text: The cleaned resume text as a string.
+        cleaned_text: The cleaned job description text as a string.
 
     Returns:
-        A dictionary with the extracted and structured consultant profile.
+        The extracted and structured job description.
     """
-    parser = JsonOutputParser(pydantic_object=JobDescriptionRequest)
+    # Fields the rules find are not asked of the LLM
+    [job_description] = extract_information_batch([cleaned_text])
+    if isinstance(job_description, Exception):
+        raise job_description
 
-    format_instructions = parser.get_format_instructions()
+    return job_description
 
-    prompt = ChatPromptTemplate.from_template(
-        template="""
-Extract information from the resume provided below.
-Follow the formatting instructions precisely.
 
-{format_instructions}
+def extract_information_batch(cleaned_texts: List[str], max_concurrency: int = EXTRACTION_MAX_CONCURRENCY
+                              ) -> List[Union[JobDescriptionRequest, Exception]]:
+    """
+    Extract many job descriptions, filling what the rules find first and extracting the rest concurrently
+    (at most max_concurrency LLM calls at once).
 
-Resume:
-{cleaned_text}
-""",
-        partial_variables={"format_instructions": format_instructions},
-    )
+    Returns:
+        Per text, in order, the extracted job description or the error it failed with.
+    """
+    return job_description_extractor.extract_batch(cleaned_texts, max_concurrency)
 
-    chain = prompt | llm | parser
 
-    extracted_data = chain.invoke({"cleaned_text": cleaned_text})
+async def aextract_information_batch(cleaned_texts: List[str], max_concurrency: int = EXTRACTION_MAX_CONCURRENCY
+                                     ) -> List[Union[JobDescriptionRequest, Exception]]:
+    """
+    Async extract_information_batch, for request handlers.
+    """
+    return await job_description_extractor.aextract_batch(cleaned_texts, max_concurrency)
 
-    # Create the full consultant profile with the extracted data
-    job_description = JobDescriptionRequest(**extracted_data)
 
-    return job_description
+async def aextract_documents(documents: List[Tuple[str, bytes]]) -> List[ExtractedDocument]:
+    """
+    Extract uploaded job description PDFs ((filename, bytes) pairs) through the document cache.
+    """
+    return await job_description_extractor.aextract_documents(documents)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+import hashlib
+import os
+from functools import lru_cache
+from typing import Callable, Dict, Generic, List, Sequence, Tuple, Type, TypeVar, Union
+
+from dotenv import load_dotenv
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_openai import AzureChatOpenAI
+from pydantic import BaseModel, create_model
+
+from utility.document_cache import ExtractedDocument, aextract_documents
+from utility.instrumentation import count
+from utility.rule_extraction import HINTS, RULE_EXTRACTION_ENABLED, RULES_VERSION
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# Documents extracted by the LLM at the same time in one batch
+EXTRACTION_MAX_CONCURRENCY = max(1, int(os.getenv("extraction_max_concurrency", 8)))
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Chat model shared by the resume and job description readers
+llm = AzureChatOpenAI(
+    azure_deployment=os.getenv("model_name"),
+    azure_endpoint=os.getenv("azure_endpoint"),
+    api_key=os.getenv("openai_api_key"),
+    api_version=os.getenv("openai_api_version"),
+    temperature=0.1,
+)
+
+# Deterministic pre-extractor: document text -> the fields it could fill, plus HINTS for fields it could not
+RuleExtractor = Callable[[str], dict]
+# Per document: the fields the rules filled, the fields asked of the LLM and the hints for those fields
+Plan = Tuple[dict, Tuple[str, ...], dict]
+# Extraction chain asking the LLM for exactly the given fields
+FieldsChain = Callable[[Tuple[str, ...]], Runnable]
+
+
+def _to_schemas(schema: Type[SchemaT], outputs: list) -> List[Union[SchemaT, Exception]]:
+    results = []
+    for output in outputs:
+        if isinstance(output, Exception):
+            results.append(output)
+            continue
+        try:
+            results.append(schema(**output))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def batch_extract(chain: Runnable, schema: Type[SchemaT], texts: List[str],
+                  max_concurrency: int = EXTRACTION_MAX_CONCURRENCY) -> List[Union[SchemaT, Exception]]:
+    """
+    Run an extraction chain over many documents concurrently and validate each output into schema.
+
+    Args:
+        chain: Compiled prompt | llm | parser chain taking {"cleaned_text": ...}.
+        schema: Pydantic model built from each parsed output.
+        texts: Document texts.
+        max_concurrency: LLM calls in flight at once.
+
+    Returns:
+        List[Union[SchemaT, Exception]]: Per text, in order, the extracted model or the error that document
+            failed with; one failure does not affect the others.
+    """
+    outputs = chain.batch([{"cleaned_text": text} for text in texts], config={"max_concurrency": max_concurrency},
+                          return_exceptions=True)
+    return _to_schemas(schema, outputs)
+
+
+async def abatch_extract(chain: Runnable, schema: Type[SchemaT], texts: List[str],
+                         max_concurrency: int = EXTRACTION_MAX_CONCURRENCY) -> List[Union[SchemaT, Exception]]:
+    """
+    Async batch_extract, for use from request handlers.
+    """
+    outputs = await chain.abatch([{"cleaned_text": text} for text in texts],
+                                 config={"max_concurrency": max_concurrency}, return_exceptions=True)
+    return _to_schemas(schema, outputs)
+
+
+def build_fields_chain(llm: BaseChatModel, model: Type[BaseModel], fields: Sequence[str], document: str) -> Runnable:
+    """
+    Extraction chain that asks the LLM only for fields of model, so its format instructions and answer
+    carry nothing the rules already found.
+
+    Args:
+        llm: Chat model.
+        model: Pydantic model whose field names, types and descriptions are used.
+        fields: Names of the fields to extract.
+        document: What the text is, e.g. "resume" or "job description".
+
+    Returns:
+        Runnable: prompt | llm | parser chain taking {"cleaned_text": ...}.
+    """
+    subset = create_model(f"{model.__name__}Fields", **{
+        name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields})
+    parser = JsonOutputParser(pydantic_object=subset)
+    prompt = ChatPromptTemplate.from_template(
+        template="""
+Extract only these fields from the {document} provided below: {fields}.
+Follow the formatting instructions precisely.
+
+{format_instructions}
+
+Document:
+{cleaned_text}
+""",
+        partial_variables={"document": document, "fields": ", ".join(fields),
+                           "format_instructions": parser.get_format_instructions()},
+    )
+    return prompt | llm | parser
+
+
+def _plan(rules: RuleExtractor, fields: Sequence[str], texts: List[str]) -> List[Plan]:
+    plans = []
+    for text in texts:
+        try:
+            found = dict(rules(text)) if RULE_EXTRACTION_ENABLED else {}
+        except Exception as e:
+            logger.error(f"Error occurred while applying the extraction rules: {e}")
+            found = {}
+        hints = found.pop(HINTS, {})
+        plans.append((found, tuple(field for field in fields if field not in found), hints))
+    count("rule_only_extractions", sum(1 for _, missing, _ in plans if not missing))
+    count("rule_extracted_fields", sum(len(found) for found, _, _ in plans))
+    return plans
+
+
+def _router(chain_for: FieldsChain) -> Runnable:
+    # The returned chain is invoked with the same input, so one batch serves every combination of missing fields
+    return RunnableLambda(lambda inputs: chain_for(inputs["missing"]))
+
+
+def _with_hint(value, hint):
+    # The LLM's list first, then the hinted items it did not return; a non-list hint only fills a gap
+    if not isinstance(hint, list):
+        return hint if value is None else value
+    values = value if isinstance(value, list) else []
+    seen = {str(item).lower() for item in values}
+    return values + [item for item in hint if str(item).lower() not in seen]
+
+
+def _merge(schema: Type[SchemaT], plans: List[Plan],
+           outputs: Dict[int, Union[dict, Exception]]) -> List[Union[SchemaT, Exception]]:
+    merged = []
+    for i, (found, missing, hints) in enumerate(plans):
+        output = outputs.get(i, {})
+        if isinstance(output, Exception):
+            merged.append(output)
+            continue
+        # Only the fields that were asked for are taken from the LLM; the rules' values win
+        fields = {field: output[field] for field in missing if field in output}
+        for field, hint in hints.items():
+            if field in missing:
+                fields[field] = _with_hint(fields.get(field), hint)
+        merged.append({**fields, **found})
+    return _to_schemas(schema, merged)
+
+
+def batch_extract_missing(chain_for: FieldsChain, schema: Type[SchemaT], rules: RuleExtractor,
+                          fields: Sequence[str], texts: List[str],
+                          max_concurrency: int = EXTRACTION_MAX_CONCURRENCY) -> List[Union[SchemaT, Exception]]:
+    """
+    batch_extract that fills what it can with the deterministic rules first and asks the LLM, through a
+    trimmed prompt, only for the fields still missing. Documents the rules fill completely make no LLM call.
+    Hinted fields are still asked for, and the hints are merged into the LLM's answer.
+
+    Args:
+        chain_for: Extraction chain for a tuple of missing field names.
+        schema: Pydantic model built from the merged fields.
+        rules: Pre-extractor returning the fields it found in a text.
+        fields: Fields the LLM can be asked for.
+        texts: Document texts.
+        max_concurrency: LLM calls in flight at once.
+
+    Returns:
+        List[Union[SchemaT, Exception]]: Per text, in order, the extracted model or the error that document
+            failed with.
+    """
+    plans = _plan(rules, fields, texts)
+    pending = [i for i, (_, missing, _) in enumerate(plans) if missing]
+    outputs = _router(chain_for).batch(
+        [{"cleaned_text": texts[i], "missing": plans[i][1]} for i in pending],
+        config={"max_concurrency": max_concurrency}, return_exceptions=True) if pending else []
+    return _merge(schema, plans, dict(zip(pending, outputs)))
+
+
+async def abatch_extract_missing(chain_for: FieldsChain, schema: Type[SchemaT], rules: RuleExtractor,
+                                 fields: Sequence[str], texts: List[str],
+                                 max_concurrency: int = EXTRACTION_MAX_CONCURRENCY
+                                 ) -> List[Union[SchemaT, Exception]]:
+    """
+    Async batch_extract_missing, for use from request handlers.
+    """
+    plans = _plan(rules, fields, texts)
+    pending = [i for i, (_, missing, _) in enumerate(plans) if missing]
+    outputs = await _router(chain_for).abatch(
+        [{"cleaned_text": texts[i], "missing": plans[i][1]} for i in pending],
+        config={"max_concurrency": max_concurrency}, return_exceptions=True) if pending else []
+    return _merge(schema, plans, dict(zip(pending, outputs)))
+
+
+class DocumentExtractor(Generic[SchemaT]):
+    """
+    The extraction pipeline of one kind of document: rules first, then one trimmed LLM call for the missing
+    fields, with uploaded PDFs going through the document cache.
+
+    Args:
+        kind: Document kind, used in the prompt (underscores read as spaces) and as the document cache kind.
+        schema: Pydantic model the extracted fields are validated into.
+        llm_model: Pydantic model whose field names, types and descriptions the LLM is given.
+        fields: Fields the LLM can be asked for.
+        rules: Pre-extractor for this kind of document.
+    """
+
+    def __init__(self, kind: str, schema: Type[SchemaT], llm_model: Type[BaseModel], fields: Sequence[str],
+                 rules: RuleExtractor):
+        self.kind = kind
+        self.schema = schema
+        self.llm_model = llm_model
+        self.fields = tuple(fields)
+        self.rules = rules
+        # Built once per combination of missing fields and shared by every extraction
+        self.fields_chain: FieldsChain = lru_cache(maxsize=None)(self._build_chain)
+        # Cached extractions are only reused while the prompt, model and rules stay the same
+        prompt = self.fields_chain(self.fields).first.format(cleaned_text="")
+        self.version = hashlib.sha256(
+            f"{os.getenv('model_name')}\x00{prompt}\x00{RULES_VERSION}".encode("utf-8")).hexdigest()[:16]
+
+    def _build_chain(self, fields: Tuple[str, ...]) -> Runnable:
+        return build_fields_chain(llm, self.llm_model, fields, self.kind.replace("_", " "))
+
+    def extract_batch(self, texts: List[str], max_concurrency: int = EXTRACTION_MAX_CONCURRENCY
+                      ) -> List[Union[SchemaT, Exception]]:
+        return batch_extract_missing(self.fields_chain, self.schema, self.rules, self.fields, texts,
+                                     max_concurrency)
+
+    async def aextract_batch(self, texts: List[str], max_concurrency: int = EXTRACTION_MAX_CONCURRENCY
+                             ) -> List[Union[SchemaT, Exception]]:
+        return await abatch_extract_missing(self.fields_chain, self.schema, self.rules, self.fields, texts,
+                                            max_concurrency)
+
+    async def aextract_documents(self, documents: List[Tuple[str, bytes]]) -> List[ExtractedDocument]:
+        """
+        Extract uploaded PDFs ((filename, bytes) pairs) through the document cache.
+        """
+        return await aextract_documents(documents, self.kind, self.schema, self.version, self.aextract_batch)
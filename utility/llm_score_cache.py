@@ -0,0 +1,136 @@
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from db.database import sessionLocal
+from model.LLMScoreCache import LLMScoreCache
+from utility.db_writes import upsert_rows
+from utility.embedding_cache import canonical_text
+from utility.lru_cache import LRUCache
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+LLM_SCORE_CACHE_TTL = timedelta(hours=float(os.getenv("llm_score_cache_ttl_hours", 168)))
+
+# key -> (score, created_at, job_description_id, consultant_id)
+_memory_cache = LRUCache(int(os.getenv("llm_score_cache_size", 50000)))
+
+_DB_LOOKUP_CHUNK = 1000
+
+
+def score_cache_key(job_description: str, resume: str, prompt_version: str) -> str:
+    """
+    Cache key of one JD/profile pair: sha256 over the prompt version and both canonical texts.
+    """
+    payload = f"{prompt_version}\x00{canonical_text(job_description)}\x00{canonical_text(resume)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_scores(keys: List[str]) -> dict:
+    """
+    Look up unexpired scores, first in the in-process LRU and then in the llm_score_cache table.
+
+    Returns:
+        dict: cache key -> score, for the keys that were found.
+    """
+    cutoff = datetime.now() - LLM_SCORE_CACHE_TTL
+    found, missing = {}, []
+    for key in set(keys):
+        entry = _memory_cache.get(key)
+        if entry is not None and entry[1] >= cutoff:
+            found[key] = entry[0]
+        else:
+            missing.append(key)
+    if not missing:
+        return found
+
+    db = sessionLocal()
+    try:
+        for start in range(0, len(missing), _DB_LOOKUP_CHUNK):
+            rows = db.query(LLMScoreCache).filter(
+                LLMScoreCache.cache_key.in_(missing[start:start + _DB_LOOKUP_CHUNK]),
+                LLMScoreCache.created_at >= cutoff).all()
+            for row in rows:
+                _memory_cache.put(row.cache_key, (row.score, row.created_at, row.job_description_id, row.consultant_id))
+                found[row.cache_key] = row.score
+    except Exception as e:
+        logger.error(f"Error occurred while reading the LLM score cache: {e}")
+    finally:
+        db.close()
+    return found
+
+
+def store_scores(entries: dict, prompt_version: str) -> None:
+    """
+    Persist fresh scores.
+
+    Args:
+        entries: cache key -> (score, job_description_id, consultant_id).
+        prompt_version: Version of the scoring prompt/model the scores were produced with.
+    """
+    if not entries:
+        return
+    now = datetime.now()
+    for key, (score, job_description_id, consultant_id) in entries.items():
+        _memory_cache.put(key, (score, now, job_description_id, consultant_id))
+
+    db = sessionLocal()
+    try:
+        # Upsert row by row: an expired row with the same key is refreshed and a row stored concurrently by
+        # another worker is overwritten, without failing the rest of the batch
+        upsert_rows(db, LLMScoreCache, [
+            {
+                "cache_key": key,
+                "prompt_version": prompt_version,
+                "job_description_id": job_description_id,
+                "consultant_id": consultant_id,
+                "score": score,
+                "created_at": now,
+            }
+            for key, (score, job_description_id, consultant_id) in entries.items()
+        ], key="cache_key", update_columns=["prompt_version", "job_description_id", "consultant_id", "score",
+                                            "created_at"])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error occurred while writing the LLM score cache: {e}")
+    finally:
+        db.close()
+
+
+def invalidate_llm_scores(job_description_id: Optional[int] = None, consultant_id: Optional[int] = None) -> None:
+    """
+    Drop cached scores of an edited or deleted job description and/or consultant profile.
+    """
+    if job_description_id is None and consultant_id is None:
+        return
+
+    def matches(entry) -> bool:
+        return (job_description_id is not None and entry[2] == job_description_id) or \
+               (consultant_id is not None and entry[3] == consultant_id)
+
+    _memory_cache.remove_if(matches)
+
+    db = sessionLocal()
+    try:
+        query = db.query(LLMScoreCache)
+        if job_description_id is not None and consultant_id is not None:
+            query = query.filter((LLMScoreCache.job_description_id == job_description_id) |
+                                 (LLMScoreCache.consultant_id == consultant_id))
+        elif job_description_id is not None:
+            query = query.filter(LLMScoreCache.job_description_id == job_description_id)
+        else:
+            query = query.filter(LLMScoreCache.consultant_id == consultant_id)
+        deleted = query.delete(synchronize_session=False)
+        db.commit()
+        logger.debug(f"Invalidated {deleted} cached LLM scores.")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error occurred while invalidating the LLM score cache: {e}")
+    finally:
+        db.close()
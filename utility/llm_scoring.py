@@ -0,0 +1,369 @@
+import asyncio
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+from typing import List, Optional, Sequence, Union
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field, TypeAdapter
+from openai import AsyncAzureOpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+from utility.async_utils import ConcurrencyLimiter, run_sync
+from utility.embeddings import count_tokens
+from utility.instrumentation import count
+from utility.llm_score_cache import get_cached_scores, score_cache_key, store_scores
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+LLM_SCORING_MODEL = os.getenv("llm_scoring_model", "gpt-4o")
+LLM_MAX_CONCURRENCY = max(1, int(os.getenv("llm_max_concurrency", 8)))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("llm_requests_per_minute", 300))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("llm_tokens_per_minute", 60000))
+LLM_MAX_RETRIES = int(os.getenv("llm_max_retries", 5))
+LLM_BACKOFF_BASE = float(os.getenv("llm_backoff_base", 1.0))
+LLM_BACKOFF_MAX = float(os.getenv("llm_backoff_max", 30.0))
+LLM_SCORE_MAX_TOKENS = 10
+# Candidates scored per chat completion; 1 disables batched scoring
+LLM_SCORING_BATCH_SIZE = max(1, int(os.getenv("llm_scoring_batch_size", 5)))
+LLM_BATCH_TOKENS_PER_CANDIDATE = 25
+
+SYSTEM_PROMPT = "You are a Human Resource person having 10 years of experience that evaluates how well a resume matches a job description."
+
+SCORING_RUBRIC = """                Evaluation Criteria
+                    Skills Match: Assess the overlap between the required skills in the job description and the skills listed in the resume.
+                    Experience Match: Compare the years of experience required in the job description with the candidate's experience in the resume.
+                    Description Match: Compare the candidate's past project experience with the description given in job description
+                    Location Match: Check if the candidate's location aligns with the job location or if remote work is acceptable.
+                    Availability: Verify if the candidate's availabale or not ("avialable","busy","unavailable")
+                    Role/Title Alignment: Evaluate whether the candidate's previous roles align with the job title or responsibilities.
+                    Scoring Process
+                - Assign a score for each criterion (e.g., skills, experience, location, etc.).
+                - Combine the scores into a weighted average or a hybrid score (e.g., 30% skills match, 20% experience match, 30% description match, 10% location match, 10% availability).
+                Example
+                    Job Description:
+                    Title: Software Engineer
+                    Skills: Python, Machine Learning, SQL
+                    Experience: 3+ years
+                    Description: Responsible for developing and deploying machine learning models, optimizing SQL databases, and creating scalable Python-based applications for data-driven decision-making.
+                    Location: New York, NY
+                Resume:
+                    Name: John Doe
+                    Skills: Python, SQL, Data Analysis
+                    Experience: 4 years
+                    Location: Remote (willing to relocate)
+                    Projects:
+                            Project 1: Developed a Python-based data pipeline to process and analyze 1TB of data daily, improving processing speed by 30%.
+                            Project 2: Designed and optimized SQL databases for a fintech company, reducing query time by 40%.
+                            Project 3: Built a predictive analytics dashboard using Python and data visualization libraries, enabling real-time decision-making for marketing campaigns.
+                    Availability: available
+
+                Match Score:
+                    Skills Match: Python (yes), Machine Learning (no), SQL (yes) → 2/3 = 0.67
+                    Experience Match: 4 years vs. 3+ years → 1.0
+                    Description match: Strong alignment in Python and SQL projects, partial alignment in machine learning responsibilities → 0.9
+                    Location Match: Willing to relocate → 0.8
+                    Availability: available → 1.0
+
+                Weighted Score:
+                    Skills (30%): 0.67 × 0.3 = 0.201
+                    Experience (20%): 1.0 × 0.2 = 0.2
+                    Description Match (30%): 0.9 × 0.3 = 0.27
+                    Location (10%): 0.8 × 0.1 = 0.08
+                    Availability (10%): 1.0 × 0.1 = 0.1
+
+                Final Match Score: 0.201 + 0.2 + 0.27 + 0.08 + 0.1 = 0.851"""
+
+SCORING_PROMPT = """Task :- To rate the match between the job description and the resume below on a scale of 0 to 1, you can follow these steps:
+
+""" + SCORING_RUBRIC + """
+
+Job Description:
+{job_description}
+
+Resume:
+{resume}
+
+Respond with only the final match score as a number between 0 and 1."""
+
+BATCH_SCORING_PROMPT = """Task :- To rate the match between the job description and each candidate resume below on a scale of 0 to 1, you can follow these steps for every candidate independently:
+
+""" + SCORING_RUBRIC + """
+
+Job Description:
+{job_description}
+
+Candidates:
+{candidates}
+
+Respond with only a JSON array containing one object per candidate, in the form
+[{{"candidate_id": "<candidate id>", "score": <final match score between 0 and 1>}}]"""
+
+# Cached scores are only reused while the prompts and scoring model stay the same
+LLM_PROMPT_VERSION = hashlib.sha256(
+    f"{LLM_SCORING_MODEL}\x00{SYSTEM_PROMPT}\x00{SCORING_PROMPT}\x00{BATCH_SCORING_PROMPT}".encode("utf-8")
+).hexdigest()[:16]
+
+_number = re.compile(r"\d*\.\d+|\d+")
+
+
+class CandidateScore(BaseModel):
+    candidate_id: Union[str, int]
+    score: float = Field(..., ge=0.0, le=1.0)
+
+
+_candidate_scores = TypeAdapter(List[CandidateScore])
+
+
+class TokenBucket:
+    """
+    Process-wide token bucket refilled continuously at rate_per_minute.
+
+    State is guarded by a thread lock rather than an asyncio lock so that the quota is shared by
+    every event loop (each scoring run may execute on its own loop).
+    """
+
+    def __init__(self, rate_per_minute: int):
+        self.capacity = float(max(rate_per_minute, 1))
+        self.fill_rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, amount: float) -> float:
+        """
+        Take amount if available and return 0, otherwise return the seconds to wait before retrying.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+            self.updated = now
+            amount = min(amount, self.capacity)
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.fill_rate
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        while (wait := self._take(amount)) > 0:
+            await asyncio.sleep(wait)
+
+
+class RateLimiter:
+    """
+    Enforces both the requests/min and tokens/min quotas of the Azure OpenAI deployment.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, tokens: int) -> None:
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+
+rate_limiter = RateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+concurrency_limiter = ConcurrencyLimiter(LLM_MAX_CONCURRENCY)
+
+
+def _async_client() -> AsyncAzureOpenAI:
+    # Retries are handled here so that they go through the rate limiter
+    return AsyncAzureOpenAI(
+        api_version=os.getenv("openai_api_version"),
+        azure_endpoint=os.getenv("azure_endpoint"),
+        api_key=os.getenv("openai_api_key"),
+        max_retries=0,
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    # Honour Retry-After when the service sends it, otherwise exponential backoff with full jitter
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_BACKOFF_MAX) + random.uniform(0, LLM_BACKOFF_BASE)
+        except ValueError:
+            pass
+    return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt))
+
+
+def parse_score(content: str) -> float:
+    """
+    Read the score from a model reply, using the last number if the model explained its working.
+
+    Raises:
+        ValueError: If the reply contains no number at all.
+    """
+    content = (content or "").strip()
+    try:
+        score = float(content)
+    except ValueError:
+        numbers = _number.findall(content)
+        if not numbers:
+            raise ValueError(f"No score in LLM reply: {content[:100]!r}")
+        score = float(numbers[-1])
+    return score if 0 <= score <= 1 else 0.0
+
+
+async def complete(client: AsyncAzureOpenAI, messages: List[dict], max_tokens: Optional[int] = None) -> str:
+    """
+    One rate-limited chat completion, retried with jittered backoff on 429, 5xx and network errors.
+    """
+    estimated_tokens = sum(count_tokens(message["content"]) for message in messages) + (max_tokens or 0)
+    async with concurrency_limiter:
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            await rate_limiter.acquire(estimated_tokens)
+            try:
+                count("llm_calls")
+                response = await client.chat.completions.create(
+                    model=LLM_SCORING_MODEL,
+                    messages=messages,
+                    temperature=0.2,
+                    max_tokens=max_tokens,
+                )
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    count("llm_prompt_tokens", getattr(usage, "prompt_tokens", 0) or 0)
+                    count("llm_completion_tokens", getattr(usage, "completion_tokens", 0) or 0)
+                return response.choices[0].message.content
+            except Exception as e:
+                if attempt >= LLM_MAX_RETRIES or not _is_retryable(e):
+                    count("llm_errors")
+                    raise
+                count("llm_retries")
+                delay = _retry_delay(e, attempt)
+                logger.warning(f"LLM call failed ({e}), retrying in {delay:.1f}s (attempt {attempt + 1}).")
+                await asyncio.sleep(delay)
+
+
+async def _score_one(client: AsyncAzureOpenAI, job_description: str, resume: str) -> Optional[float]:
+    try:
+        content = await complete(client, [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": SCORING_PROMPT.format(job_description=job_description, resume=resume)},
+        ], max_tokens=LLM_SCORE_MAX_TOKENS)
+        return parse_score(content)
+    except Exception as e:
+        logger.error(f"LLM scoring error: {e}")
+        return None
+
+
+def parse_batch_scores(content: str, candidate_ids: Sequence[str]) -> List[float]:
+    """
+    Validate a batched reply: a JSON array with exactly one score in [0, 1] per candidate id.
+
+    Raises:
+        ValueError: If the reply is not valid JSON or does not cover exactly the given candidates.
+    """
+    content = (content or "").strip()
+    start, end = content.find("["), content.rfind("]")
+    if start == -1 or end < start:
+        raise ValueError("No JSON array in batched scoring reply")
+    scores = {str(item.candidate_id): item.score for item in _candidate_scores.validate_json(content[start:end + 1])}
+    if set(scores) != set(candidate_ids):
+        raise ValueError(f"Batched scoring reply covers {sorted(scores)}, expected {sorted(candidate_ids)}")
+    return [scores[candidate_id] for candidate_id in candidate_ids]
+
+
+async def _score_batch(client: AsyncAzureOpenAI, job_description: str, resumes: Sequence[str],
+                       candidate_ids: Sequence[str]) -> List[Optional[float]]:
+    """
+    Score several candidates in one completion, falling back to one call per candidate if the
+    reply cannot be validated.
+    """
+    if len(resumes) == 1:
+        return [await _score_one(client, job_description, resumes[0])]
+    candidates = "\n\n".join(f"[candidate_id: {candidate_id}]\n{resume}"
+                              for candidate_id, resume in zip(candidate_ids, resumes))
+    try:
+        content = await complete(client, [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": BATCH_SCORING_PROMPT.format(job_description=job_description,
+                                                                    candidates=candidates)},
+        ], max_tokens=LLM_BATCH_TOKENS_PER_CANDIDATE * len(resumes) + 20)
+        return parse_batch_scores(content, candidate_ids)
+    except Exception as e:
+        logger.warning(f"Batched LLM scoring failed ({e}), scoring {len(resumes)} candidates one by one.")
+        return list(await asyncio.gather(
+            *(_score_one(client, job_description, resume) for resume in resumes)))
+
+
+async def ascore_resumes(job_description: str, resumes: List[str],
+                         candidate_ids: Optional[Sequence] = None) -> List[Optional[float]]:
+    """
+    Score all resumes concurrently (bounded by the process-wide llm_max_concurrency cap and the rate limiter),
+    llm_scoring_batch_size candidates per request.
+
+    Args:
+        job_description: JD text.
+        resumes: Candidate snippets.
+        candidate_ids: Ids the model echoes back in batched replies; defaults to positions.
+
+    Returns:
+        List[Optional[float]]: Scores from 0 to 1 in the same order as resumes; None where scoring failed.
+    """
+    if not resumes:
+        return []
+    ids = [str(candidate_id) for candidate_id in (candidate_ids if candidate_ids is not None else range(len(resumes)))]
+    size = LLM_SCORING_BATCH_SIZE
+    async with _async_client() as client:
+        batches = await asyncio.gather(*(
+            _score_batch(client, job_description, resumes[i:i + size], ids[i:i + size])
+            for i in range(0, len(resumes), size)))
+    return [score for batch in batches for score in batch]
+
+
+def score_resumes(job_description: str, resumes: List[str], candidate_ids: Optional[Sequence] = None,
+                  job_description_id: Optional[int] = None) -> List[Optional[float]]:
+    """
+    LLM scores of each resume against the job description, from 0 to 1, or None where the LLM call failed.
+
+    Pairs scored before under the same prompt version are served from the LLM score cache; failed
+    calls are not cached. candidate_ids (consultant ids) and job_description_id are recorded with
+    cached scores so edits can invalidate them.
+    """
+    ids = list(candidate_ids) if candidate_ids is not None else list(range(len(resumes)))
+    keys = [score_cache_key(job_description, resume, LLM_PROMPT_VERSION) for resume in resumes]
+    cached = get_cached_scores(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    logger.debug(f"LLM score cache: {len(resumes) - len(missing)} hits, {len(missing)} misses.")
+    count("llm_cache_hits", len(resumes) - len(missing))
+    count("llm_cache_misses", len(missing))
+
+    if missing:
+        scores = run_sync(ascore_resumes(job_description, [resumes[i] for i in missing], [ids[i] for i in missing]))
+        fresh = {}
+        for i, score in zip(missing, scores):
+            if score is not None:
+                fresh[keys[i]] = (score, job_description_id, ids[i] if candidate_ids is not None else None)
+        store_scores(fresh, LLM_PROMPT_VERSION)
+        cached.update({key: score for key, (score, _, _) in fresh.items()})
+
+    return [cached.get(key) for key in keys]
+
+
+def get_llm_similarity_scores(job_description: str, resumes: List[str],
+                              candidate_ids: Optional[Sequence] = None,
+                              job_description_id: Optional[int] = None,
+                              fallback_scores: Optional[Sequence[float]] = None) -> List[float]:
+    """
+    Uses GPT-4o to generate semantic similarity scores between job description and each resume.
+    Scores are from 0 to 1.
+
+    See score_resumes; a failed call scores fallback_scores[i] (0 when not given).
+    """
+    scores = score_resumes(job_description, resumes, candidate_ids, job_description_id)
+    fallback = list(fallback_scores) if fallback_scores is not None else [0.0] * len(scores)
+    return [default if score is None else score for score, default in zip(scores, fallback)]
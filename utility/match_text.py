@@ -0,0 +1,25 @@
+from typing import Any
+
+
+def build_jd_text(jd: Any) -> str:
+    """
+    Canonical text of a job description used for embedding and embedding-cache keys.
+    """
+    return f"{jd.title} {jd.department or ''} {jd.location or ''} {jd.experience or ''} {jd.description or ''} " \
+           f"{', '.join(jd.skills) if jd.skills else ''}"
+
+
+def build_profile_text(profile: Any) -> str:
+    """
+    Canonical text of a consultant profile used for embedding and embedding-cache keys.
+    """
+    return f"{profile.name} {', '.join(profile.skills) if profile.skills else ''} " \
+           f"{profile.experience or ''} {profile.location or ''} {profile.project or ''} {profile.availability or ''}"
+
+
+def build_candidate_snippet(profile: Any) -> str:
+    """
+    Short candidate summary sent to the LLM scorer (also part of its score-cache key).
+    """
+    return f"{profile.name}, Skills: {', '.join(profile.skills)}, " \
+           f"Experience: {profile.experience} years, Location: {profile.location}"
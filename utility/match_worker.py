@@ -0,0 +1,54 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from dotenv import load_dotenv
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# Number of match jobs executed at the same time by this API process
+MATCH_WORKER_COUNT = int(os.getenv("match_worker_count", 2))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MATCH_WORKER_COUNT, thread_name_prefix="match-worker")
+            logger.info(f"Started match worker pool with {MATCH_WORKER_COUNT} workers.")
+        return _executor
+
+
+def _log_failure(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Match job failed: {error}")
+
+
+def submit_match_job(job: Callable[..., Any], *args: Any) -> Future:
+    """
+    Run job(*args) on the match worker pool, off the request/event-loop threads.
+
+    Returns:
+        Future: Completes when the job has finished; failures are logged.
+    """
+    future = _get_executor().submit(job, *args)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def shutdown_match_workers(wait: bool = True) -> None:
+    """
+    Stop the worker pool, by default letting running jobs finish.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=not wait)
+            _executor = None
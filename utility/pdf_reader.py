@@ -0,0 +1,176 @@
+import asyncio
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Sequence, Tuple, Union
+
+from dotenv import load_dotenv
+from utility.async_utils import ConcurrencyLimiter, run_sync
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# PDF text extraction is CPU-bound, so it runs in worker processes rather than on the event loop or threads
+PDF_WORKER_COUNT = int(os.getenv("pdf_worker_count", os.cpu_count() or 1))
+# Pages extracted per task; longer documents are split across workers
+PDF_PAGES_PER_TASK = int(os.getenv("pdf_pages_per_task", 8))
+# Seconds one task may run on a worker before its document is abandoned; waiting for a free worker does not count
+PDF_EXTRACT_TIMEOUT = float(os.getenv("pdf_extract_timeout", 60))
+
+# One slot per worker process: a task is only submitted once a worker is free, so its timeout measures the
+# extraction and not the time spent queued behind other documents
+_worker_slots = ConcurrencyLimiter(PDF_WORKER_COUNT)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class PdfExtractionError(Exception):
+    """
+    A document could not be read or one of its tasks did not finish within pdf_extract_timeout.
+    """
+
+
+def _extract_page_range(data: bytes, start: int, stop: Optional[int]) -> Tuple[str, int]:
+    """
+    Worker-process task: text of pages [start, stop) of a PDF (to the end when stop is None).
+
+    Returns:
+        Tuple[str, int]: The text and the document's page count.
+    """
+    from PyPDF2 import PdfReader
+
+    pages = PdfReader(io.BytesIO(data)).pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    return "".join(pages[i].extract_text() or "" for i in range(start, stop)), len(pages)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=max(1, PDF_WORKER_COUNT))
+            logger.info(f"Started PDF extraction pool with {PDF_WORKER_COUNT} processes.")
+        return _executor
+
+
+def shutdown_pdf_workers() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _recycle_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    Kill the worker processes of a pool whose task timed out and drop it, so the next extraction starts a
+    fresh pool. Cancelling a running task does not stop it, so a hung worker would otherwise keep its slot.
+    Tasks of other documents in flight on the same pool are resubmitted by _run_task.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not executor:
+            # Already recycled by a concurrent timeout
+            return
+        _executor = None
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(1)
+        if process.is_alive():
+            process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+    logger.warning(f"Recycled the PDF extraction pool after a timeout ({len(processes)} processes killed).")
+
+
+def _recycled(executor: ProcessPoolExecutor) -> bool:
+    with _executor_lock:
+        return _executor is not executor
+
+
+def _remaining_ranges(page_count: int) -> List[Tuple[int, int]]:
+    return [(start, start + PDF_PAGES_PER_TASK) for start in range(PDF_PAGES_PER_TASK, page_count, PDF_PAGES_PER_TASK)]
+
+
+async def _run_task(data: bytes, start: int, stop: Optional[int], filename: str,
+                    timeout: float) -> Tuple[str, int]:
+    """
+    Extract one page range on a free worker, allowing it timeout seconds from when it starts. A task lost to
+    another document's timeout, which recycled the pool under it, is resubmitted to the fresh pool.
+    """
+    while True:
+        async with _worker_slots:
+            executor = _get_executor()
+            try:
+                future = executor.submit(_extract_page_range, data, start, stop)
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                _recycle_executor(executor)
+                raise PdfExtractionError(f"Timed out extracting text from {filename} after {timeout:g}s.")
+            except (asyncio.CancelledError, BrokenProcessPool, RuntimeError):
+                # Cancelled, broken or shut down by a recycle; anything else (including cancelling this task)
+                # is a real failure
+                if asyncio.current_task().cancelling() or not _recycled(executor):
+                    raise
+        logger.info(f"Resubmitting {filename} after the PDF extraction pool was recycled.")
+
+
+async def _extract_document(data: bytes, filename: str, timeout: float) -> str:
+    # The first task also reports the page count, so short documents take a single task
+    first, page_count = await _run_task(data, 0, PDF_PAGES_PER_TASK, filename, timeout)
+    tasks = [asyncio.ensure_future(_run_task(data, start, stop, filename, timeout))
+             for start, stop in _remaining_ranges(page_count)]
+    try:
+        rest = await asyncio.gather(*tasks)
+    finally:
+        # After a failure the other ranges are of no use; stop them so they free their workers
+        for task in tasks:
+            task.cancel()
+    return "".join([first, *(text for text, _ in rest)])
+
+
+async def extract_pdf_text_async(data: bytes, filename: str = "document",
+                                 timeout: float = PDF_EXTRACT_TIMEOUT) -> str:
+    """
+    Extract the text of a PDF in the worker processes without blocking the event loop.
+
+    Raises:
+        PdfExtractionError: When the PDF cannot be read or one of its tasks runs longer than timeout seconds.
+    """
+    try:
+        return await _extract_document(data, filename, timeout)
+    except PdfExtractionError:
+        raise
+    except Exception as e:
+        raise PdfExtractionError(f"Could not read {filename}: {e}") from e
+
+
+async def extract_pdf_texts(documents: Sequence[Tuple[str, bytes]],
+                            timeout: float = PDF_EXTRACT_TIMEOUT) -> List[Union[str, PdfExtractionError]]:
+    """
+    Extract several PDFs concurrently, each task with its own timeout.
+
+    Args:
+        documents: (filename, raw bytes) pairs.
+        timeout: Seconds each extraction task may run once it has a worker.
+
+    Returns:
+        List[Union[str, PdfExtractionError]]: Per document, in order, its text or the error it failed with.
+    """
+    return await asyncio.gather(*(extract_pdf_text_async(data, filename, timeout) for filename, data in documents),
+                                return_exceptions=True)
+
+
+def extract_pdf_text(data: bytes, filename: str = "document", timeout: float = PDF_EXTRACT_TIMEOUT) -> str:
+    """
+    Synchronous extract_pdf_text_async for worker and CLI code.
+
+    Raises:
+        PdfExtractionError: When the PDF cannot be read or one of its tasks runs longer than timeout seconds.
+    """
+    return run_sync(extract_pdf_text_async(data, filename, timeout))
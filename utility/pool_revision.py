@@ -0,0 +1,39 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from model.MatchPoolRevision import MatchPoolRevision
+import logging
+
+logger = logging.getLogger(__name__)
+
+_ROW_ID = 1
+
+
+def current_pool_revision(db: Session) -> int:
+    """
+    Revision of the consultant pool: a counter bumped in the same transaction as every consultant change, so
+    match freshness checks read one row instead of the whole pool.
+    """
+    revision = db.query(MatchPoolRevision.revision).filter(MatchPoolRevision.id == _ROW_ID).scalar()
+    return revision or 0
+
+
+def bump_pool_revision(db: Session, changes: int = 1) -> int:
+    """
+    Count changes to the consultant pool in the caller's transaction (the row stays locked until it commits,
+    so concurrent writers get consecutive revisions).
+
+    Returns:
+        int: The new revision; the changes are numbered revision - changes + 1 .. revision.
+    """
+    updated = db.query(MatchPoolRevision).filter(MatchPoolRevision.id == _ROW_ID).update(
+        {MatchPoolRevision.revision: MatchPoolRevision.revision + changes}, synchronize_session=False)
+    if not updated:
+        try:
+            with db.begin_nested():
+                db.add(MatchPoolRevision(id=_ROW_ID, revision=changes))
+        except IntegrityError:
+            # Another writer created the row first
+            db.query(MatchPoolRevision).filter(MatchPoolRevision.id == _ROW_ID).update(
+                {MatchPoolRevision.revision: MatchPoolRevision.revision + changes}, synchronize_session=False)
+    return current_pool_revision(db)
@@ -0,0 +1,409 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Iterable, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from dotenv import load_dotenv
+
+from db.database import sessionLocal
+from model.ConsultantEnum import ConsultantEnum
+from model.ConsultantProfile import ConsultantProfile
+from utility.embedding_cache import cache_key, load_embeddings_by_key
+from utility.embeddings import get_backend, get_embeddings
+from utility.faiss_indexes import (PROFILE_INDEX_TYPE, can_train, create_index, needs_training, set_search_params,
+                                   supports_remove, train_index)
+from utility.match_text import build_profile_text
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+PROFILE_INDEX_PATH = os.getenv("profile_index_path", "data/profile_index.faiss")
+# Rebuild once tombstoned (deleted-but-still-stored) entries exceed this share of the pool
+PROFILE_INDEX_TOMBSTONE_RATIO = float(os.getenv("profile_index_tombstone_ratio", 0.2))
+# Retrain IVF-PQ once the pool has grown this many times past its training size
+IVF_RETRAIN_GROWTH = float(os.getenv("ivf_retrain_growth", 2.0))
+# Vectors compared per block of an exact search
+_EXACT_SEARCH_CHUNK = 4096
+
+
+def is_matchable(profile: Any) -> bool:
+    """
+    Whether a consultant belongs in the matching pool (everyone except unavailable consultants).
+    """
+    return profile.availability != ConsultantEnum.unavailable
+
+
+class ProfileIndex:
+    """
+    Long-lived FAISS index of the consultant pool, keyed by ConsultantProfile.id.
+
+    Alongside the vectors the index remembers the content hash each profile was embedded from,
+    so sync() only re-embeds profiles whose text changed since they were indexed. Vectors are
+    stored under internal labels mapped to profile ids, which lets index types without deletion
+    support (HNSW) tombstone replaced entries until the next rebuild. Rebuilds re-read vectors
+    from the embedding cache by content hash, so the index never needs a second copy of them.
+    """
+
+    def __init__(self, path: str = PROFILE_INDEX_PATH, index_type: str = PROFILE_INDEX_TYPE):
+        self.path = path
+        self.index_type = index_type  # configured type
+        self.active_type: Optional[str] = None  # built type; ivfpq runs as flat until the pool is trainable
+        self.model_name: Optional[str] = None
+        self._index: Optional[faiss.Index] = None
+        self._hashes: dict = {}  # profile id -> content hash
+        self._labels: dict = {}  # profile id -> faiss label
+        self._owners: dict = {}  # faiss label -> profile id, live entries only
+        self._next_label = 0
+        self._tombstones = 0
+        self._trained_size = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hashes)
+
+    def __contains__(self, profile_id: int) -> bool:
+        with self._lock:
+            return int(profile_id) in self._hashes
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self._index.d if self._index is not None else None
+
+    def _reset(self) -> None:
+        self._index, self.active_type = None, None
+        self._hashes, self._labels, self._owners = {}, {}, {}
+        self._next_label, self._tombstones, self._trained_size = 0, 0, 0
+        self._dirty = True
+
+    def _build(self, vectors: np.ndarray, index_type: str) -> None:
+        """
+        Replace the faiss index with a fresh one of index_type, trained on vectors when required.
+        """
+        active_type = index_type if can_train(index_type, len(vectors)) else "flat"
+        if active_type != index_type:
+            logger.info(f"Pool of {len(vectors)} profiles is too small to train {index_type}, using flat for now.")
+        index = create_index(active_type, vectors.shape[1], len(vectors))
+        if needs_training(active_type):
+            train_index(index, vectors)
+            self._trained_size = len(vectors)
+        self._index, self.active_type = index, active_type
+
+    def _retire(self, labels: List[int]) -> None:
+        if not labels:
+            return
+        for label in labels:
+            self._owners.pop(label, None)
+        if supports_remove(self.active_type):
+            self._index.remove_ids(np.asarray(labels, dtype='int64'))
+        else:
+            self._tombstones += len(labels)
+
+    def _needs_rebuild(self) -> bool:
+        live = len(self._hashes)
+        if self._tombstones > max(PROFILE_INDEX_TOMBSTONE_RATIO * live, 100):
+            return True
+        if self.index_type != self.active_type and can_train(self.index_type, live):
+            return True
+        return needs_training(self.active_type) and live > IVF_RETRAIN_GROWTH * max(self._trained_size, 1)
+
+    def _upsert_vectors(self, ids: List[int], vectors: np.ndarray, hashes: List[str]) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype='float32')
+        if self._index is None or self._index.d != vectors.shape[1]:
+            self._reset()
+            self._build(vectors, self.index_type)
+        self._retire([self._labels[profile_id] for profile_id in ids if profile_id in self._labels])
+        labels = np.arange(self._next_label, self._next_label + len(ids), dtype='int64')
+        self._index.add_with_ids(vectors, labels)
+        self._next_label += len(ids)
+        for profile_id, label, content_hash in zip(ids, labels.tolist(), hashes):
+            self._labels[profile_id] = label
+            self._owners[label] = profile_id
+            self._hashes[profile_id] = content_hash
+        self._dirty = True
+        if self._needs_rebuild():
+            self.rebuild()
+
+    def upsert(self, profiles: Iterable[Any]) -> int:
+        """
+        Add or replace the given profiles in the index, embedding only profiles whose text changed.
+
+        Returns:
+            int: Number of profiles that were (re-)indexed.
+        """
+        backend = get_backend()
+        profiles = list(profiles)
+        texts = [build_profile_text(profile) for profile in profiles]
+        hashes = [cache_key(text, backend.model_name) for text in texts]
+        with self._lock:
+            if self.model_name != backend.model_name:
+                self._reset()
+                self.model_name = backend.model_name
+            changed = [i for i, (profile, content_hash) in enumerate(zip(profiles, hashes))
+                       if self._hashes.get(int(profile.id)) != content_hash]
+        if not changed:
+            return 0
+        vectors = get_embeddings([texts[i] for i in changed])
+        with self._lock:
+            self._upsert_vectors([int(profiles[i].id) for i in changed], vectors, [hashes[i] for i in changed])
+        logger.debug(f"Indexed {len(changed)} consultant profiles.")
+        return len(changed)
+
+    def remove(self, profile_ids: Iterable[int]) -> None:
+        ids = [int(profile_id) for profile_id in profile_ids]
+        with self._lock:
+            ids = [profile_id for profile_id in ids if profile_id in self._hashes]
+            if not ids or self._index is None:
+                return
+            self._retire([self._labels.pop(profile_id) for profile_id in ids])
+            for profile_id in ids:
+                self._hashes.pop(profile_id, None)
+            self._dirty = True
+            if self._needs_rebuild():
+                self.rebuild()
+
+    def sync(self, profiles: Iterable[Any]) -> int:
+        """
+        Make the index hold exactly the given pool: upsert changed profiles and drop everyone else.
+        """
+        profiles = list(profiles)
+        changed = self.upsert(profiles)
+        keep = {int(profile.id) for profile in profiles}
+        with self._lock:
+            stale = [profile_id for profile_id in self._hashes if profile_id not in keep]
+        self.remove(stale)
+        return changed + len(stale)
+
+    def rebuild(self, index_type: Optional[str] = None) -> None:
+        """
+        Rebuild (and for ivfpq retrain) the index from cached vectors, dropping tombstones.
+
+        Args:
+            index_type: Switch to this index type; defaults to the configured one.
+        """
+        with self._lock:
+            if index_type:
+                self.index_type = index_type
+            cached = load_embeddings_by_key(list(self._hashes.values()))
+            ids = [profile_id for profile_id, content_hash in self._hashes.items() if content_hash in cached]
+            missing = len(self._hashes) - len(ids)
+            if missing:
+                # Dropped profiles are re-embedded by the next upsert/sync
+                logger.warning(f"{missing} indexed profiles have no cached vector and were dropped from the index.")
+            hashes = {profile_id: self._hashes[profile_id] for profile_id in ids}
+            self._reset()
+            self._hashes = hashes
+            if not ids:
+                return
+            vectors = np.ascontiguousarray(np.vstack([cached[hashes[profile_id]] for profile_id in ids]),
+                                           dtype='float32')
+            self._build(vectors, self.index_type)
+            labels = np.arange(len(ids), dtype='int64')
+            self._index.add_with_ids(vectors, labels)
+            self._next_label = len(ids)
+            self._labels = dict(zip(ids, labels.tolist()))
+            self._owners = dict(zip(labels.tolist(), ids))
+        logger.info(f"Rebuilt profile index as {self.active_type} with {len(ids)} profiles.")
+
+    def set_search_params(self, ef_search: Optional[int] = None, nprobe: Optional[int] = None) -> None:
+        """
+        Tune recall/latency at query time: efSearch for HNSW, nprobe for IVF-PQ.
+        """
+        with self._lock:
+            if self._index is not None:
+                set_search_params(self._index, ef_search=ef_search, nprobe=nprobe)
+
+    def distances(self, vector: np.ndarray, profile_ids: Iterable[int]) -> dict:
+        """
+        Exact squared L2 distances from vector to the given indexed profiles, computed from their cached
+        vectors. Profiles that are not indexed (or have no cached vector) are left out.
+
+        Returns:
+            dict: profile id -> squared L2 distance.
+        """
+        with self._lock:
+            hashes = {int(profile_id): self._hashes[int(profile_id)] for profile_id in profile_ids
+                      if int(profile_id) in self._hashes}
+        query = np.asarray(vector, dtype='float32').reshape(-1)
+        ids = list(hashes)
+        results = {}
+        for start in range(0, len(ids), _EXACT_SEARCH_CHUNK):
+            chunk = ids[start:start + _EXACT_SEARCH_CHUNK]
+            cached = load_embeddings_by_key([hashes[profile_id] for profile_id in chunk])
+            chunk = [profile_id for profile_id in chunk if hashes[profile_id] in cached]
+            if not chunk:
+                continue
+            vectors = np.vstack([cached[hashes[profile_id]] for profile_id in chunk])
+            results.update(zip(chunk, np.sum((vectors - query) ** 2, axis=1).tolist()))
+        if len(results) < len(ids):
+            logger.warning(f"{len(ids) - len(results)} indexed profiles have no cached vector to score exactly.")
+        return results
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """
+        Return up to k (profile id, squared L2 distance) pairs closest to vector, nearest first.
+
+        With an approximate index, a k covering the whole pool is answered by an exact scan, since HNSW and
+        IVF-PQ cannot return most of the pool for one query. Callers are expected to ask for a bounded k.
+        """
+        with self._lock:
+            if self._index is None or not self._hashes or k <= 0:
+                return []
+            exact = self.active_type != "flat" and k >= len(self._hashes)
+            ids = list(self._hashes) if exact else None
+        if exact:
+            results = sorted(self.distances(vector, ids).items(), key=lambda item: (item[1], item[0]))
+            return results[:k]
+        with self._lock:
+            if self._index is None or not self._hashes:
+                return []
+            query = np.ascontiguousarray(np.asarray(vector, dtype='float32').reshape(1, -1))
+            # Over-fetch by the number of tombstones so dead entries cannot crowd out live ones
+            fetch = min(k + self._tombstones, self._index.ntotal)
+            distances, labels = self._index.search(query, fetch)
+            results = [(self._owners[label], float(distance))
+                       for label, distance in zip(labels[0].tolist(), distances[0]) if label in self._owners]
+        return results[:k]
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write the index and its metadata as one file, replaced atomically: the API, the job worker and the
+        bulk ingest share the path, and a reader must never pair one process's vectors with another's labels.
+        Each writer writes its own temporary file first, so concurrent saves cannot interleave; the last one
+        wins.
+        """
+        path = path or self.path
+        with self._lock:
+            if self._index is None:
+                return
+            metadata = {
+                "model_name": self.model_name,
+                "index_type": self.index_type,
+                "active_type": self.active_type,
+                "hashes": self._hashes,
+                "labels": self._labels,
+                "next_label": self._next_label,
+                "tombstones": self._tombstones,
+                "trained_size": self._trained_size,
+                "ntotal": int(self._index.ntotal),
+            }
+            index_bytes = faiss.serialize_index(self._index)
+            self._dirty = False
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as index_file:
+                np.savez(index_file, index=index_bytes,
+                         meta=np.frombuffer(json.dumps(metadata).encode("utf-8"), dtype=np.uint8))
+                index_file.flush()
+                os.fsync(index_file.fileno())
+            os.replace(temporary, path)
+        except BaseException:
+            self._dirty = True
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        logger.info(f"Saved profile index with {len(metadata['hashes'])} profiles to {path}.")
+
+    def save_if_dirty(self) -> None:
+        if self._dirty:
+            self.save()
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """
+        Load a saved index, rejecting files that are unreadable (e.g. the old two-file format) or whose vector
+        count does not match their labels.
+
+        Returns:
+            bool: Whether the index was loaded; when False the caller re-syncs it from the database.
+        """
+        path = path or self.path
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path) as saved:
+                index = faiss.deserialize_index(saved["index"])
+                metadata = json.loads(saved["meta"].tobytes().decode("utf-8"))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable profile index {path}: {e}")
+            return False
+        labels = {int(profile_id): int(label) for profile_id, label in metadata.get("labels", {}).items()}
+        hashes = {int(profile_id): content_hash for profile_id, content_hash in metadata.get("hashes", {}).items()}
+        tombstones = metadata.get("tombstones", 0)
+        if index.ntotal != metadata.get("ntotal") or index.ntotal != len(labels) + tombstones \
+                or set(labels) != set(hashes):
+            logger.warning(f"Profile index {path} holds {index.ntotal} vectors for {len(labels)} labels and "
+                           f"{tombstones} tombstones, rebuilding it.")
+            return False
+        with self._lock:
+            self._index = index
+            self.model_name = metadata.get("model_name")
+            self.active_type = metadata.get("active_type", "flat")
+            self._hashes = hashes
+            self._labels = labels
+            self._owners = {label: profile_id for profile_id, label in labels.items()}
+            self._next_label = metadata.get("next_label", len(labels))
+            self._tombstones = tombstones
+            self._trained_size = metadata.get("trained_size", 0)
+            self._dirty = False
+            set_search_params(self._index)
+            if metadata.get("index_type") != self.index_type:
+                logger.info(f"Profile index type changed to {self.index_type}, rebuilding.")
+                self.rebuild()
+        logger.info(f"Loaded profile index with {len(self)} profiles from {path}.")
+        return True
+
+
+# Process-wide index shared by the matching flow and the consultant CRUD hooks
+profile_index = ProfileIndex()
+
+
+def load_profile_index() -> None:
+    """
+    Load the profile index from disk and reconcile it with the consultant_profiles table.
+    """
+    try:
+        profile_index.load()
+    except Exception as e:
+        logger.error(f"Could not load the profile index from disk, rebuilding it: {e}")
+    db = sessionLocal()
+    try:
+        profiles = db.query(ConsultantProfile).filter(
+            ConsultantProfile.availability != ConsultantEnum.unavailable).all()
+        changed = profile_index.sync(profiles)
+        logger.info(f"Profile index reconciled with the database ({changed} changes).")
+    finally:
+        db.close()
+    profile_index.save_if_dirty()
+
+
+def index_profile(profile: Any) -> None:
+    """
+    Keep the index in step with a created or edited consultant; unavailable consultants are removed.
+    """
+    index_profiles([profile])
+
+
+def index_profiles(profiles: Iterable[Any]) -> None:
+    """
+    index_profile for many consultants at once, embedding the changed ones in one batch.
+    """
+    profiles = list(profiles)
+    try:
+        profile_index.upsert([profile for profile in profiles if is_matchable(profile)])
+        profile_index.remove([profile.id for profile in profiles if not is_matchable(profile)])
+    except Exception as e:
+        logger.error(f"Error occurred while indexing consultant profiles {[profile.id for profile in profiles]}: {e}")
+
+
+def unindex_profile(profile_id: int) -> None:
+    try:
+        profile_index.remove([profile_id])
+    except Exception as e:
+        logger.error(f"Error occurred while removing consultant profile {profile_id} from the index: {e}")
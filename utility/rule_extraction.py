@@ -0,0 +1,312 @@
+import hashlib
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+from dotenv import load_dotenv
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# Fill fields with the deterministic rules below before asking the LLM; off sends every field to the LLM
+RULE_EXTRACTION_ENABLED = os.getenv("rule_extraction_enabled", "true").lower() in ("1", "true", "yes")
+# Optional newline-separated files extending the built-in skill and location vocabularies
+SKILL_VOCABULARY_FILE = os.getenv("skill_vocabulary_file")
+LOCATION_VOCABULARY_FILE = os.getenv("location_vocabulary_file")
+
+# Bump when the rules change so cached extractions made with the old rules are not reused
+_RULES_REVISION = "3"
+
+DEFAULT_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Ruby", "PHP", "Scala", "Kotlin",
+    "Swift", "MATLAB", "Perl", "Bash", "PowerShell", "SQL", "NoSQL", "PL/SQL", "T-SQL", "HTML", "CSS", "SASS",
+    "React", "Angular", "Vue.js", "Next.js", "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring",
+    "Spring Boot", "Hibernate", ".NET", "ASP.NET", "Ruby on Rails", "Laravel", "GraphQL", "REST", "gRPC",
+    "PostgreSQL", "MySQL", "SQL Server", "Oracle", "MongoDB", "Redis", "Cassandra", "Elasticsearch", "DynamoDB",
+    "SQLite", "Snowflake", "BigQuery", "Databricks", "Spark", "PySpark", "Hadoop", "Kafka", "RabbitMQ", "Airflow",
+    "dbt", "Tableau", "Power BI", "Excel", "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Ansible",
+    "Jenkins", "GitHub Actions", "GitLab CI", "CI/CD", "Git", "Linux", "Microservices", "DevOps",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "TensorFlow", "PyTorch", "Keras",
+    "scikit-learn", "Pandas", "NumPy", "LangChain", "LangGraph", "LLM", "OpenAI", "Generative AI", "Data Science",
+    "Data Engineering", "ETL", "Selenium", "Cypress", "JUnit", "pytest", "Jira", "Agile", "Scrum", "SAP",
+    "Salesforce", "ServiceNow", "Figma", "Android", "iOS", "Flutter", "React Native",
+]
+
+DEFAULT_LOCATIONS = [
+    "Bangalore", "Bengaluru", "Hyderabad", "Pune", "Chennai", "Mumbai", "New Delhi", "Delhi", "Noida", "Gurgaon",
+    "Gurugram", "Kolkata", "Ahmedabad", "Kochi", "Jaipur", "Coimbatore", "London", "Manchester", "Dublin", "Berlin",
+    "Munich", "Amsterdam", "Paris", "New York", "San Francisco", "Seattle", "Chicago", "Boston",
+    "Toronto", "Vancouver", "Singapore", "Dubai", "Sydney", "Melbourne",
+]
+
+# Key of an extractor's result holding hints: values found by vocabulary scan that are not complete enough to
+# skip the LLM. The field is still asked of the LLM and the hint is merged into its answer.
+HINTS = "hints"
+
+# Label (lowercase, as written in the document) -> field it fills
+RESUME_LABELS = {
+    "name": "name", "full name": "name", "candidate name": "name",
+    "email": "email", "e-mail": "email", "email id": "email", "email address": "email",
+    "skills": "skills", "key skills": "skills", "technical skills": "skills", "core skills": "skills",
+    "skill set": "skills", "skillset": "skills", "technologies": "skills", "tech stack": "skills",
+    "total experience": "experience", "years of experience": "experience", "experience": "experience",
+    "location": "location", "current location": "location", "city": "location", "based in": "location",
+    "project": "project", "projects": "project", "project details": "project", "past projects": "project",
+    "key projects": "project",
+}
+JOB_DESCRIPTION_LABELS = {
+    "title": "title", "job title": "title", "position": "title", "role": "title", "designation": "title",
+    "department": "department", "team": "department", "business unit": "department",
+    "location": "location", "job location": "location", "work location": "location",
+    "experience": "experience", "experience required": "experience", "required experience": "experience",
+    "skills": "skills", "required skills": "skills", "skills required": "skills", "key skills": "skills",
+    "technical skills": "skills", "mandatory skills": "skills", "tech stack": "skills",
+    "description": "description", "job description": "description", "summary": "description",
+    "about the role": "description", "overview": "description",
+}
+# Fields whose section may span several lines; the others take the text on the label's line
+_MULTILINE_FIELDS = {"skills", "project", "description"}
+# Headings that fill no field but end the section before them
+_OTHER_HEADINGS = {"summary", "objective", "profile", "education", "certifications", "certificates", "achievements",
+                   "awards", "languages", "hobbies", "interests", "contact", "references", "personal details",
+                   "work experience", "professional experience", "employment history", "work history",
+                   "responsibilities", "key responsibilities", "qualifications", "requirements", "benefits",
+                   "about us", "what we offer", "nice to have"}
+# Common English words among the skills: matched only with their exact capitalization
+_AMBIGUOUS_SKILLS = {"go", "excel", "rest", "spring", "express", "swift", "rust", "ruby", "oracle", "spark", "agile",
+                     "scrum", "git", "figma", "flutter"}
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_LABEL_LINE = re.compile(r"^\s*[-*•]?\s*([A-Za-z][A-Za-z /&-]{0,30}?)\s*(?::|\s[-–]\s)\s*(.*)$")
+_HEADING_LINE = re.compile(r"^\s*([A-Za-z][A-Za-z /&-]{0,30}?)\s*:?\s*$")
+# Years need an explicit unit, and digits that belong to a date ("12/2018", "2018") are never read as years:
+# an "Experience" heading is often a dated work history rather than a total
+_YEARS_OF_EXPERIENCE = re.compile(
+    r"(?<![\d/.])(\d{1,2})(?:\.\d+)?\s*\+?\s*(?:years?|yrs?)\.?\s+(?:of\s+)?(?:[\w-]+\s+){0,3}?experience",
+    re.IGNORECASE)
+_LEADING_YEARS = re.compile(r"^\s*(\d{1,2})(?:\.\d+)?\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+_EXPERIENCE_RANGE = re.compile(
+    r"\b(\d{1,2}\s*(?:\+|(?:-|–|to)\s*\d{1,2})?\s*(?:years?|yrs?))\b(?:\s+of)?(?:\s+[\w-]+){0,3}?\s+experience",
+    re.IGNORECASE)
+_LIST_SEPARATORS = re.compile(r"[,;|•\n]|\s[-–]\s|^\s*[-*]\s*", re.MULTILINE)
+_NAME_WORD = re.compile(r"^[A-Z][A-Za-z.'-]*$")
+# First-line words that mark a heading or job title rather than a person's name
+_NOT_NAME_WORDS = {"resume", "curriculum", "vitae", "cv", "profile", "summary", "engineer", "developer",
+                   "manager", "consultant", "analyst", "architect", "senior", "lead", "software", "data"}
+
+
+def _load_vocabulary(defaults: List[str], path: Optional[str]) -> List[str]:
+    terms = list(defaults)
+    if path:
+        try:
+            with open(path, encoding="utf-8") as vocabulary_file:
+                terms.extend(line.strip() for line in vocabulary_file if line.strip())
+        except OSError as e:
+            logger.error(f"Could not read vocabulary file {path}: {e}")
+    # Canonical spelling by lowercase term; later entries override the defaults
+    return list({term.lower(): term for term in terms}.values())
+
+
+def _vocabulary_pattern(terms: Iterable[str], ignore_case: bool) -> re.Pattern:
+    # Longest first so "Spring Boot" wins over "Spring"; the boundaries keep "Java" from matching in "JavaScript"
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) or r"(?!)"
+    return re.compile(rf"(?<![\w+#./-])(?:{alternatives})(?![\w+#]|\.\w)", re.IGNORECASE if ignore_case else 0)
+
+
+def _is_ambiguous(skill: str) -> bool:
+    return len(skill) <= 3 or skill.lower() in _AMBIGUOUS_SKILLS
+
+
+SKILL_VOCABULARY = _load_vocabulary(DEFAULT_SKILLS, SKILL_VOCABULARY_FILE)
+LOCATION_VOCABULARY = _load_vocabulary(DEFAULT_LOCATIONS, LOCATION_VOCABULARY_FILE)
+# Abbreviations and everyday words must match exactly ("SQL", "Go"); the other skills in any case
+_SKILL_PATTERNS = [_vocabulary_pattern([skill for skill in SKILL_VOCABULARY if not _is_ambiguous(skill)], True),
+                   _vocabulary_pattern([skill for skill in SKILL_VOCABULARY if _is_ambiguous(skill)], False)]
+_LOCATION_PATTERN = _vocabulary_pattern(LOCATION_VOCABULARY, False)
+_CANONICAL_SKILLS = {term.lower(): term for term in SKILL_VOCABULARY}
+_CANONICAL_LOCATIONS = {term.lower(): term for term in LOCATION_VOCABULARY}
+
+# Part of the readers' EXTRACTOR_VERSION: changes whenever the rules or vocabularies do
+RULES_VERSION = hashlib.sha256("\x00".join(
+    [_RULES_REVISION, str(RULE_EXTRACTION_ENABLED), *SKILL_VOCABULARY, "\x01",
+     *LOCATION_VOCABULARY]).encode("utf-8")).hexdigest()[:16]
+
+
+def _clean(value: str) -> str:
+    return " ".join(value.split()).strip(" -–:,;")
+
+
+def labelled_sections(text: str, labels: Dict[str, str]) -> Dict[str, str]:
+    """
+    Values of "Label: value" lines and "Label" headings of a document, keyed by the field they fill.
+    Multi-line fields run until the next known label; the first occurrence of a field wins.
+    """
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in text.splitlines():
+        heading = _LABEL_LINE.match(line) or _HEADING_LINE.match(line)
+        label = " ".join(heading.group(1).lower().split()) if heading else None
+        field = labels.get(label)
+        if field is None and label is not None and (label in _OTHER_HEADINGS or line.rstrip().endswith(":")):
+            current = None
+            continue
+        if field is not None:
+            current = field if field not in sections else None
+            if current is not None:
+                sections[current] = [heading.group(2)] if heading.lastindex == 2 else []
+            continue
+        if current is None:
+            continue
+        if not line.strip() and current not in _MULTILINE_FIELDS:
+            current = None
+        elif current in _MULTILINE_FIELDS or not "".join(sections[current]).strip():
+            sections[current].append(line)
+        else:
+            current = None
+    return {field: "\n".join(lines).strip() for field, lines in sections.items() if "".join(lines).strip()}
+
+
+def split_list(value: str) -> List[str]:
+    """
+    Items of a comma/semicolon/pipe/bullet separated list, de-duplicated case-insensitively in order.
+    A "Languages: Python, Java" line contributes its items, not its label.
+    """
+    items = {}
+    for item in _LIST_SEPARATORS.split(value):
+        item = _clean(item.split(":", 1)[-1])
+        if item and len(item) <= 50:
+            items.setdefault(item.lower(), item)
+    return list(items.values())
+
+
+def vocabulary_skills(text: str) -> List[str]:
+    skills = {}
+    for pattern in _SKILL_PATTERNS:
+        for match in pattern.findall(text):
+            skills.setdefault(match.lower(), _CANONICAL_SKILLS[match.lower()])
+        # "Spring Boot" found by the first pattern must not also count as "Spring"
+        text = pattern.sub(" ", text)
+    return list(skills.values())
+
+
+def vocabulary_location(text: str) -> Optional[str]:
+    """
+    The known location mentioned in text, when exactly one distinct location is.
+    """
+    found = {_CANONICAL_LOCATIONS[match.lower()] for match in _LOCATION_PATTERN.findall(text)}
+    if "Bengaluru" in found and "Bangalore" in found:
+        found.discard("Bengaluru")
+    return found.pop() if len(found) == 1 else None
+
+
+def _skills(sections: Dict[str, str], text: str, found: dict) -> None:
+    # Only a labelled skills section is complete; skills found by vocabulary scan miss any skill outside the
+    # vocabulary, so they are a hint for the LLM rather than the answer
+    skills = split_list(sections["skills"]) if "skills" in sections else []
+    if skills:
+        found["skills"] = skills
+        return
+    skills = vocabulary_skills(text)
+    if skills:
+        found.setdefault(HINTS, {})["skills"] = skills
+
+
+def _location(sections: Dict[str, str], text: str) -> Optional[str]:
+    if "location" in sections:
+        return _clean(sections["location"])[:100] or None
+    return vocabulary_location(text)
+
+
+def _first_line_name(text: str) -> Optional[str]:
+    first_line = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    words = first_line.split()
+    if 2 <= len(words) <= 4 and all(_NAME_WORD.match(word) for word in words) \
+            and not {word.lower().strip(".") for word in words} & _NOT_NAME_WORDS:
+        return first_line
+    return None
+
+
+def _truncate(value: str, limit: int) -> str:
+    value = _clean(value)
+    if len(value) <= limit:
+        return value
+    return value[:limit].rsplit(" ", 1)[0].rstrip(" ,;:-")
+
+
+def extract_resume_fields(text: str) -> dict:
+    """
+    Resume fields that can be read without the LLM: labelled fields, the email address, years of
+    experience and a single known location. Skills come from a labelled section, or else are only hinted
+    from the skill vocabulary.
+
+    Args:
+        text: Extracted resume text.
+
+    Returns:
+        dict: The fields found (ExtractedInfo names) and any HINTS; fields not found are absent.
+    """
+    sections = labelled_sections(text, RESUME_LABELS)
+    found = {}
+
+    name = _clean(sections.get("name", "")) or _first_line_name(text)
+    if name and len(name) <= 255:
+        found["name"] = name
+
+    email = _EMAIL.search(sections.get("email", "")) or _EMAIL.search(text)
+    if email:
+        found["email"] = email.group(0)
+
+    _skills(sections, text, found)
+
+    years = _LEADING_YEARS.match(sections.get("experience", "")) or _YEARS_OF_EXPERIENCE.search(text)
+    if years:
+        found["experience"] = int(years.group(1))
+
+    location = _location(sections, text)
+    if location:
+        found["location"] = location
+
+    project = _clean(sections.get("project", ""))
+    if len(project) >= 10:
+        found["project"] = project
+    return found
+
+
+def extract_job_description_fields(text: str) -> dict:
+    """
+    Job description fields that can be read without the LLM: labelled fields, the required experience and
+    a single known location. Skills come from a labelled section, or else are only hinted from the skill
+    vocabulary.
+
+    Args:
+        text: Extracted job description text.
+
+    Returns:
+        dict: The fields found (JobDescriptionRequest names) and any HINTS; fields not found are absent.
+    """
+    sections = labelled_sections(text, JOB_DESCRIPTION_LABELS)
+    found = {}
+
+    for field, limit in (("title", 255), ("department", 100)):
+        value = _clean(sections.get(field, ""))
+        if value and len(value) <= limit:
+            found[field] = value
+
+    _skills(sections, text, found)
+
+    experience = _clean(sections.get("experience", ""))
+    if not experience:
+        match = _EXPERIENCE_RANGE.search(text)
+        experience = _clean(match.group(1)) if match else ""
+    if experience:
+        found["experience"] = _truncate(experience, 100)
+
+    location = _location(sections, text)
+    if location:
+        found["location"] = location
+
+    description = _truncate(sections.get("description", ""), 100)
+    if description:
+        found["description"] = description
+    return found
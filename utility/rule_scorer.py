@@ -0,0 +1,250 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+from model.ConsultantEnum import ConsultantEnum
+from utility.lru_cache import LRUCache
+import logging
+
+logger = logging.getLogger(__name__)
+load_dotenv()
+
+# Same weights as the LLM scoring rubric: skills 30%, experience 20%, description 30%, location 10%,
+# availability 10%
+RULE_WEIGHTS = {
+    "skills": 0.3,
+    "experience": 0.2,
+    "description": 0.3,
+    "location": 0.1,
+    "availability": 0.1,
+}
+
+AVAILABILITY_SCORES = {
+    ConsultantEnum.available.value: 1.0,
+    ConsultantEnum.busy.value: 0.5,
+    ConsultantEnum.unavailable.value: 0.0,
+}
+
+# Experience fit given to consultants with no recorded experience
+UNKNOWN_EXPERIENCE_SCORE = float(os.getenv("rule_unknown_experience_score", 0.5))
+# Feature sets kept for reuse, one per scored pool or pool chunk
+RULE_FEATURE_CACHE_SIZE = int(os.getenv("rule_feature_cache_size", 64))
+# Distinct skills the shared vocabulary may hold before it is rebuilt from the pools scored after that
+RULE_VOCABULARY_MAX_SIZE = int(os.getenv("rule_vocabulary_max_size", 50000))
+
+_YEARS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
+_REMOTE_PATTERN = re.compile(r"\b(remote|anywhere)\b")
+
+
+def normalize_term(value: Any) -> str:
+    return " ".join(str(value).lower().split()) if value is not None else ""
+
+
+def parse_required_experience(experience: Optional[str]) -> Optional[float]:
+    """
+    Minimum years of experience of a JD experience field such as "3+ years" or "3-5 years".
+
+    Returns:
+        The first number in the text, or None when the JD does not state a requirement.
+    """
+    if not experience:
+        return None
+    match = _YEARS_PATTERN.search(str(experience))
+    return float(match.group(1)) if match else None
+
+
+class SkillVocabulary:
+    """
+    Grows-only mapping of normalized skill names to dense integer ids. ProfileFeatures keep the vocabulary they
+    were built with, so RuleScorer can swap in a fresh one once it grows past rule_vocabulary_max_size.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def id_of(self, skill: str) -> Optional[int]:
+        return self._ids.get(normalize_term(skill))
+
+    def encode(self, skills: Optional[Sequence[str]]) -> List[int]:
+        """
+        Sorted unique ids of skills, adding unseen skills to the vocabulary.
+        """
+        ids = set()
+        with self._lock:
+            for skill in skills or []:
+                term = normalize_term(skill)
+                if not term:
+                    continue
+                if term not in self._ids:
+                    self._ids[term] = len(self._ids)
+                ids.add(self._ids[term])
+        return sorted(ids)
+
+
+class ProfileFeatures:
+    """
+    Column arrays of a consultant pool, precomputed once so scoring a JD is pure NumPy.
+
+    Skills are held as a CSR-style sparse matrix (skill_indptr/skill_indices) of skill ids, one row per
+    profile in the order of profile_ids.
+    """
+
+    def __init__(self, profiles: Sequence[Any], vocabulary: SkillVocabulary):
+        n_profiles = len(profiles)
+        self.vocabulary = vocabulary
+        self.profile_ids = np.fromiter((int(profile.id) for profile in profiles), dtype=np.int64, count=n_profiles)
+
+        rows = [vocabulary.encode(profile.skills) for profile in profiles]
+        self.skill_counts = np.fromiter((len(row) for row in rows), dtype=np.int64, count=n_profiles)
+        self.skill_indptr = np.zeros(n_profiles + 1, dtype=np.int64)
+        np.cumsum(self.skill_counts, out=self.skill_indptr[1:])
+        self.skill_indices = np.fromiter((skill_id for row in rows for skill_id in row), dtype=np.int64,
+                                         count=int(self.skill_indptr[-1]))
+
+        self.experience = np.fromiter(
+            (np.nan if profile.experience is None else float(profile.experience) for profile in profiles),
+            dtype=np.float32, count=n_profiles)
+
+        locations = [normalize_term(profile.location) for profile in profiles]
+        self.location_terms, self.location_codes = np.unique(np.array(locations, dtype=str), return_inverse=True)
+
+        self.availability = np.fromiter(
+            (AVAILABILITY_SCORES.get(getattr(profile.availability, "value", profile.availability), 0.0)
+             for profile in profiles),
+            dtype=np.float32, count=n_profiles)
+
+    def __len__(self) -> int:
+        return int(self.profile_ids.shape[0])
+
+    def skills_jaccard(self, jd_skills: Optional[Sequence[str]]) -> np.ndarray:
+        """
+        Jaccard similarity of every profile's skill set with the JD skills, in one pass over the sparse matrix.
+        """
+        jd_terms = {normalize_term(skill) for skill in jd_skills or [] if normalize_term(skill)}
+        if not jd_terms or not len(self):
+            return np.zeros(len(self), dtype=np.float32)
+        jd_mask = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        known = [skill_id for skill_id in (self.vocabulary.id_of(term) for term in jd_terms) if skill_id is not None]
+        jd_mask[known] = 1
+
+        # Row sums of the masked CSR entries via prefix sums (empty rows yield 0)
+        prefix = np.zeros(self.skill_indices.shape[0] + 1, dtype=np.int64)
+        np.cumsum(jd_mask[self.skill_indices], out=prefix[1:])
+        intersection = prefix[self.skill_indptr[1:]] - prefix[self.skill_indptr[:-1]]
+        union = self.skill_counts + len(jd_terms) - intersection
+        return np.divide(intersection, union, out=np.zeros(len(self), dtype=np.float64),
+                         where=union > 0).astype(np.float32)
+
+    def experience_fit(self, required: Optional[float]) -> np.ndarray:
+        """
+        1.0 when a profile meets the required years, otherwise the fraction of the requirement met.
+        """
+        if not required:
+            return np.ones(len(self), dtype=np.float32)
+        fit = np.clip(self.experience / np.float32(required), 0.0, 1.0)
+        return np.where(np.isnan(fit), np.float32(UNKNOWN_EXPERIENCE_SCORE), fit).astype(np.float32)
+
+    def location_match(self, jd_location: Optional[str]) -> np.ndarray:
+        """
+        1.0 for profiles in the JD location (or for everyone when the JD is remote), else 0.0.
+        """
+        term = normalize_term(jd_location)
+        if not term or _REMOTE_PATTERN.search(term):
+            return np.ones(len(self), dtype=np.float32)
+        position = np.searchsorted(self.location_terms, term)
+        if position >= len(self.location_terms) or self.location_terms[position] != term:
+            return np.zeros(len(self), dtype=np.float32)
+        return (self.location_codes == position).astype(np.float32)
+
+    def score(self, jd: Any, description_scores: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Weighted rubric score in [0, 1] of every profile against jd.
+
+        Args:
+            jd: Job description with skills, experience and location.
+            description_scores: Per-profile description similarity aligned with profile_ids (e.g. the
+                embedding cosine); 0 when not given.
+
+        Returns:
+            np.ndarray: float32 scores aligned with profile_ids.
+        """
+        scores = RULE_WEIGHTS["skills"] * self.skills_jaccard(jd.skills)
+        scores += RULE_WEIGHTS["experience"] * self.experience_fit(parse_required_experience(jd.experience))
+        scores += RULE_WEIGHTS["location"] * self.location_match(jd.location)
+        scores += RULE_WEIGHTS["availability"] * self.availability
+        if description_scores is not None:
+            scores += RULE_WEIGHTS["description"] * np.clip(np.asarray(description_scores, dtype=np.float32), 0.0, 1.0)
+        return scores.astype(np.float32)
+
+
+def pool_signature(profiles: Sequence[Any]) -> str:
+    """
+    Fingerprint of the scored fields of a pool, used to reuse precomputed features.
+    """
+    digest = hashlib.sha256()
+    for profile in profiles:
+        digest.update(repr((profile.id, profile.skills, profile.experience, profile.location,
+                            getattr(profile.availability, "value", profile.availability))).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RuleScorer:
+    """
+    Keeps the features of recently scored pools (or pool chunks, when the pool is streamed) so repeated
+    matches against the same consultants skip the feature build.
+    """
+
+    def __init__(self):
+        self.vocabulary = SkillVocabulary()
+        self._features = LRUCache(RULE_FEATURE_CACHE_SIZE)
+        self._lock = threading.Lock()
+
+    def features_for(self, profiles: Sequence[Any]) -> ProfileFeatures:
+        signature = pool_signature(profiles)
+        features = self._features.get(signature)
+        if features is None:
+            with self._lock:
+                if len(self.vocabulary) > RULE_VOCABULARY_MAX_SIZE:
+                    # Skills of consultants long gone would otherwise stay forever; cached features hold the
+                    # old vocabulary and are dropped with it
+                    logger.info(f"Rebuilding the rule-scoring skill vocabulary ({len(self.vocabulary)} skills).")
+                    self.vocabulary = SkillVocabulary()
+                    self._features.clear()
+                features = ProfileFeatures(profiles, self.vocabulary)
+            self._features.put(signature, features)
+            logger.debug(f"Built rule-scoring features for {len(profiles)} profiles.")
+        return features
+
+    def score(self, jd: Any, profiles: Sequence[Any],
+              description_scores: Optional[Dict[int, float]] = None) -> Dict[int, float]:
+        """
+        Rule-based score of every profile against jd.
+
+        Args:
+            jd: Job description.
+            profiles: Consultant pool.
+            description_scores: Optional profile id -> description similarity (e.g. embedding cosine).
+
+        Returns:
+            dict: profile id -> score in [0, 1].
+        """
+        features = self.features_for(profiles)
+        description = None
+        if description_scores is not None:
+            description = np.fromiter((description_scores.get(int(profile_id), 0.0)
+                                       for profile_id in features.profile_ids),
+                                      dtype=np.float32, count=len(features))
+        scores = features.score(jd, description)
+        return dict(zip(features.profile_ids.tolist(), scores.tolist()))
+
+
+rule_scorer = RuleScorer()